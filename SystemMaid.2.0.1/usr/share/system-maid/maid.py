@@ -3,17 +3,24 @@
 
 import os
 import sys
+import sqlite3
 import subprocess
+import time
+import zlib
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QPushButton, QLabel, QTextEdit, 
     QCheckBox, QGroupBox, QScrollArea, QDialog, 
-    QStackedWidget, QFrame, QMessageBox, QButtonGroup
+    QStackedWidget, QFrame, QMessageBox, QButtonGroup,
+    QComboBox, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QTreeWidget, QTreeWidgetItem, QFileDialog
 )
-from PyQt6.QtCore import Qt, QProcess, QSize
-from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtCore import Qt, QProcess, QSize, QThread, QTimer, QRectF, pyqtSignal
+from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QPen
 from PyQt6.QtWidgets import QProgressBar
 
+from maid_engine import browsers, caches, dedupe, deleter, duplicates, estimator, exclusions, forecast, mounts, recent, scanner, scanindex, settings, shredder, snapshots, thumbnails, toolchains, trash, treemap, usage, watcher, zeitgeist
+
 # Pardus/Debian uyumluluğu ve Fusion stili zorlaması
 os.environ['QT_QPA_PLATFORM_PLUGIN_PATH'] = ''
 os.environ['QT_PLUGIN_PATH'] = ''
@@ -101,6 +108,454 @@ class DefragCheckDialog(QDialog):
         else:
             self.info_label.setText("No fragmentation score found. Your disk might be an SSD or the partition is unsupported.")
 
+class CacheUsageDialog(QDialog):
+    # ~/.cache altındaki uygulamaların boyutu, yaş dağılımı ve politikaya göre boşalacak alan
+    def __init__(self, usages, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("~/.cache Usage by Application")
+        self.resize(820, 480)
+        self.layout = QVBoxLayout(self)
+
+        headers = ["Application", "Size", "Files"] + list(caches.AGE_LABELS) + ["Policy", "Reclaimable"]
+        table = QTableWidget(len(usages), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for row, usage in enumerate(usages):
+            policy = usage.policy or {}
+            policy_text = ", ".join(part for part in (
+                f"max {policy['max_mb']} MB" if policy.get("max_mb") else "",
+                f"unused {policy['max_age_days']}d" if policy.get("max_age_days") else "",
+                "whole folder" if policy.get("whole") else "",
+            ) if part) or "-"
+            cells = [usage.name, estimator.format_size(usage.bytes), f"{usage.files:,}"]
+            cells += [estimator.format_size(size) if size else "" for size in usage.histogram]
+            cells += [policy_text, estimator.format_size(usage.reclaimable) if usage.reclaimable else ""]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+        self.layout.addWidget(table)
+
+        lbl_hint = QLabel("Policies are set per application in ~/.config/system-maid/settings.json (cache_policies). "
+                           "Applications without their own policy are only removed as a whole folder, once nothing in it has been used for the \"*\" age.")
+        lbl_hint.setWordWrap(True)
+        lbl_hint.setStyleSheet("color: #7f8c8d;")
+        self.layout.addWidget(lbl_hint)
+
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.accept)
+        self.layout.addWidget(btn_close, alignment=Qt.AlignmentFlag.AlignRight)
+
+class DuplicateWorker(QThread):
+    # Kopya dosya aramasını arka planda yapar; aşamalar progress ile bildirilir
+    progress = pyqtSignal(str)
+    found = pyqtSignal(object, object)
+
+    def __init__(self, min_size, parent=None):
+        super().__init__(parent)
+        self.min_size = min_size
+
+    def run(self):
+        stats = {}
+        try:
+            groups = duplicates.find_duplicates(min_size=self.min_size, progress=self.progress.emit, stats=stats)
+        except (OSError, sqlite3.Error) as e:
+            self.progress.emit(f"ERROR: {e}")
+            groups = []
+        self.found.emit(groups, stats)
+
+class DuplicatesDialog(QDialog):
+    def __init__(self, min_size, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Duplicate Files")
+        self.resize(820, 520)
+        self.min_size = min_size
+        self.worker = None
+        self.groups = []
+        self.layout = QVBoxLayout(self)
+
+        self.info_label = QLabel(f"Searches the Home directory for files with identical content "
+                                 f"(larger than {estimator.format_size(min_size)}). Excluded folders are skipped.")
+        self.info_label.setWordWrap(True)
+        self.layout.addWidget(self.info_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["File", "Size"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        self.btn_start = QPushButton("Start Search")
+        self.btn_start.clicked.connect(self.start_search)
+        self.btn_delete = QPushButton("Delete Checked Copies")
+        self.btn_delete.setStyleSheet("background-color: #8b0000; color: white;")
+        self.btn_delete.setEnabled(False)
+        self.btn_delete.clicked.connect(self.delete_checked)
+        self.btn_merge = QPushButton("Merge Checked Copies")
+        self.btn_merge.setToolTip("Copies keep their names but share the same disk blocks (reflink). "
+                                  "Nothing is deleted.")
+        self.btn_merge.setEnabled(False)
+        self.btn_merge.clicked.connect(self.merge_checked)
+        buttons.addWidget(self.btn_start)
+        buttons.addStretch(1)
+        buttons.addWidget(self.btn_merge)
+        buttons.addWidget(self.btn_delete)
+        self.layout.addLayout(buttons)
+
+    def reject(self):
+        # Arama sürerken pencere kapatılırsa iş parçacığı yok edilmeden önce bitmesi beklenir
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.wait()
+        super().reject()
+
+    def start_search(self):
+        self.btn_start.setEnabled(False)
+        self.btn_delete.setEnabled(False)
+        self.btn_merge.setEnabled(False)
+        self.tree.clear()
+        self.worker = DuplicateWorker(self.min_size, self)
+        self.worker.progress.connect(self.info_label.setText)
+        self.worker.found.connect(self.show_groups)
+        self.worker.start()
+
+    def show_groups(self, groups, stats):
+        self.groups = groups
+        self.btn_start.setEnabled(True)
+        self.tree.clear()
+        for group in groups:
+            copies = len(group.paths)
+            wasted = group.size * (copies - 1)
+            parent = QTreeWidgetItem([f"{copies} copies, {estimator.format_size(wasted)} wasted",
+                                      estimator.format_size(group.size)])
+            for index, path in enumerate(group.paths):
+                child = QTreeWidgetItem([path, ""])
+                # İlk kopya korunur, diğerleri silinmek üzere işaretlenir
+                child.setCheckState(0, Qt.CheckState.Unchecked if index == 0 else Qt.CheckState.Checked)
+                parent.addChild(child)
+            self.tree.addTopLevelItem(parent)
+        self.tree.expandAll()
+        self.info_label.setText(
+            f"{len(groups):,} duplicate groups, {estimator.format_size(duplicates.wasted_bytes(groups))} wasted. "
+            f"{stats.get('full_hashed', 0):,} files hashed, {stats.get('cached', 0):,} hashes reused from the cache.")
+        self.btn_delete.setEnabled(bool(groups))
+        self.btn_merge.setEnabled(bool(groups))
+
+    def delete_checked(self):
+        paths = []
+        for i in range(self.tree.topLevelItemCount()):
+            parent = self.tree.topLevelItem(i)
+            group = self.groups[i]
+            checked = [parent.child(j).text(0) for j in range(parent.childCount())
+                       if parent.child(j).checkState(0) == Qt.CheckState.Checked]
+            if len(checked) == parent.childCount():
+                QMessageBox.warning(self, "Duplicate Files", f"At least one copy must be kept:\n{checked[0]}")
+                return
+            paths.extend((path, group.size) for path in checked)
+        if not paths:
+            return
+        answer = QMessageBox.question(self, "Duplicate Files", f"{len(paths):,} files will be permanently deleted. Continue?")
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        self.btn_start.setEnabled(False)
+        self.btn_merge.setEnabled(False)
+        self.btn_delete.setEnabled(False)
+        self.info_label.setText("Deleting copies...")
+
+        def delete(log):
+            # Bu fonksiyon CleanupWorker iş parçacığında çalışır; arama bittikten sonra
+            # değişmiş dosyalar silinmez
+            unchanged = []
+            for path, size in paths:
+                try:
+                    if os.lstat(path).st_size == size:
+                        unchanged.append(path)
+                except OSError:
+                    pass
+            stats = deleter.remove_files(unchanged)
+            log(f"{stats.files:,} copies deleted, {estimator.format_size(stats.bytes)} freed.")
+
+        self.worker = CleanupWorker([delete], self)
+        self.worker.log.connect(self.info_label.setText)
+        # Silinen kopyalar listeden düşsün diye arama yeniden yapılır
+        self.worker.done.connect(lambda _code: self.start_search())
+        self.worker.start()
+
+    def merge_checked(self):
+        # İşaretsiz ilk kopya korunur, işaretli kopyalar onunla birleştirilir
+        groups = []
+        for i in range(self.tree.topLevelItemCount()):
+            parent = self.tree.topLevelItem(i)
+            group = self.groups[i]
+            kept = [parent.child(j).text(0) for j in range(parent.childCount())
+                    if parent.child(j).checkState(0) != Qt.CheckState.Checked]
+            checked = [parent.child(j).text(0) for j in range(parent.childCount())
+                       if parent.child(j).checkState(0) == Qt.CheckState.Checked]
+            if kept and checked:
+                groups.append(duplicates.DuplicateGroup(group.size, group.digest, kept[:1] + checked))
+        config = settings.load()
+        # Araç önbellekleri gibi korunan ağaçlardaki kopyalara dokunulmaz
+        groups, protected = dedupe.split_protected(groups, dedupe.protected_roots(config))
+        if not groups:
+            if protected:
+                self.info_label.setText(f"{protected:,} files are in protected folders (toolchain caches...) and were not merged.")
+            return
+        hardlink = config["dedupe_hardlink"]
+        copies = sum(len(group.paths) - 1 for group in groups)
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Question)
+        box.setWindowTitle("Duplicate Files")
+        text = f"{copies:,} copies in {len(groups):,} groups will be merged with the first file of their group."
+        if hardlink != "never":
+            # Sabit bağlantıda iki yol aynı dosyadır; birinde yapılan değişiklik diğerini de etkiler
+            text += ("\n\nWhere the file system cannot share blocks, copies are replaced with hard links "
+                     f"({'read-only files only' if hardlink == 'readonly' else 'all files'}). "
+                     "A hard-linked copy is the same file as the kept one: changing either changes both.")
+        if protected:
+            text += f"\n\n{protected:,} files in protected folders (toolchain caches...) are left untouched."
+        box.setText(text + "\n\nContinue?")
+        box.setDetailedText("\n\n".join("\n".join([f"Keep: {group.paths[0]}"] + [f"Merge: {path}" for path in group.paths[1:]])
+                                        for group in groups))
+        box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if box.exec() != QMessageBox.StandardButton.Yes:
+            return
+        self.btn_start.setEnabled(False)
+        self.btn_merge.setEnabled(False)
+        self.btn_delete.setEnabled(False)
+        self.info_label.setText("Merging copies...")
+
+        def merge(log):
+            stats = dedupe.merge_groups(groups, hardlink)
+            log(f"{stats.merged:,} copies merged, {estimator.format_size(stats.bytes)} freed, "
+                f"{stats.skipped:,} skipped.")
+
+        self.worker = CleanupWorker([merge], self)
+        self.worker.log.connect(self.info_label.setText)
+        self.worker.done.connect(lambda _code: self.btn_start.setEnabled(True))
+        self.worker.start()
+
+class CleanupWorker(QThread):
+    # Temizlik adımlarını arayüzü dondurmadan arka planda sırayla çalıştırır.
+    # Adım ya bir kabuk komutudur (str) ya da log fonksiyonu alan bir Python fonksiyonudur.
+    log = pyqtSignal(str)
+    done = pyqtSignal(int)
+
+    def __init__(self, steps, parent=None):
+        super().__init__(parent)
+        self.steps = steps
+
+    def run(self):
+        exit_code = 0
+        for step in self.steps:
+            try:
+                if isinstance(step, str):
+                    result = subprocess.run(["/bin/bash", "-c", step], capture_output=True, text=True)
+                    if result.stdout.strip():
+                        self.log.emit(result.stdout.strip())
+                    if result.stderr.strip():
+                        self.log.emit(f"ERROR: {result.stderr.strip()}")
+                    exit_code = result.returncode
+                else:
+                    step(self.log.emit)
+            except Exception as e:
+                self.log.emit(f"ERROR: {e}")
+                exit_code = 1
+            # Eski '&&' zinciri gibi: bir adım başarısız olursa sonrakiler çalışmaz
+            if exit_code != 0:
+                break
+        self.done.emit(exit_code)
+
+class EstimateWorker(QThread):
+    # Seçeneklerin boşaltacağı alanı hiçbir şey silmeden arka planda hesaplar
+    result = pyqtSignal(str, int, int)
+    # Alt kırılım: [(ad, bayt)], ör. tarayıcı profilleri
+    details = pyqtSignal(str, object)
+    # Hesaplanamayan kategori ve hata iletisi
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, tracker=None, categories=None, parent=None):
+        super().__init__(parent)
+        self.tracker = tracker
+        self.categories = list(estimator.CATEGORIES) if categories is None else list(categories)
+
+    def run(self):
+        remaining = set(self.categories)
+        try:
+            for item in estimator.estimate(self.categories, tracker=self.tracker):
+                remaining.discard(item.category)
+                if item.error is not None:
+                    self.failed.emit(item.category, item.error)
+                    continue
+                self.result.emit(item.category, item.files, item.bytes)
+                if item.details:
+                    self.details.emit(item.category, list(item.details))
+        except Exception as e:
+            # İstisna QThread.run dışına çıkmaz; sonucu gelmeyen etiketler "hesaplanıyor"da kalmaz
+            for category in remaining:
+                self.failed.emit(category, str(e) or type(e).__name__)
+
+class AnalysisWorker(QThread):
+    # Disk kullanım analizini arka planda yapar; ara sonuçlar progress ile bildirilir
+    progress = pyqtSignal(str)
+    finished_report = pyqtSignal(object)
+    # (önceki anlık görüntü ya da None, bu taramanın görüntüsü)
+    growth = pyqtSignal(object, object)
+
+    def __init__(self, root, top, snapshot=False, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.top = top
+        self.snapshot = snapshot
+
+    def run(self):
+        def report_progress(report):
+            self.progress.emit(f"Scanning... {report.dirs:,} folders, {report.files:,} files, "
+                               f"{estimator.format_size(report.total_bytes)}")
+        builder = snapshots.Builder(self.root) if self.snapshot else None
+        try:
+            report = usage.analyze(self.root, top=self.top, progress=report_progress, snapshot=builder)
+        except OSError as e:
+            self.progress.emit(f"ERROR: {e}")
+            report = None
+        if report is not None and builder is not None:
+            # Görüntü aynı dolaşımda toplandı; kaydedilip bir önceki çalıştırmayla karşılaştırılır
+            current = builder.snapshot()
+            try:
+                current.save()
+            except OSError as e:
+                self.progress.emit(f"ERROR: snapshot could not be saved: {e}")
+            self.growth.emit(snapshots.latest(self.root, before=current.created), current)
+        self.finished_report.emit(report)
+
+class TreemapWorker(QThread):
+    # Dizin boyutu indeksini arka planda günceller; değişmeyen dizinler yeniden okunmaz
+    progress = pyqtSignal(str)
+    refreshed = pyqtSignal(object)
+
+    def __init__(self, root, full=False, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.full = full
+
+    def run(self):
+        def report_progress(stats):
+            self.progress.emit(f"Updating... {stats['rescanned']:,} folders read, {stats['cached']:,} unchanged")
+        try:
+            with treemap.SizeIndex() as index:
+                stats = index.refresh(self.root, full=self.full, progress=report_progress)
+        except (OSError, sqlite3.Error) as e:
+            self.progress.emit(f"ERROR: {e}")
+            stats = None
+        self.refreshed.emit(stats)
+
+class TreemapView(QWidget):
+    # Dizin boyutlarını iç içe dikdörtgenler olarak çizer. Yalnızca görünen derinlik kadar
+    # düzey indeksten okunur ve yerleştirilir; tıklanan dizine inmek tarama gerektirmez.
+    path_changed = pyqtSignal(str)
+
+    # Bu boyuttan küçük kutuların içine inilmez
+    MIN_NEST = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None
+        self.path = None
+        self.depth = 2
+        self.rects = []
+        self.setMouseTracking(True)
+        self.setMinimumHeight(260)
+
+    def set_index(self, index, path):
+        self.index = index
+        self.set_path(path)
+
+    def set_path(self, path):
+        self.path = path
+        self.relayout()
+        self.path_changed.emit(path)
+
+    def set_depth(self, depth):
+        self.depth = depth
+        self.relayout()
+
+    def relayout(self):
+        self.rects = []
+        if self.index is not None and self.path is not None:
+            self.layout_level(self.path, QRectF(self.rect()).adjusted(1, 1, -1, -1), 1, None)
+        self.update()
+
+    def layout_level(self, path, area, level, top_tile):
+        tiles = [tile for tile in self.index.children(path) if tile.bytes > 0]
+        sizes = [tile.bytes for tile in tiles]
+        for tile, (x, y, w, h) in zip(tiles, treemap.squarify(sizes, area.x(), area.y(), area.width(), area.height())):
+            if w < 1 or h < 1:
+                continue
+            rect = QRectF(x, y, w, h)
+            self.rects.append((rect, tile, level, top_tile or tile))
+            # Başlık için yer bırakılarak bir alt düzey yerleştirilir
+            if tile.is_dir and level < self.depth and w > self.MIN_NEST and h > self.MIN_NEST:
+                self.layout_level(tile.path, rect.adjusted(3, 16, -3, -3), level + 1, top_tile or tile)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.relayout()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1e1e1e"))
+        if not self.rects:
+            painter.setPen(QColor("#bdc3c7"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
+                             "No data for this location yet. Press \"Update\" to scan it once.")
+            return
+        for rect, tile, level, top_tile in self.rects:
+            # Renk üst düzey dizine göre seçilir; derinlik arttıkça koyulaşır
+            hue = zlib.crc32(os.fsencode(top_tile.name)) % 360
+            color = QColor.fromHsv(hue, 90 if tile.is_dir else 30, max(90, 210 - level * 35))
+            painter.fillRect(rect, color)
+            painter.setPen(QPen(QColor("#1e1e1e")))
+            painter.drawRect(rect)
+            if rect.width() > 40 and rect.height() > 14:
+                painter.setPen(QColor("#000000"))
+                label = f"{tile.name} ({estimator.format_size(tile.bytes)})"
+                painter.drawText(rect.adjusted(4, 1, -2, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                                 painter.fontMetrics().elidedText(label, Qt.TextElideMode.ElideRight, int(rect.width()) - 6))
+
+    def tile_at(self, pos, deepest=True):
+        found = None
+        for rect, tile, level, top_tile in self.rects:
+            if rect.contains(pos.toPointF()):
+                found = (tile, top_tile)
+        if found is None:
+            return None
+        return found[0] if deepest else found[1]
+
+    def mouseMoveEvent(self, event):
+        tile = self.tile_at(event.position().toPoint())
+        if tile is None:
+            self.setToolTip("")
+        else:
+            self.setToolTip(f"{tile.path if tile.is_dir else tile.path + ' (files)'}\n"
+                            f"{estimator.format_size(tile.bytes)}, {tile.files:,} files")
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.RightButton:
+            self.go_up()
+            return
+        # Tıklanan yerdeki en üst düzey dizine inilir
+        tile = self.tile_at(event.position().toPoint(), deepest=False)
+        if tile is not None and tile.is_dir:
+            self.set_path(tile.path)
+
+    def go_up(self):
+        if self.path is None:
+            return
+        parent = os.path.dirname(self.path)
+        if parent != self.path and self.index.tile(parent) is not None:
+            self.set_path(parent)
+
 class SystemMaid(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -108,6 +563,25 @@ class SystemMaid(QMainWindow):
         self.VERSION = "2.0.1" # Yeni GUI ile sürüm atlatıldı bir sonraki sürümde dinamik dil getiricem.
         self.current_lang = 'tr' 
         self.process = None
+        self.worker = None
+        self.tracker = None
+        self.estimate_worker = None
+        self.estimate_labels = {}
+        # Çalışan hesap bitince yeniden hesaplanacak kategoriler
+        self.pending_estimates = set()
+        # Ayar kutularında değişen, kısa bir beklemeden sonra yeniden hesaplanacak kategoriler
+        self.changed_estimates = set()
+        self.settings_timer = QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.setInterval(600)
+        self.settings_timer.timeout.connect(self.apply_setting_changes)
+        self.cache_usages = []
+        self.usage_worker = None
+        self.treemap_worker = None
+        self.treemap_index = None
+        self.usage_report = None
+        self.space_history = None
+        self.settings = settings.load()
         self.output_log = None
         
         # Pencere Ayarları
@@ -122,6 +596,21 @@ class SystemMaid(QMainWindow):
         
         self.setup_ui()
         
+        if self.settings["live_tracking"]:
+            self.start_live_tracking()
+        
+        self.refresh_estimates()
+
+        # Boş alan örnekleri açılışta, her işlemden sonra ve düzenli aralıklarla alınır
+        try:
+            self.space_history = forecast.History()
+        except (OSError, sqlite3.Error) as e:
+            self.lbl_forecast.setText(f"Free space history unavailable: {e}")
+        self.sample_free_space()
+        self.space_timer = QTimer(self)
+        self.space_timer.timeout.connect(self.sample_free_space)
+        self.space_timer.start(max(1, int(self.settings["free_space_sample_minutes"])) * 60 * 1000)
+        
     def setup_ui(self):
         
         # Ana Merkezi Widget
@@ -212,12 +701,18 @@ class SystemMaid(QMainWindow):
         
         self.btn_nav_opt = QPushButton(QIcon(os.path.join(ICONS_DIR, "system-optimization.png")), " System Optimization")
         self.btn_nav_opt.setIconSize(QSize(icon_size, icon_size))
+
+        self.btn_nav_usage = QPushButton(QIcon(os.path.join(ICONS_DIR, "fragment-hdd.png")), " Disk Usage Analysis")
+        self.btn_nav_usage.setIconSize(QSize(icon_size, icon_size))
+
+        self.btn_nav_treemap = QPushButton(QIcon(os.path.join(ICONS_DIR, "fragment-hdd.png")), " Disk Usage Map")
+        self.btn_nav_treemap.setIconSize(QSize(icon_size, icon_size))
         
         # Butonları bir gruba dahil ederek sadece birinin seçili kalmasını sağlıyoruz
         self.nav_group = QButtonGroup(self)
         self.nav_group.setExclusive(True)
 
-        for i, btn in enumerate([self.btn_nav_garbage, self.btn_nav_apt, self.btn_nav_opt]):
+        for i, btn in enumerate([self.btn_nav_garbage, self.btn_nav_apt, self.btn_nav_opt, self.btn_nav_usage, self.btn_nav_treemap]):
             btn.setCheckable(True)
             self.nav_group.addButton(btn, i)
             self.sidebar_layout.addWidget(btn)
@@ -241,6 +736,17 @@ class SystemMaid(QMainWindow):
         
         # Üst Araç Çubuğu (Dil ve Hakkında)
         self.top_bar = QHBoxLayout()
+        # Disk dolma tahmini; sistem diski dolmak üzereyse APT ve günlük temizliğine kısayollar
+        self.lbl_forecast = QLabel("")
+        self.lbl_forecast.setStyleSheet("color: #7f8c8d;")
+        self.btn_forecast_apt = QPushButton("APT Cleanup")
+        self.btn_forecast_apt.clicked.connect(lambda: self.switch_page(1))
+        self.btn_forecast_logs = QPushButton("Log Cleanup")
+        self.btn_forecast_logs.clicked.connect(lambda: self.switch_page(2))
+        self.top_bar.addWidget(self.lbl_forecast)
+        for btn in (self.btn_forecast_apt, self.btn_forecast_logs):
+            btn.setVisible(False)
+            self.top_bar.addWidget(btn)
         self.btn_lang = QPushButton("Language")
         self.btn_about = QPushButton("About")
         self.btn_about.clicked.connect(self.show_about)
@@ -262,10 +768,14 @@ class SystemMaid(QMainWindow):
         self.page_garbage = self.create_garbage_page()
         self.page_apt = self.create_apt_page()
         self.page_opt = self.create_opt_page()
+        self.page_usage = self.create_usage_page()
+        self.page_treemap = self.create_treemap_page()
         
         self.pages.addWidget(self.page_garbage)
         self.pages.addWidget(self.page_apt)
         self.pages.addWidget(self.page_opt)
+        self.pages.addWidget(self.page_usage)
+        self.pages.addWidget(self.page_treemap)
         
         self.right_layout.addWidget(self.pages)
         
@@ -291,6 +801,8 @@ class SystemMaid(QMainWindow):
         self.btn_nav_garbage.clicked.connect(lambda: self.switch_page(0))
         self.btn_nav_apt.clicked.connect(lambda: self.switch_page(1))
         self.btn_nav_opt.clicked.connect(lambda: self.switch_page(2))
+        self.btn_nav_usage.clicked.connect(lambda: self.switch_page(3))
+        self.btn_nav_treemap.clicked.connect(lambda: self.switch_page(4))
         
         # Varsayılan sayfa
         self.switch_page(0)
@@ -410,6 +922,18 @@ class SystemMaid(QMainWindow):
         lbl_thumbs_db = QLabel("Cleans up leftover thumbs.db files from Windows shares in the Home directory.")
         lbl_thumbs_db.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
 
+        # Kırık sembolik bağlantılar ve boş klasörler (1.2.0 sürümündeki seçenekler)
+        self.chk_broken_links = QCheckBox("Remove Broken Symbolic Links")
+        
+        lbl_broken_links = QLabel("Deletes links in the Home directory whose target no longer exists.")
+        lbl_broken_links.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
+
+        self.chk_empty_dirs = QCheckBox("Remove Empty Folders")
+        
+        lbl_empty_dirs = QLabel("Deletes empty folders inside the Home directory. Folders directly in Home (Desktop, Templates...) are kept.")
+        lbl_empty_dirs.setWordWrap(True)
+        lbl_empty_dirs.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
+
         # Thumbnail Önbelleği
         self.chk_thumbnails = QCheckBox("Clear Thumbnail Cache")
         self.chk_thumbnails.setChecked(True)
@@ -418,17 +942,45 @@ class SystemMaid(QMainWindow):
         lbl_thumbs.setWordWrap(True)
         lbl_thumbs.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
 
+        # Tarayıcı Önbellekleri
+        self.chk_browsers = QCheckBox("Clean Browser Caches")
+        
+        lbl_browsers = QLabel("Firefox and Chromium-based browser caches (Chrome, Brave, Edge, Vivaldi, Opera), per profile.")
+        lbl_browsers.setWordWrap(True)
+        lbl_browsers.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
+
+        # ~/.cache Politikaları
+        self.chk_user_caches = QCheckBox("Apply Cache Policies to ~/.cache")
+        
+        lbl_user_caches = QLabel("Removes files that applications have not used for a long time, or that exceed their per-application size limit.")
+        lbl_user_caches.setWordWrap(True)
+        lbl_user_caches.setStyleSheet("color: #7f8c8d; margin-bottom: 10px; margin-left: 20px;")
+
         # Widget'ları ekle
         widgets = [
             (self.chk_secure, lbl_secure),
             (self.chk_trash, lbl_trash),
             (self.chk_recent, lbl_recent),
             (self.chk_thumbs_db, lbl_thumbs_db),
-            (self.chk_thumbnails, lbl_thumbs)
+            (self.chk_broken_links, lbl_broken_links),
+            (self.chk_empty_dirs, lbl_empty_dirs),
+            (self.chk_thumbnails, lbl_thumbs),
+            (self.chk_browsers, lbl_browsers),
+            (self.chk_user_caches, lbl_user_caches)
         ]
 
         # İkon listesini tanımla
-        icons = ["shred.png", "trash-empty.png", "recently-used-items.png", "windows-db.png", "thumbnail.png"]
+        icons = ["shred.png", "trash-empty.png", "recently-used-items.png", "windows-db.png", "silgi.png", "computerjanitor.png", "thumbnail.png", "silgi.png", "computerjanitor.png"]
+
+        # Kaç bayt boşalacağının gösterileceği seçenekler (estimator kategorileri)
+        estimate_keys = {
+            self.chk_trash: "trash",
+            self.chk_recent: "recent",
+            self.chk_thumbs_db: "thumbs_db",
+            self.chk_thumbnails: "thumbnails",
+            self.chk_browsers: "browsers",
+            self.chk_user_caches: "user_caches",
+        }
 
         for (chk, lbl), icon_name in zip(widgets, icons):
             item_layout = QHBoxLayout()
@@ -441,8 +993,28 @@ class SystemMaid(QMainWindow):
             
             # Sağ metin alanı (Check + Açıklama)
             text_vbox = QVBoxLayout()
-            text_vbox.addWidget(chk)
+            if chk in estimate_keys:
+                text_vbox.addLayout(self.with_estimate_label(chk, estimate_keys[chk]))
+            else:
+                text_vbox.addWidget(chk)
             text_vbox.addWidget(lbl)
+            if chk is self.chk_thumbnails:
+                text_vbox.addLayout(self.create_thumbnail_mode_row())
+            elif chk is self.chk_trash:
+                text_vbox.addLayout(self.create_trash_limits_row())
+            elif chk is self.chk_recent:
+                text_vbox.addLayout(self.create_recent_mode_row())
+            elif chk is self.chk_browsers:
+                text_vbox.addLayout(self.create_browser_mode_row())
+            elif chk is self.chk_user_caches:
+                self.btn_cache_usage = QPushButton("Show Usage by Application...")
+                self.btn_cache_usage.setEnabled(False)
+                self.btn_cache_usage.clicked.connect(self.show_cache_usage)
+                usage_row = QHBoxLayout()
+                usage_row.setContentsMargins(20, 0, 0, 10)
+                usage_row.addWidget(self.btn_cache_usage)
+                usage_row.addStretch(1)
+                text_vbox.addLayout(usage_row)
             
             item_layout.addWidget(icon_label)
             item_layout.addLayout(text_vbox)
@@ -450,17 +1022,215 @@ class SystemMaid(QMainWindow):
         
         g_layout.addStretch(1)
         layout.addWidget(group)
+        layout.addWidget(self.create_toolchain_group())
         
         self.btn_clean_garbage = QPushButton("Start Selected Cleanup")
         self.btn_clean_garbage.setStyleSheet("background-color: #004700; color: white;")
         self.btn_clean_garbage.setFixedSize(250, 35)
         self.btn_clean_garbage.clicked.connect(self.run_clean)
+        
+        # Arka planda inotify ile çöp listesini güncel tutma seçeneği
+        self.chk_live_tracking = QCheckBox("Track junk in the background (inotify)")
+        self.chk_live_tracking.setToolTip("Keeps the thumbs.db and broken link lists up to date while System Maid is open, so cleanup does not need to scan the Home directory.")
+        self.chk_live_tracking.setChecked(self.settings["live_tracking"])
+        self.chk_live_tracking.toggled.connect(self.toggle_live_tracking)
+        
         garbage_btn_layout = QHBoxLayout()
         garbage_btn_layout.addWidget(self.btn_clean_garbage)
+        garbage_btn_layout.addSpacing(15)
+        garbage_btn_layout.addWidget(self.chk_live_tracking)
+        garbage_btn_layout.addSpacing(15)
+        self.btn_duplicates = QPushButton("Find Duplicate Files...")
+        self.btn_duplicates.clicked.connect(self.show_duplicates_dialog)
+        garbage_btn_layout.addWidget(self.btn_duplicates)
         garbage_btn_layout.addStretch(1) # Butonun uzamasını engeller
         layout.addLayout(garbage_btn_layout)
         return page
 
+    def create_toolchain_group(self):
+        # Geliştirici araçlarının paket önbellekleri; her araç ayrı seçilir ve ayrı ölçülür
+        group = QGroupBox("Developer Toolchain Caches")
+        g_layout = QVBoxLayout(group)
+
+        lbl_desc = QLabel("Removes downloaded packages that have not been used for a long time. "
+                          "Packages listed in lockfiles of your projects are kept.")
+        lbl_desc.setWordWrap(True)
+        lbl_desc.setStyleSheet("color: #7f8c8d;")
+        g_layout.addWidget(lbl_desc)
+
+        self.toolchain_checks = {}
+        row = None
+        for index, tool in enumerate(toolchains.TOOLS):
+            if index % 3 == 0:
+                row = QHBoxLayout()
+                g_layout.addLayout(row)
+            chk = QCheckBox(tool.label)
+            chk.setToolTip(tool.root())
+            self.toolchain_checks[tool.name] = chk
+            row.addWidget(chk)
+            row.addWidget(self.new_estimate_label(f"toolchain_{tool.name}"))
+            row.addStretch(1)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Remove packages unused for more than"))
+        self.spn_toolchain_age = QSpinBox()
+        self.spn_toolchain_age.setRange(1, 3650)
+        self.spn_toolchain_age.setSuffix(" days")
+        self.spn_toolchain_age.setValue(self.settings["toolchain_max_age_days"])
+        self.spn_toolchain_age.valueChanged.connect(self.toolchain_age_changed)
+        controls.addWidget(self.spn_toolchain_age)
+        controls.addStretch(1)
+        g_layout.addLayout(controls)
+
+        lbl_roots = QLabel("Project folders searched for lockfiles: "
+                           + ", ".join(self.settings["toolchain_project_roots"])
+                           + " (toolchain_project_roots in ~/.config/system-maid/settings.json)")
+        lbl_roots.setWordWrap(True)
+        lbl_roots.setStyleSheet("color: #7f8c8d;")
+        g_layout.addWidget(lbl_roots)
+        return group
+
+    def toolchain_age_changed(self, value):
+        self.settings["toolchain_max_age_days"] = value
+        self.schedule_estimate("toolchains")
+
+    def schedule_estimate(self, category):
+        # Ok tuşu basılı tutulduğunda her adımda ayar dosyası yazılmaz ve tam hesap
+        # başlatılmaz; değişiklikler durulunca yalnızca ilgili kategori yeniden hesaplanır
+        self.changed_estimates.add(category)
+        self.settings_timer.start()
+
+    def apply_setting_changes(self):
+        self.save_settings()
+        categories, self.changed_estimates = self.changed_estimates, set()
+        self.refresh_estimates(categories)
+
+    def create_thumbnail_mode_row(self):
+        # Önbelleğin tamamen silinmesi yerine belirli bir boyutun altında tutulması
+        row = QHBoxLayout()
+        row.setContentsMargins(20, 0, 0, 10)
+        self.cmb_thumbnail_mode = QComboBox()
+        self.cmb_thumbnail_mode.addItem("Delete all previews", "all")
+        self.cmb_thumbnail_mode.addItem("Only previews of deleted files", "orphans")
+        self.cmb_thumbnail_mode.addItem("Keep the cache under", "budget")
+        self.cmb_thumbnail_mode.setCurrentIndex(max(0, self.cmb_thumbnail_mode.findData(self.settings["thumbnail_mode"])))
+        self.spn_thumbnail_budget = QSpinBox()
+        self.spn_thumbnail_budget.setRange(1, 100000)
+        self.spn_thumbnail_budget.setSuffix(" MB")
+        self.spn_thumbnail_budget.setValue(self.settings["thumbnail_budget_mb"])
+        self.spn_thumbnail_budget.setToolTip("Least recently used previews are removed first; recently viewed folders keep theirs.")
+        self.spn_thumbnail_budget.setEnabled(self.settings["thumbnail_mode"] == "budget")
+        self.cmb_thumbnail_mode.currentIndexChanged.connect(self.thumbnail_mode_changed)
+        self.spn_thumbnail_budget.valueChanged.connect(self.thumbnail_mode_changed)
+        row.addWidget(self.cmb_thumbnail_mode)
+        row.addWidget(self.spn_thumbnail_budget)
+        row.addStretch(1)
+        return row
+
+    def create_trash_limits_row(self):
+        # Çöp kutusunun tamamı yerine yalnızca eski öğeler ya da kotayı aşan kısım silinebilir
+        row = QHBoxLayout()
+        row.setContentsMargins(20, 0, 0, 10)
+        self.spn_trash_age = QSpinBox()
+        self.spn_trash_age.setRange(0, 3650)
+        self.spn_trash_age.setPrefix("older than ")
+        self.spn_trash_age.setSuffix(" days")
+        self.spn_trash_age.setSpecialValueText("any age")
+        self.spn_trash_age.setValue(self.settings["trash_max_age_days"])
+        self.spn_trash_quota = QSpinBox()
+        self.spn_trash_quota.setRange(0, 10000000)
+        self.spn_trash_quota.setPrefix("keep under ")
+        self.spn_trash_quota.setSuffix(" MB")
+        self.spn_trash_quota.setSpecialValueText("no size limit")
+        self.spn_trash_quota.setValue(self.settings["trash_quota_mb"])
+        self.spn_trash_quota.setToolTip("Oldest deleted items are removed first until the trash fits.")
+        self.chk_trash_mounts = QCheckBox("Include other drives")
+        self.chk_trash_mounts.setToolTip("Also cleans the .Trash-$UID folders on mounted disks and USB drives.")
+        self.chk_trash_mounts.setChecked(self.settings["trash_include_mounts"])
+        self.spn_trash_age.valueChanged.connect(self.trash_limits_changed)
+        self.spn_trash_quota.valueChanged.connect(self.trash_limits_changed)
+        self.chk_trash_mounts.toggled.connect(self.trash_limits_changed)
+        row.addWidget(self.spn_trash_age)
+        row.addWidget(self.spn_trash_quota)
+        row.addWidget(self.chk_trash_mounts)
+        row.addStretch(1)
+        return row
+
+    def create_browser_mode_row(self):
+        row = QVBoxLayout()
+        row.setContentsMargins(20, 0, 0, 10)
+        controls = QHBoxLayout()
+        self.cmb_browser_mode = QComboBox()
+        self.cmb_browser_mode.addItem("Keep each profile under", "budget")
+        self.cmb_browser_mode.addItem("Empty caches of closed browsers", "all")
+        self.cmb_browser_mode.setCurrentIndex(max(0, self.cmb_browser_mode.findData(self.settings["browser_cache_mode"])))
+        self.spn_browser_budget = QSpinBox()
+        self.spn_browser_budget.setRange(1, 100000)
+        self.spn_browser_budget.setSuffix(" MB")
+        self.spn_browser_budget.setValue(self.settings["browser_cache_budget_mb"])
+        self.spn_browser_budget.setToolTip("Least recently used cache entries are removed first. Safe while the browser is open.")
+        self.spn_browser_budget.setEnabled(self.settings["browser_cache_mode"] == "budget")
+        self.cmb_browser_mode.currentIndexChanged.connect(self.browser_mode_changed)
+        self.spn_browser_budget.valueChanged.connect(self.browser_mode_changed)
+        controls.addWidget(self.cmb_browser_mode)
+        controls.addWidget(self.spn_browser_budget)
+        controls.addStretch(1)
+        # Profil başına önbellek boyutları
+        self.lbl_browser_breakdown = QLabel("")
+        self.lbl_browser_breakdown.setWordWrap(True)
+        self.lbl_browser_breakdown.setStyleSheet("color: #7f8c8d;")
+        row.addLayout(controls)
+        row.addWidget(self.lbl_browser_breakdown)
+        return row
+
+    def browser_mode_changed(self, *_args):
+        mode = self.cmb_browser_mode.currentData()
+        self.spn_browser_budget.setEnabled(mode == "budget")
+        self.settings["browser_cache_mode"] = mode
+        self.settings["browser_cache_budget_mb"] = self.spn_browser_budget.value()
+        self.schedule_estimate("browsers")
+
+    def create_recent_mode_row(self):
+        # Geçmişin tamamı yerine yalnızca geçersiz ve eski kayıtlar çıkarılabilir
+        row = QHBoxLayout()
+        row.setContentsMargins(20, 0, 0, 10)
+        self.cmb_recent_mode = QComboBox()
+        self.cmb_recent_mode.addItem("Delete all history", "all")
+        self.cmb_recent_mode.addItem("Only deleted files and items older than", "prune")
+        self.cmb_recent_mode.setCurrentIndex(max(0, self.cmb_recent_mode.findData(self.settings["recent_mode"])))
+        self.spn_recent_age = QSpinBox()
+        self.spn_recent_age.setRange(0, 3650)
+        self.spn_recent_age.setSuffix(" days")
+        self.spn_recent_age.setSpecialValueText("any age")
+        self.spn_recent_age.setValue(self.settings["recent_max_age_days"])
+        self.spn_recent_age.setEnabled(self.settings["recent_mode"] == "prune")
+        self.cmb_recent_mode.currentIndexChanged.connect(self.recent_mode_changed)
+        self.spn_recent_age.valueChanged.connect(self.recent_mode_changed)
+        row.addWidget(self.cmb_recent_mode)
+        row.addWidget(self.spn_recent_age)
+        row.addStretch(1)
+        return row
+
+    def recent_mode_changed(self, *_args):
+        mode = self.cmb_recent_mode.currentData()
+        self.spn_recent_age.setEnabled(mode == "prune")
+        self.settings["recent_mode"] = mode
+        self.settings["recent_max_age_days"] = self.spn_recent_age.value()
+        self.schedule_estimate("recent")
+
+    def trash_limits_changed(self, *_args):
+        self.settings["trash_max_age_days"] = self.spn_trash_age.value()
+        self.settings["trash_quota_mb"] = self.spn_trash_quota.value()
+        self.settings["trash_include_mounts"] = self.chk_trash_mounts.isChecked()
+        self.schedule_estimate("trash")
+
+    def thumbnail_mode_changed(self, *_args):
+        mode = self.cmb_thumbnail_mode.currentData()
+        self.spn_thumbnail_budget.setEnabled(mode == "budget")
+        self.settings["thumbnail_mode"] = mode
+        self.settings["thumbnail_budget_mb"] = self.spn_thumbnail_budget.value()
+        self.schedule_estimate("thumbnails")
+
     def create_apt_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
@@ -506,7 +1276,10 @@ class SystemMaid(QMainWindow):
             icon_label.setFixedWidth(60)
             
             text_vbox = QVBoxLayout()
-            text_vbox.addWidget(chk)
+            if chk is self.chk_apt_full_clean:
+                text_vbox.addLayout(self.with_estimate_label(chk, "apt_cache"))
+            else:
+                text_vbox.addWidget(chk)
             text_vbox.addWidget(lbl)
             
             item_layout.addWidget(icon_label)
@@ -526,33 +1299,403 @@ class SystemMaid(QMainWindow):
         layout.addLayout(apt_btn_layout)
         return page
 
+    def new_estimate_label(self, category):
+        lbl = QLabel("")
+        lbl.setStyleSheet("color: #3498db; font-weight: bold;")
+        self.estimate_labels[category] = lbl
+        return lbl
+
+    def with_estimate_label(self, chk, category):
+        # Onay kutusunun sağına "~120.4 MB (3,214 files)" biçiminde tahmin etiketi ekler
+        row = QHBoxLayout()
+        row.addWidget(chk)
+        row.addSpacing(10)
+        row.addWidget(self.new_estimate_label(category))
+        row.addStretch(1)
+        return row
+
+    def refresh_estimates(self, categories=None):
+        # categories verilmezse tüm kategoriler yeniden hesaplanır
+        self.pending_estimates.update(estimator.CATEGORIES if categories is None else categories)
+        if self.estimate_worker is not None and self.estimate_worker.isRunning():
+            # Hesaplar üst üste başlatılmaz; bekleyenler çalışan hesap bitince alınır
+            return
+        if not self.pending_estimates:
+            return
+        categories = [name for name in estimator.CATEGORIES if name in self.pending_estimates]
+        self.pending_estimates.clear()
+        for category in categories:
+            for lbl in self.estimate_labels_of(category):
+                lbl.setText("(calculating...)")
+                lbl.setToolTip("")
+        self.estimate_worker = EstimateWorker(self.tracker, categories, self)
+        self.estimate_worker.result.connect(self.show_estimate)
+        self.estimate_worker.details.connect(self.show_estimate_details)
+        self.estimate_worker.failed.connect(self.show_estimate_failure)
+        self.estimate_worker.finished.connect(lambda: self.refresh_estimates(()))
+        self.estimate_worker.start()
+
+    def estimate_labels_of(self, category):
+        # Araç önbelleklerinin her birinin kendi etiketi vardır
+        return [lbl for key, lbl in self.estimate_labels.items()
+                if key == category or (category == "toolchains" and key.startswith("toolchain_"))]
+
+    def show_estimate_failure(self, category, error):
+        for lbl in self.estimate_labels_of(category):
+            lbl.setText("(estimate unavailable)")
+            lbl.setToolTip(error)
+
+    def show_estimate(self, category, files, size):
+        lbl = self.estimate_labels.get(category)
+        if lbl is None:
+            return
+        if category == "thumbnails" and self.settings["thumbnail_mode"] == "budget":
+            # Bütçe kipinde yalnızca sınırı aşan kısım silinir
+            excess = size - self.settings["thumbnail_budget_mb"] * 1024 * 1024
+            if excess > 0:
+                lbl.setText(f"~{estimator.format_size(excess)} over budget")
+            else:
+                lbl.setText("(within budget)")
+            return
+        if category == "browsers":
+            if not files:
+                lbl.setText("(no browser profiles found)")
+                self.lbl_browser_breakdown.setText("")
+            elif size:
+                lbl.setText(f"~{estimator.format_size(size)} ({files} profiles)")
+            else:
+                lbl.setText(f"(all {files} profiles within budget)")
+            return
+        if category == "recent" and self.settings["recent_mode"] == "prune":
+            lbl.setText("(stale entries are checked during cleanup)")
+            return
+        if category == "thumbnails" and self.settings["thumbnail_mode"] == "orphans":
+            lbl.setText(f"up to ~{estimator.format_size(size)} (orphans are checked during cleanup)")
+            return
+        if files:
+            lbl.setText(f"~{estimator.format_size(size)} ({files:,} files)")
+        else:
+            lbl.setText("(nothing to clean)")
+
+    def show_duplicates_dialog(self):
+        dialog = DuplicatesDialog(self.settings["duplicate_min_size_kb"] * 1024, self)
+        dialog.exec()
+
+    def show_cache_usage(self):
+        dialog = CacheUsageDialog(self.cache_usages, self)
+        dialog.exec()
+
+    def show_estimate_details(self, category, details):
+        if category == "user_caches":
+            self.cache_usages = details
+            self.btn_cache_usage.setEnabled(True)
+        if category == "toolchains":
+            for usage in details:
+                lbl = self.estimate_labels.get(f"toolchain_{usage.name}")
+                if lbl is None:
+                    continue
+                if not usage.bytes:
+                    lbl.setText("(no cache)")
+                else:
+                    lbl.setText(f"~{estimator.format_size(usage.reclaimable)} of {estimator.format_size(usage.bytes)}")
+                lbl.setToolTip(f"{usage.root}\n{usage.reclaimable_units:,} of {usage.units:,} packages unused; "
+                               f"{estimator.format_size(usage.protected)} kept because a lockfile uses them.")
+        if category == "browsers":
+            self.lbl_browser_breakdown.setText(
+                "  ·  ".join(f"{name}: {estimator.format_size(size)}" for name, size in details))
+
     def run_clean(self):
-        commands = []
-        # Güvenli silme kontrolü (shred)
-        shred_prefix = "shred -u -n 1 -z " if self.chk_secure.isChecked() else "rm -rf "
+        steps = []
+        home = os.path.expanduser("~")
+        # Güvenli silme (shred) seçiliyse dosyalar önce süreç başlatmadan ezilir
+        secure = self.chk_secure.isChecked()
+        # (başlık, yol, sadece içeriği mi, dizin yapısı korunsun mu, ezilsin mi)
+        targets = []
 
         if self.chk_trash.isChecked():
-            commands.append(f"find ~/.local/share/Trash/files/ -mindepth 1 -exec {shred_prefix} {{}} +")
-            commands.append(f"find ~/.local/share/Trash/info/ -mindepth 1 -exec rm -f {{}} +")
+            steps.append(lambda log, secure=secure: self.purge_trash(secure, log))
 
         if self.chk_recent.isChecked():
-            commands.append(f"{shred_prefix} ~/.local/share/recently-used.xbel")
-            commands.append(f"find ~/.local/share/RecentDocuments/ -mindepth 1 -exec {shred_prefix} {{}} + 2>/dev/null || true")
-            commands.append("find ~/.local/share/zeitgeist -mindepth 1 -delete 2>/dev/null || true")
+            if self.settings["recent_mode"] == "prune":
+                # Dosya silinmez, yalnızca geçersiz ve eski kayıtlar çıkarılarak yeniden yazılır
+                steps.append(lambda log, secure=secure: self.prune_recent(secure, log))
+            else:
+                targets.append(("Recently used list", os.path.join(home, ".local/share/recently-used.xbel"), False, False, secure))
+                targets.append(("RecentDocuments", os.path.join(home, ".local/share/RecentDocuments"), True, False, secure))
+                # Daemon durdurulup geçmiş veritabanı tamamen silinir
+                steps.append(lambda log, secure=secure: self.prune_activity(None, secure, True, log))
 
         if self.chk_thumbnails.isChecked():
-            commands.append(f"find ~/.cache/thumbnails/ -type f -exec {shred_prefix} {{}} +")
+            if self.settings["thumbnail_mode"] == "budget":
+                budget = self.settings["thumbnail_budget_mb"] * 1024 * 1024
+                steps.append(lambda log, budget=budget, secure=secure: self.trim_thumbnails(budget, secure, log))
+            elif self.settings["thumbnail_mode"] == "orphans":
+                steps.append(lambda log, secure=secure: self.clean_thumbnail_orphans(secure, log))
+            else:
+                # normal/large klasörleri yerinde kalır, yalnızca dosyalar silinir
+                targets.append(("Thumbnail cache", os.path.join(home, ".cache/thumbnails"), True, True, secure))
+
+        if self.chk_browsers.isChecked():
+            steps.append(self.clean_browser_caches)
+
+        if self.chk_user_caches.isChecked():
+            steps.append(self.apply_cache_policies)
 
+        tool_names = [name for name, chk in self.toolchain_checks.items() if chk.isChecked()]
+        if tool_names:
+            steps.append(lambda log, names=tool_names: self.clean_toolchain_caches(names, log))
+
+        if targets:
+            steps.insert(0, lambda log, items=targets: self.delete_targets(items, log))
+
+        # Ev dizini tek geçişte taranır; etkin tüm kurallar aynı dolaşımda uygulanır
+        home_rules = []
         if self.chk_thumbs_db.isChecked():
-            commands.append("find ~ -name 'thumbs.db' -type f -delete")
-            commands.append("find ~ -name 'Thumbs.db' -type f -delete")
+            home_rules.append("thumbs_db")
+        if self.chk_broken_links.isChecked():
+            home_rules.append("broken_symlink")
+        if self.chk_empty_dirs.isChecked():
+            home_rules.append("empty_dir")
 
-        if commands:
-            full_command = " && ".join(commands)
-            self.start_process(full_command, "Privacy and Junk Cleanup")
+        if home_rules:
+            steps.append(lambda log, rules=home_rules: self.clean_home_junk(rules, log))
+
+        if steps:
+            self.start_worker(steps, "Privacy and Junk Cleanup")
         else:
             QMessageBox.information(self, "Information", "Please select the items to be cleaned.")
 
+    def delete_targets(self, targets, log):
+        # rm/find süreçleri başlatmadan, dir_fd tabanlı silme motoruyla temizler
+        total = deleter.DeleteStats()
+        eraser = None
+        for title, path, contents_only, keep_dirs, secure in targets:
+            if secure:
+                eraser = eraser or shredder.SecureEraser()
+                erased = eraser.erase_tree(path)
+                if erased.files:
+                    log(f"{title}: {erased.files:,} files securely erased "
+                        f"({estimator.format_size(erased.written)} written at {erased.mb_per_s:.1f} MB/s).")
+                for device, (strategy, files) in erased.by_device.items():
+                    log(f"  {device}: {strategy} ({files:,} files)")
+                    if strategy == "single overwrite":
+                        # Discard desteklenmiyorsa boşalan bloklar ancak FITRIM ile SSD'ye bildirilir
+                        log(f"  {device}: run 'SSD TRIM' on the System Optimization page to release the freed blocks.")
+                for error in erased.errors:
+                    log(f"ERROR: {error}")
+                if erased.failed:
+                    # Ezilemeyen dosyalar düz silmeyle ortadan kaldırılmaz; hedef olduğu gibi bırakılır
+                    log(f"{title}: {len(erased.failed):,} files could not be securely erased; "
+                        f"{path} was left in place.")
+                    continue
+            if contents_only:
+                stats = deleter.clear_directory(path, keep_dirs=keep_dirs)
+            else:
+                stats = deleter.remove_path(path)
+            log(f"{title}: {stats.files:,} files, {stats.dirs:,} folders removed, "
+                f"{estimator.format_size(stats.bytes)} freed.")
+            for error in stats.errors:
+                log(f"ERROR: {error}")
+            total.merge(stats)
+        log(f"Total: {total.inodes:,} inodes, {estimator.format_size(total.bytes)} freed.")
+
+    def start_live_tracking(self):
+        if self.tracker is None or not self.tracker.is_alive():
+            self.tracker = watcher.LiveJunkTracker()
+            self.tracker.start()
+
+    def stop_live_tracking(self):
+        if self.tracker is not None:
+            self.tracker.stop()
+            self.tracker = None
+
+    def toggle_live_tracking(self, enabled):
+        if enabled:
+            self.start_live_tracking()
+        else:
+            self.stop_live_tracking()
+        self.settings["live_tracking"] = enabled
+        self.save_settings()
+
+    def save_settings(self):
+        try:
+            settings.save(self.settings)
+        except OSError as e:
+            self.output_log.append(f"ERROR: Settings could not be saved: {e}")
+
+    def apply_cache_policies(self, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        total = deleter.DeleteStats()
+        for name, stats in caches.apply(policies=self.settings["cache_policies"]):
+            log(f"~/.cache/{name}: {stats.files:,} files removed, {estimator.format_size(stats.bytes)} freed.")
+            for error in stats.errors:
+                log(f"ERROR: {error}")
+            total.merge(stats)
+        log(f"Cache policies: {total.files:,} files, {estimator.format_size(total.bytes)} freed.")
+
+    def clean_toolchain_caches(self, names, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        max_age_days = self.settings["toolchain_max_age_days"]
+        for tool, stats, protected in toolchains.clean(names, max_age_days):
+            kept = f", {estimator.format_size(protected)} kept for lockfiles" if protected else ""
+            log(f"{tool.label}: {stats.files:,} files removed, {estimator.format_size(stats.bytes)} freed{kept}.")
+            for error in stats.errors:
+                log(f"ERROR: {error}")
+
+    def clean_browser_caches(self, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        mode = self.settings["browser_cache_mode"]
+        budget = self.settings["browser_cache_budget_mb"] * 1024 * 1024
+        profiles = browsers.discover()
+        if not profiles:
+            log("Browser caches: no Firefox or Chromium profiles found.")
+            return
+        for profile, stats in browsers.clean(profiles, mode, budget):
+            title = f"{profile.browser} ({profile.name})"
+            if stats is None:
+                log(f"{title}: browser is running, skipped. Close it or use the size budget mode.")
+                continue
+            log(f"{title}: {stats.files:,} cache files removed, {estimator.format_size(stats.bytes)} freed.")
+            for error in stats.errors:
+                log(f"ERROR: {error}")
+
+    def prune_recent(self, secure, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        max_age_days = self.settings["recent_max_age_days"]
+        eraser = shredder.SecureEraser() if secure else None
+        try:
+            stats = recent.prune_xbel(max_age_days=max_age_days, eraser=eraser)
+        except (OSError, SyntaxError) as e:
+            # Bozuk XML (xml.etree ParseError) de SyntaxError sınıfındandır
+            log(f"ERROR: recently-used.xbel could not be rewritten: {e}")
+        else:
+            log(f"Recently used list: {stats.missing:,} missing and {stats.expired:,} old entries removed, "
+                f"{stats.kept:,} kept ({estimator.format_size(stats.size_before)} -> "
+                f"{estimator.format_size(stats.size_after)}).")
+            for path in stats.not_erased:
+                log(f"ERROR: the previous list could not be securely erased and was kept as {path}")
+        if max_age_days:
+            self.prune_activity(time.time() - max_age_days * 86400, secure, False, log)
+        stale = recent.stale_recent_documents(max_age_days)
+        if stale and eraser is not None:
+            erased = eraser.erase_files(stale)
+            if erased.failed:
+                log(f"RecentDocuments: {len(erased.failed):,} entries could not be securely erased and were kept.")
+                failed = set(erased.failed)
+                stale = [path for path in stale if path not in failed]
+        if stale:
+            total = deleter.DeleteStats()
+            for path in stale:
+                deleter.remove_path(path, total)
+            log(f"RecentDocuments: {len(stale):,} stale entries removed.")
+            for error in total.errors:
+                log(f"ERROR: {error}")
+
+    def prune_activity(self, before, secure, drop_fts, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        # before None ise geçmişin tamamı silinir
+        try:
+            if before is None:
+                stats = zeitgeist.clear(eraser=shredder.SecureEraser() if secure else None)
+            else:
+                stats = zeitgeist.prune(before, secure=secure, drop_fts=drop_fts)
+        except sqlite3.Error as e:
+            log(f"ERROR: Zeitgeist database could not be pruned: {e}")
+            return
+        if not stats.size_before:
+            return
+        log(f"Zeitgeist history: {stats.events:,} events removed "
+            f"({estimator.format_size(stats.size_before)} -> {estimator.format_size(stats.size_after)}).")
+        if stats.not_erased:
+            log(f"Zeitgeist history: {len(stats.not_erased):,} files could not be securely erased; "
+                f"the remaining files were left in place.")
+        if stats.daemon_stopped:
+            log("Zeitgeist daemon was stopped for compaction; it restarts on demand.")
+        elif not stats.compacted:
+            log("Zeitgeist daemon did not stop; the database was not compacted.")
+
+    def purge_trash(self, secure, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        # Canlı izleme açıksa ev dizinindeki çöp kutusu yeniden dolaşılmaz
+        tracker = self.tracker
+        items = trash.selected_items(self.settings, home_items=tracker.trash_items() if tracker is not None else None)
+        eraser = shredder.SecureEraser() if secure else None
+        stats = trash.purge(items, eraser=eraser)
+        for top in sorted({item.trash.top for item in items}):
+            count = sum(1 for item in items if item.trash.top == top)
+            log(f"Trash: {count:,} item(s) removed from {top}")
+        log(f"Trash: {stats.files:,} files, {stats.dirs:,} folders removed, "
+            f"{estimator.format_size(stats.bytes)} freed.")
+        if stats.kept_items:
+            log(f"Trash: {stats.kept_items:,} item(s) could not be securely erased and were kept.")
+        for error in stats.errors:
+            log(f"ERROR: {error}")
+
+    def trim_thumbnails(self, budget, secure, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        eraser = shredder.SecureEraser() if secure else None
+        stats, remaining = thumbnails.evict_to_budget(
+            budget, order=self.settings["thumbnail_eviction_order"], eraser=eraser)
+        log(f"Thumbnail cache: {stats.files:,} least recently used previews removed, "
+            f"{estimator.format_size(stats.bytes)} freed, "
+            f"{estimator.format_size(remaining)} kept (budget {estimator.format_size(budget)}).")
+        for error in stats.errors:
+            log(f"ERROR: {error}")
+
+    def clean_thumbnail_orphans(self, secure, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        eraser = shredder.SecureEraser() if secure else None
+        stats = thumbnails.remove_orphans(eraser=eraser)
+        log(f"Thumbnail cache: {stats.files:,} previews of deleted files removed, "
+            f"{estimator.format_size(stats.bytes)} freed.")
+        for error in stats.errors:
+            log(f"ERROR: {error}")
+
+    def clean_home_junk(self, rule_names, log):
+        # Bu fonksiyon CleanupWorker iş parçacığında çalışır, arayüze dokunmaz.
+        home = os.path.expanduser("~")
+        counts = dict.fromkeys(rule_names, 0)
+        index_stats = {}
+        # .git, node_modules, sanal ortamlar gibi alt ağaçlar hiç okunmaz
+        exclude = exclusions.default()
+        tracker = self.tracker
+        if tracker is not None and tracker.can_serve(rule_names):
+            # Canlı liste hazırsa ev dizini taranmaz
+            log("Using the live junk list (inotify).")
+            candidates = tracker.collect(rule_names)
+        else:
+            # Kalıcı indeks sayesinde değişmeyen dizinler yeniden okunmaz
+            candidates = scanindex.indexed_scan(home, scanner.get_rules(rule_names), stats=index_stats, exclude=exclude)
+
+        for candidate in candidates:
+            # Ev dizininin hemen altındaki boş klasörler (XDG kullanıcı dizinleri) korunur
+            if candidate.rule == "empty_dir":
+                if os.path.dirname(candidate.path) == home:
+                    continue
+                # Taramadan sonra içine dosya yazılmışsa rmdir başarısız olur, içerik silinmez
+                try:
+                    os.rmdir(candidate.path)
+                except OSError:
+                    continue
+                counts[candidate.rule] += 1
+                log(f"Deleted: {candidate.path}")
+                continue
+            stats = deleter.remove_path(candidate.path)
+            if stats.inodes:
+                counts[candidate.rule] += 1
+                log(f"Deleted: {candidate.path}")
+            for error in stats.errors:
+                log(f"ERROR: {error}")
+
+        for rule_name, count in counts.items():
+            log(f"{rule_name}: {count} item(s) removed.")
+        if index_stats:
+            log(f"Scan index: {index_stats['rescanned']} directories read, {index_stats['cached']} unchanged.")
+        if exclude.skipped:
+            log(f"Skipped {exclude.skipped} excluded directories (see scan_exclude_* in settings.json).")
+        if exclude.skipped_mounts:
+            log(f"Skipped {exclude.skipped_mounts} network/FUSE mount(s) (see scan_allowed_mounts in settings.json).")
+
     def run_apt_clean(self):
         commands = []
         
@@ -596,6 +1739,25 @@ class SystemMaid(QMainWindow):
         # Eski programdaki gibi log_message yapısı yerine doğrudan output_log'a yazıyoruz
         self.process.start("/bin/bash", ["-c", command])
 
+    def start_worker(self, steps, task_name):
+        # Python tabanlı temizlik adımları için start_process karşılığı
+        if self.worker is not None and self.worker.isRunning():
+            QMessageBox.information(self, "Information", "Another cleanup task is still running.")
+            return
+
+        self.output_log.clear()
+        self.output_log.append(f"\n--- {task_name} Started ---")
+        self.worker = CleanupWorker(steps, self)
+        self.worker.log.connect(self.append_log)
+        self.worker.done.connect(lambda code, name=task_name: self.handle_finished(code, None, name))
+        self.worker.start()
+
+    def append_log(self, text):
+        self.output_log.append(text)
+        self.output_log.verticalScrollBar().setValue(
+            self.output_log.verticalScrollBar().maximum()
+        )
+
     def handle_stdout(self):
         data = bytes(self.process.readAllStandardOutput()).decode().strip()
         if data:
@@ -611,6 +1773,9 @@ class SystemMaid(QMainWindow):
             self.output_log.append(f"ERROR: {data}")
     
     def handle_finished(self, exitCode, exitStatus, task_name):
+        # Temizlikten sonra tahminler güncellenir
+        self.refresh_estimates()
+        self.sample_free_space()
         if exitCode == 0:
             self.output_log.append(f"\n>>> {task_name} completed successfully.")
         else:
@@ -621,6 +1786,46 @@ class SystemMaid(QMainWindow):
             self.output_log.verticalScrollBar().maximum()
         )
 
+    def sample_free_space(self):
+        if self.space_history is None:
+            return
+        try:
+            self.space_history.record()
+            forecasts = self.space_history.forecasts()
+        except sqlite3.Error:
+            return
+        self.show_forecast(forecasts)
+
+    def show_forecast(self, forecasts):
+        filling = [f for f in forecasts if f.days_left is not None]
+        if not filling:
+            collecting = any(f.rate is None for f in forecasts)
+            self.lbl_forecast.setText("Disk space: collecting history..." if collecting else "Disk space: no disk is filling up")
+            self.lbl_forecast.setStyleSheet("color: #7f8c8d;")
+            for btn in (self.btn_forecast_apt, self.btn_forecast_logs):
+                btn.setVisible(False)
+            return
+        worst = filling[0]
+        days = f"{worst.days_left:.0f} days" if worst.days_left >= 2 else "less than 2 days"
+        self.lbl_forecast.setText(f"Disk space: {worst.mountpoint} full in ~{days} "
+                                  f"({estimator.format_size(worst.avail)} free, -{estimator.format_size(-worst.rate)}/day)")
+        self.lbl_forecast.setToolTip("\n".join(
+            f"{f.mountpoint}: {estimator.format_size(f.avail)} free"
+            + (f", full in ~{f.days_left:.0f} days" if f.days_left is not None else "")
+            for f in forecasts))
+        warn = worst.days_left <= self.settings["free_space_warn_days"]
+        self.lbl_forecast.setStyleSheet("color: #c0392b; font-weight: bold;" if warn else "color: #7f8c8d;")
+        # APT önbelleği ve sistem günlükleri /var altındadır; uyarı o diskteyse kısayollar gösterilir
+        # (geçmiş aygıt başına tek bağlama noktasıyla tutulur; eşleştirme aygıt numarasıyla yapılır)
+        table = mounts.MountTable()
+        system_devices = {m.device for m in (table.find("/var/cache/apt"), table.find("/var/log")) if m is not None}
+        on_system = warn and any(
+            f.days_left <= self.settings["free_space_warn_days"]
+            and getattr(table.by_mountpoint.get(f.mountpoint), "device", None) in system_devices
+            for f in filling)
+        for btn in (self.btn_forecast_apt, self.btn_forecast_logs):
+            btn.setVisible(on_system)
+
     def create_opt_page(self):
         page = QWidget()
         main_layout = QVBoxLayout(page)
@@ -656,6 +1861,8 @@ class SystemMaid(QMainWindow):
         log_vbox.addWidget(log_desc)
         log_btn_lay = QHBoxLayout()
         log_btn_lay.addWidget(btn_log)
+        log_btn_lay.addSpacing(10)
+        log_btn_lay.addWidget(self.new_estimate_label("journal"))
         log_btn_lay.addStretch(1)
         log_vbox.addLayout(log_btn_lay)
         
@@ -847,7 +2054,262 @@ class SystemMaid(QMainWindow):
         main_layout.addWidget(scroll)
         return page
 
-    
+    def create_usage_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        group = QGroupBox("Disk Usage Analysis")
+        g_layout = QVBoxLayout(group)
+
+        lbl_desc = QLabel("Finds the largest files and folders without deleting anything. "
+                          "Other file systems mounted below the selected location are not entered.")
+        lbl_desc.setWordWrap(True)
+        lbl_desc.setStyleSheet("color: #7f8c8d;")
+        g_layout.addWidget(lbl_desc)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Location:"))
+        self.cmb_usage_root = self.new_location_combo()
+        controls.addWidget(self.cmb_usage_root, 1)
+        controls.addWidget(QLabel("Show top:"))
+        self.spin_usage_top = QSpinBox()
+        self.spin_usage_top.setRange(10, 1000)
+        self.spin_usage_top.setValue(usage.DEFAULT_TOP)
+        controls.addWidget(self.spin_usage_top)
+        self.chk_usage_snapshot = QCheckBox("Track growth")
+        self.chk_usage_snapshot.setToolTip("Saves a compact snapshot of folder sizes and compares it with the previous run.")
+        self.chk_usage_snapshot.setChecked(True)
+        controls.addWidget(self.chk_usage_snapshot)
+        self.btn_usage_start = QPushButton("Analyze")
+        self.btn_usage_start.setStyleSheet("background-color: #004700; color: white;")
+        self.btn_usage_start.clicked.connect(self.start_usage_analysis)
+        controls.addWidget(self.btn_usage_start)
+        g_layout.addLayout(controls)
+
+        self.lbl_usage_status = QLabel("")
+        g_layout.addWidget(self.lbl_usage_status)
+
+        tables = QHBoxLayout()
+        self.tbl_usage_files = self.new_usage_table("Largest Files")
+        self.tbl_usage_dirs = self.new_usage_table("Largest Folders")
+        tables.addWidget(self.tbl_usage_files)
+        tables.addWidget(self.tbl_usage_dirs)
+        g_layout.addLayout(tables, 1)
+
+        # Önceki anlık görüntüye göre en çok büyüyen dizinler
+        growth_row = QHBoxLayout()
+        self.lbl_usage_growth = QLabel("")
+        self.lbl_usage_growth.setStyleSheet("font-weight: bold;")
+        growth_row.addWidget(self.lbl_usage_growth)
+        growth_row.addStretch(1)
+        self.cmb_growth_by = QComboBox()
+        self.cmb_growth_by.addItem("Files directly in the folder", "own")
+        self.cmb_growth_by.addItem("Whole folder tree", "total")
+        self.cmb_growth_by.currentIndexChanged.connect(self.show_usage_growth)
+        growth_row.addWidget(self.cmb_growth_by)
+        g_layout.addLayout(growth_row)
+        self.tbl_usage_growth = QTableWidget(0, 3)
+        self.tbl_usage_growth.setHorizontalHeaderLabels(["Fastest Growing Folders", "Growth", "Size Now"])
+        self.tbl_usage_growth.verticalHeader().setVisible(False)
+        self.tbl_usage_growth.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tbl_usage_growth.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        g_layout.addWidget(self.tbl_usage_growth, 1)
+        self.usage_growth = None
+        for widget in (self.lbl_usage_growth, self.cmb_growth_by, self.tbl_usage_growth):
+            widget.setVisible(False)
+
+        layout.addWidget(group)
+
+        self.btn_usage_export = QPushButton("Export JSON...")
+        self.btn_usage_export.setFixedSize(180, 35)
+        self.btn_usage_export.setEnabled(False)
+        self.btn_usage_export.clicked.connect(self.export_usage_report)
+        export_layout = QHBoxLayout()
+        export_layout.addWidget(self.btn_usage_export)
+        export_layout.addStretch(1)
+        layout.addLayout(export_layout)
+        return page
+
+    def new_location_combo(self):
+        combo = QComboBox()
+        combo.addItem("Home", os.path.expanduser("~"))
+        # Yalnızca blok aygıtı üzerindeki yerel bağlama noktaları listelenir
+        for mount in mounts.MountTable().of_kind("local"):
+            if mount.source.startswith("/dev/") and combo.findData(mount.mountpoint) < 0:
+                combo.addItem(mount.mountpoint, mount.mountpoint)
+        return combo
+
+    def new_usage_table(self, title):
+        table = QTableWidget(0, 2)
+        table.setHorizontalHeaderLabels([title, "Size"])
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        return table
+
+    def fill_usage_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, (size, path) in enumerate(rows):
+            table.setItem(row, 0, QTableWidgetItem(path))
+            item = QTableWidgetItem(estimator.format_size(size))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            table.setItem(row, 1, item)
+
+    def start_usage_analysis(self):
+        if self.usage_worker is not None and self.usage_worker.isRunning():
+            return
+        self.btn_usage_start.setEnabled(False)
+        self.btn_usage_export.setEnabled(False)
+        self.usage_report = None
+        root = self.cmb_usage_root.currentData()
+        self.lbl_usage_status.setText(f"Scanning {root}...")
+        self.usage_worker = AnalysisWorker(root, self.spin_usage_top.value(), self.chk_usage_snapshot.isChecked(), self)
+        self.usage_worker.progress.connect(self.lbl_usage_status.setText)
+        self.usage_worker.growth.connect(self.set_usage_growth)
+        self.usage_worker.finished_report.connect(self.show_usage_report)
+        self.usage_worker.start()
+
+    def show_usage_report(self, report):
+        self.btn_usage_start.setEnabled(True)
+        if report is None:
+            return
+        self.usage_report = report
+        self.fill_usage_table(self.tbl_usage_files, report.largest_files)
+        self.fill_usage_table(self.tbl_usage_dirs, report.largest_dirs)
+        self.lbl_usage_status.setText(
+            f"{report.root}: {estimator.format_size(report.total_bytes)} in {report.files:,} files and "
+            f"{report.dirs:,} folders ({report.seconds:.1f} s, {report.errors:,} unreadable folders)")
+        self.btn_usage_export.setEnabled(True)
+
+    def set_usage_growth(self, previous, current):
+        self.usage_growth = (previous, current)
+        self.show_usage_growth()
+
+    def show_usage_growth(self, *_args):
+        if self.usage_growth is None:
+            return
+        previous, current = self.usage_growth
+        for widget in (self.lbl_usage_growth, self.cmb_growth_by, self.tbl_usage_growth):
+            widget.setVisible(True)
+        if previous is None:
+            self.lbl_usage_growth.setText("Snapshot saved. Growth is shown from the next analysis of this location on.")
+            self.cmb_growth_by.setVisible(False)
+            self.tbl_usage_growth.setRowCount(0)
+            return
+        since = time.strftime("%Y-%m-%d %H:%M", time.localtime(previous.created))
+        change = current.total_bytes - previous.total_bytes
+        self.lbl_usage_growth.setText(f"Since {since}: {'+' if change >= 0 else '-'}{estimator.format_size(abs(change))}")
+        rows = snapshots.diff(previous, current, top=self.spin_usage_top.value(), by=self.cmb_growth_by.currentData())
+        self.tbl_usage_growth.setRowCount(len(rows))
+        for row, growth in enumerate(rows):
+            self.tbl_usage_growth.setItem(row, 0, QTableWidgetItem(growth.path))
+            for column, size in ((1, growth.grown), (2, growth.bytes)):
+                item = QTableWidgetItem(("+" if column == 1 else "") + estimator.format_size(size))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tbl_usage_growth.setItem(row, column, item)
+
+    def export_usage_report(self):
+        if self.usage_report is None:
+            return
+        path, _filter = QFileDialog.getSaveFileName(
+            self, "Export Report", os.path.join(os.path.expanduser("~"), "disk-usage.json"), "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.usage_report.export_json(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Report", f"The report could not be saved:\n{e}")
+            return
+        self.append_log(f"Disk usage report saved: {path}")
+
+    def create_treemap_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        group = QGroupBox("Disk Usage Map")
+        g_layout = QVBoxLayout(group)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Location:"))
+        self.cmb_treemap_root = self.new_location_combo()
+        self.cmb_treemap_root.currentIndexChanged.connect(self.load_treemap)
+        controls.addWidget(self.cmb_treemap_root, 1)
+        controls.addWidget(QLabel("Depth:"))
+        self.spin_treemap_depth = QSpinBox()
+        self.spin_treemap_depth.setRange(1, 4)
+        self.spin_treemap_depth.setValue(2)
+        controls.addWidget(self.spin_treemap_depth)
+        self.btn_treemap_up = QPushButton("Up")
+        controls.addWidget(self.btn_treemap_up)
+        self.btn_treemap_update = QPushButton("Update")
+        self.btn_treemap_update.setStyleSheet("background-color: #004700; color: white;")
+        self.btn_treemap_update.clicked.connect(lambda: self.update_treemap(full=False))
+        controls.addWidget(self.btn_treemap_update)
+        self.btn_treemap_full = QPushButton("Full Rescan")
+        self.btn_treemap_full.clicked.connect(lambda: self.update_treemap(full=True))
+        controls.addWidget(self.btn_treemap_full)
+        g_layout.addLayout(controls)
+
+        self.lbl_treemap_path = QLabel("")
+        self.lbl_treemap_path.setStyleSheet("font-weight: bold;")
+        g_layout.addWidget(self.lbl_treemap_path)
+
+        self.treemap_view = TreemapView()
+        self.treemap_view.path_changed.connect(self.show_treemap_path)
+        self.spin_treemap_depth.valueChanged.connect(self.treemap_view.set_depth)
+        self.btn_treemap_up.clicked.connect(self.treemap_view.go_up)
+        g_layout.addWidget(self.treemap_view, 1)
+
+        self.lbl_treemap_status = QLabel("Click a folder to open it, right-click to go up. "
+                                         "Only folders that changed since the last update are read again.")
+        self.lbl_treemap_status.setWordWrap(True)
+        self.lbl_treemap_status.setStyleSheet("color: #7f8c8d;")
+        g_layout.addWidget(self.lbl_treemap_status)
+
+        layout.addWidget(group)
+        self.load_treemap()
+        return page
+
+    def load_treemap(self, *_args):
+        # Önceki taramanın toplamları indeksten hemen gösterilir; tarama yapılmaz
+        if self.treemap_index is None:
+            try:
+                self.treemap_index = treemap.SizeIndex()
+            except (OSError, sqlite3.Error) as e:
+                self.lbl_treemap_status.setText(f"The size index could not be opened: {e}")
+                return
+        self.treemap_view.set_index(self.treemap_index, os.path.normpath(self.cmb_treemap_root.currentData()))
+
+    def show_treemap_path(self, path):
+        tile = self.treemap_index.tile(path) if self.treemap_index is not None else None
+        if tile is None:
+            self.lbl_treemap_path.setText(path)
+        else:
+            self.lbl_treemap_path.setText(f"{path}: {estimator.format_size(tile.bytes)} in {tile.files:,} files")
+
+    def update_treemap(self, full=False):
+        if self.treemap_worker is not None and self.treemap_worker.isRunning():
+            return
+        self.btn_treemap_update.setEnabled(False)
+        self.btn_treemap_full.setEnabled(False)
+        self.treemap_worker = TreemapWorker(self.cmb_treemap_root.currentData(), full, self)
+        self.treemap_worker.progress.connect(self.lbl_treemap_status.setText)
+        self.treemap_worker.refreshed.connect(self.treemap_updated)
+        self.treemap_worker.start()
+
+    def treemap_updated(self, stats):
+        self.btn_treemap_update.setEnabled(True)
+        self.btn_treemap_full.setEnabled(True)
+        if stats is None:
+            return
+        self.lbl_treemap_status.setText(f"Updated: {stats['rescanned']:,} folders read, "
+                                        f"{stats['cached']:,} unchanged folders taken from the index.")
+        # İnilen dizin korunur; yalnızca yeni toplamlarla yeniden yerleştirilir
+        path = self.treemap_view.path
+        if path is None or self.treemap_index.tile(path) is None:
+            self.load_treemap()
+        else:
+            self.treemap_view.set_path(path)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
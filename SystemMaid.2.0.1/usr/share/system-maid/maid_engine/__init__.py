@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# System Maid temizlik motoru.
+# Arayüzden (PyQt6) bağımsız tarama ve temizlik yardımcıları burada tutulur.
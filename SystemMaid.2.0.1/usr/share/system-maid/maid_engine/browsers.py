@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import configparser
+import json
+import os
+import socket
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import deleter, scanner
+
+HOME = os.path.expanduser("~")
+CONFIG_HOME = os.environ.get("XDG_CONFIG_HOME") or os.path.join(HOME, ".config")
+CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or os.path.join(HOME, ".cache")
+
+# Firefox profiles.ini konumları: deb/tar.gz, snap ve flatpak paketleri
+FIREFOX_ROOTS = [
+    (os.path.join(HOME, ".mozilla/firefox"), os.path.join(CACHE_HOME, "mozilla/firefox")),
+    (os.path.join(HOME, "snap/firefox/common/.mozilla/firefox"), os.path.join(HOME, "snap/firefox/common/.cache/mozilla/firefox")),
+    (os.path.join(HOME, ".var/app/org.mozilla.firefox/.mozilla/firefox"), os.path.join(HOME, ".var/app/org.mozilla.firefox/cache/mozilla/firefox")),
+]
+FIREFOX_CACHES = ["cache2", "startupCache"]
+
+# Chromium tabanlı tarayıcılar: (görünen ad, ~/.config ve ~/.cache altındaki göreli dizin)
+CHROMIUM_BROWSERS = [
+    ("Google Chrome", "google-chrome"),
+    ("Chromium", "chromium"),
+    ("Brave", "BraveSoftware/Brave-Browser"),
+    ("Microsoft Edge", "microsoft-edge"),
+    ("Vivaldi", "vivaldi"),
+    ("Opera", "opera"),
+]
+# Profilin ~/.cache altındaki ve ~/.config altındaki önbellek dizinleri
+CHROMIUM_CACHE_DIRS = ["Cache", "Code Cache"]
+CHROMIUM_CONFIG_CACHES = ["GPUCache", "Service Worker/CacheStorage", "Service Worker/ScriptCache"]
+
+# Tarayıcı çalışırken silinirse önbelleğin tamamını geçersiz kılan dizin/dosya adları;
+# bütçe kipinde yalnızca tek tek kayıt dosyaları silinir
+INDEX_NAMES = {"index", "index-dir", "the-real-index", "index.txt", "data_0", "data_1", "data_2", "data_3"}
+
+# Tarayıcı profili: lock_path profil kullanımdayken var olan kilit bağlantısıdır
+BrowserProfile = namedtuple("BrowserProfile", ["browser", "name", "caches", "lock_path"])
+
+
+def _firefox_profiles():
+    profiles = []
+    for root, cache_root in FIREFOX_ROOTS:
+        parser = configparser.RawConfigParser()
+        try:
+            if not parser.read(os.path.join(root, "profiles.ini"), encoding="utf-8"):
+                continue
+        except configparser.Error:
+            continue
+        for section in parser.sections():
+            if not section.startswith("Profile") or not parser.has_option(section, "Path"):
+                continue
+            path = parser.get(section, "Path")
+            if parser.get(section, "IsRelative", fallback="1") == "1":
+                profile_dir = os.path.join(root, path)
+                cache_dir = os.path.join(cache_root, path)
+            else:
+                # Mutlak yollu profillerin önbelleği profil dizininin içindedir
+                profile_dir = cache_dir = path
+            caches = tuple(os.path.join(cache_dir, name) for name in FIREFOX_CACHES)
+            name = parser.get(section, "Name", fallback=os.path.basename(path))
+            profiles.append(BrowserProfile("Firefox", name, caches, os.path.join(profile_dir, "lock")))
+    return profiles
+
+
+def _chromium_profiles():
+    profiles = []
+    for browser, relative in CHROMIUM_BROWSERS:
+        config_dir = os.path.join(CONFIG_HOME, relative)
+        try:
+            with open(os.path.join(config_dir, "Local State"), encoding="utf-8") as f:
+                info_cache = json.load(f).get("profile", {}).get("info_cache", {})
+        except (OSError, ValueError, AttributeError):
+            continue
+        for directory, info in info_cache.items():
+            caches = tuple(os.path.join(CACHE_HOME, relative, directory, name) for name in CHROMIUM_CACHE_DIRS)
+            caches += tuple(os.path.join(config_dir, directory, name) for name in CHROMIUM_CONFIG_CACHES)
+            name = info.get("name", directory) if isinstance(info, dict) else directory
+            # Chromium tüm profiller için tek bir SingletonLock kullanır
+            profiles.append(BrowserProfile(browser, name, caches, os.path.join(config_dir, "SingletonLock")))
+    return profiles
+
+
+def discover():
+    """profiles.ini ve Local State dosyalarından tarayıcı profillerini bulur."""
+    return _firefox_profiles() + _chromium_profiles()
+
+
+def is_running(profile):
+    """Kilit bağlantısı canlı bir sürece işaret ediyorsa profil kullanımdadır.
+    Firefox: lock -> "ip:+pid", Chromium: SingletonLock -> "hostname-pid"."""
+    try:
+        target = os.readlink(profile.lock_path)
+    except OSError:
+        return False
+    host, pid = None, None
+    if ":+" in target:
+        pid = target.rpartition(":+")[2]
+    else:
+        host, _, pid = target.rpartition("-")
+    if not pid.isdigit():
+        # Biçim tanınmıyorsa güvenli tarafta kalınır
+        return True
+    if host and host != socket.gethostname():
+        # Başka bir makineden (ör. NFS ev dizini) kilitlenmiş; burada denetlenemez
+        return True
+    return os.path.exists(f"/proc/{pid}")
+
+
+def _cache_files(cache):
+    # Önbellekteki tüm dosyalar için (son kullanım, ayrılmış bayt, yol) listesi
+    files = []
+    if not os.path.isdir(cache):
+        return files
+    for _path, entries in scanner.walk(cache, workers=1):
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            files.append((max(st.st_atime, st.st_mtime), st.st_blocks * 512, entry.path))
+    return files
+
+
+def _is_entry_file(path):
+    name = os.path.basename(path)
+    return name not in INDEX_NAMES and os.path.basename(os.path.dirname(path)) not in INDEX_NAMES
+
+
+def measure(profiles, workers=None):
+    """Her profilin önbelleklerini paralel ölçer: {profil: {önbellek yolu: bayt}}."""
+    jobs = [(profile, cache) for profile in profiles for cache in profile.caches]
+    sizes = {profile: {} for profile in profiles}
+    if not jobs:
+        return sizes
+    workers = workers or min(len(jobs), scanner.default_workers())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-browser") as pool:
+        results = pool.map(lambda job: sum(size for _t, size, _p in _cache_files(job[1])), jobs)
+        for (profile, cache), size in zip(jobs, results):
+            if size:
+                sizes[profile][cache] = size
+    return sizes
+
+
+def evict_profile(profile, budget_bytes, stats=None):
+    """Profilin önbelleklerini toplam budget_bytes altına indirene kadar en uzun süredir
+    kullanılmayan kayıt dosyalarını siler. Dizin (index) dosyalarına dokunulmaz;
+    tarayıcılar eksik kayıtları önbellekte bulunamamış sayar, bu yüzden çalışırken de güvenlidir."""
+    stats = stats if stats is not None else deleter.DeleteStats()
+    files = []
+    for cache in profile.caches:
+        files.extend(_cache_files(cache))
+    total = sum(size for _t, size, _p in files)
+    if total <= budget_bytes:
+        return stats
+    files.sort()
+    for _last_used, size, path in files:
+        if total <= budget_bytes:
+            break
+        if not _is_entry_file(path):
+            continue
+        deleter.remove_path(path, stats)
+        total -= size
+    return stats
+
+
+def wipe_profile(profile, stats=None):
+    """Tarayıcı kapalıyken profilin önbelleklerini tamamen boşaltır."""
+    stats = stats if stats is not None else deleter.DeleteStats()
+    for cache in profile.caches:
+        deleter.clear_directory(cache, stats=stats)
+    return stats
+
+
+def clean(profiles, mode="budget", budget_bytes=0, workers=None):
+    """Profilleri paralel temizler. Dönen değer: [(profil, silme istatistiği ya da
+    tarayıcı çalıştığı için atlandıysa None)]."""
+    def clean_one(profile):
+        if mode == "all":
+            if is_running(profile):
+                return None
+            return wipe_profile(profile)
+        return evict_profile(profile, budget_bytes)
+
+    if not profiles:
+        return []
+    workers = workers or min(len(profiles), 8)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-browser") as pool:
+        return list(zip(profiles, pool.map(clean_one, profiles)))
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import deleter, pathtable, scanner, settings
+
+CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+# Yaş dağılımı dilimleri (gün); son dilim bir yıldan eski dosyalardır
+AGE_BUCKETS = (1, 7, 30, 90, 365)
+AGE_LABELS = ("<1d", "1-7d", "7-30d", "30-90d", "90d-1y", ">1y")
+
+# Kendi seçenekleri olan önbellekler "*" varsayılan politikasından etkilenmez;
+# yalnızca adlarıyla açıkça yazılmış bir politika uygulanır
+MANAGED_ELSEWHERE = {
+    "thumbnails", "mozilla", "google-chrome", "chromium", "BraveSoftware",
+    "microsoft-edge", "vivaldi", "opera", "system-maid", "pip",
+}
+
+# Bir uygulamanın ~/.cache altındaki kullanımı; reclaimable politikaya göre boşalacak alandır
+AppUsage = namedtuple("AppUsage", ["name", "bytes", "files", "histogram", "reclaimable", "reclaimable_files", "policy"])
+
+
+def policy_for(name, policies):
+    """Uygulamanın politikası: {"max_mb": N, "max_age_days": N, "whole": bool} ya da None.
+    "*" politikası her zaman bütün girdi olarak uygulanır: adı yazılmamış uygulamaların
+    (tarayıcı motorları, modeller, IDE indeksleri...) içinden tek tek dosya silinip
+    ağacı yarım bırakılmaz."""
+    if name in policies:
+        return policies[name] or None
+    if name in MANAGED_ELSEWHERE:
+        return None
+    policy = policies.get("*")
+    return dict(policy, whole=True) if policy else None
+
+
+def whole_entry_stale(files, policy, now=None):
+    """Bütün girdi politikasında girdi yalnızca içindeki tüm dosyalar max_age_days
+    günden uzun süredir kullanılmıyorsa silinir; max_mb bu kipte dikkate alınmaz."""
+    max_age_days = policy.get("max_age_days") or 0
+    if not max_age_days or not files:
+        return False
+    now = time.time() if now is None else now
+    return max(item[0] for item in files) < now - max_age_days * 86400
+
+
+def _bucket(age_days):
+    for index, limit in enumerate(AGE_BUCKETS):
+        if age_days < limit:
+            return index
+    return len(AGE_BUCKETS)
+
+
+def _last_used(st):
+    # relatime ile atime günde bir güncellenir; noatime bağlamalarda mtime kullanılır
+    return max(st.st_atime, st.st_mtime)
+
+
+def select(files, policy, now=None):
+    """files: (son kullanım, bayt, ...) demetleri. Önce max_age_days günden uzun süredir
+    kullanılmayanlar, ardından toplam max_mb altına inene kadar en eskiler seçilir."""
+    if not policy:
+        return []
+    now = time.time() if now is None else now
+    max_age_days = policy.get("max_age_days") or 0
+    max_bytes = (policy.get("max_mb") or 0) * 1024 * 1024
+    ordered = sorted(files, key=lambda item: item[0])
+    chosen = []
+    kept = []
+    cutoff = now - max_age_days * 86400
+    for item in ordered:
+        if max_age_days and item[0] < cutoff:
+            chosen.append(item)
+        else:
+            kept.append(item)
+    if max_bytes:
+        total = sum(item[1] for item in kept)
+        for item in kept:
+            if total <= max_bytes:
+                break
+            chosen.append(item)
+            total -= item[1]
+    return chosen
+
+
+def _files_of(path, paths=None):
+    """(son kullanım, bayt) demetleri. paths (PathTable) verilirse demetin üçüncü
+    elemanı dosyanın o tablodaki sırasıdır; tam yollar listede tutulmaz."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return []
+    if not os.path.isdir(path) or os.path.islink(path):
+        return [(_last_used(st), st.st_blocks * 512, paths.add(-1, path)) if paths is not None
+                else (_last_used(st), st.st_blocks * 512)]
+    files = []
+    for dir_path, entries in scanner.walk(path, workers=1):
+        directory = paths.enter(dir_path) if paths is not None else None
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if paths is not None:
+                files.append((_last_used(st), st.st_blocks * 512, paths.add(directory, entry.name)))
+            else:
+                files.append((_last_used(st), st.st_blocks * 512))
+    if paths is not None:
+        paths.finish()
+    return files
+
+
+def _measure(job):
+    name, path, policy, now = job
+    files = _files_of(path)
+    histogram = [0] * (len(AGE_BUCKETS) + 1)
+    total = 0
+    for last_used, size in files:
+        total += size
+        histogram[_bucket((now - last_used) / 86400)] += size
+    if policy and policy.get("whole"):
+        chosen = files if whole_entry_stale(files, policy, now) else []
+    else:
+        chosen = select(files, policy, now)
+    return AppUsage(name, total, len(files), histogram, sum(size for _t, size in chosen), len(chosen), policy)
+
+
+def account(root=CACHE_HOME, policies=None, workers=None):
+    """~/.cache altındaki her üst düzey girdiyi paralel ölçer ve boyuta göre
+    büyükten küçüğe sıralı AppUsage listesi döndürür."""
+    if policies is None:
+        policies = settings.load()["cache_policies"]
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+    now = time.time()
+    jobs = [(name, os.path.join(root, name), policy_for(name, policies), now) for name in names]
+    if not jobs:
+        return []
+    workers = workers or min(len(jobs), scanner.default_workers())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-cache") as pool:
+        usages = list(pool.map(_measure, jobs))
+    usages.sort(key=lambda usage: usage.bytes, reverse=True)
+    return usages
+
+
+def apply(root=CACHE_HOME, policies=None, workers=None):
+    """Politikası olan uygulamaların seçilen dosyalarını toplu silme motoruyla siler.
+    Dönen değer: [(uygulama adı, silme istatistiği)]."""
+    if policies is None:
+        policies = settings.load()["cache_policies"]
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+    jobs = [(name, policy_for(name, policies)) for name in names]
+    jobs = [(name, policy) for name, policy in jobs if policy]
+
+    def apply_one(job):
+        name, policy = job
+        if policy.get("whole"):
+            path = os.path.join(root, name)
+            if not whole_entry_stale(_files_of(path), policy):
+                return name, deleter.DeleteStats()
+            return name, deleter.remove_path(path)
+        paths = pathtable.PathTable()
+        chosen = select(_files_of(os.path.join(root, name), paths), policy)
+        return name, deleter.remove_files(paths.path(node) for _t, _size, node in chosen)
+
+    if not jobs:
+        return []
+    workers = workers or min(len(jobs), 8)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-cache") as pool:
+        results = [result for result in pool.map(apply_one, jobs) if result[1].files or result[1].errors]
+    return results
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+import errno
+import fcntl
+import os
+import stat
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import deleter, exclusions, settings, toolchains
+
+# linux/fs.h: FICLONE = _IOW(0x94, 9, int), FIDEDUPERANGE = _IOWR(0x94, 54, struct file_dedupe_range)
+FICLONE = 0x40049409
+FIDEDUPERANGE = 0xC0189436
+FILE_DEDUPE_RANGE_SAME = 0
+FILE_DEDUPE_RANGE_DIFFERS = 1
+
+# struct file_dedupe_range ve tek bir struct file_dedupe_range_info
+_RANGE_HEADER = struct.Struct("=QQHHI")
+_RANGE_INFO = struct.Struct("=qQQiI")
+
+# Çekirdek tek çağrıda sınırlı miktarı karşılaştırır (btrfs: 16 MiB); dosya parça parça birleştirilir
+DEDUPE_CHUNK = 16 * 1024 * 1024
+# Sabit bağlantı ve klonlama öncesi bayt karşılaştırmasında okunan parça
+COMPARE_CHUNK = 1024 * 1024
+
+# Dosya sistemi işlemi desteklemiyorsa dönen hatalar
+_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV, errno.ENOSYS}
+
+
+class DedupeStats:
+    """Birleştirme sonucu: kaç kopya paylaşılan bloklara ya da sabit bağlantıya çevrildi."""
+
+    def __init__(self):
+        self.groups = 0
+        self.reflinked = 0
+        self.hardlinked = 0
+        # Arada değiştiği ya da dosya sistemi desteklemediği için dokunulmayan kopyalar
+        self.skipped = 0
+        # Kopyaların ayrılmış blokları (paylaşıma geçince boşalan alan)
+        self.bytes = 0
+        self.errors = []
+        self.error_count = 0
+
+    @property
+    def merged(self):
+        return self.reflinked + self.hardlinked
+
+    def add_error(self, name, error):
+        self.error_count += 1
+        if len(self.errors) < deleter.MAX_ERRORS:
+            self.errors.append(f"{name}: {error.strerror or error}")
+
+    def merge(self, other):
+        self.groups += other.groups
+        self.reflinked += other.reflinked
+        self.hardlinked += other.hardlinked
+        self.skipped += other.skipped
+        self.bytes += other.bytes
+        self.error_count += other.error_count
+        self.errors.extend(other.errors[:max(0, deleter.MAX_ERRORS - len(self.errors))])
+
+
+class _Changed(Exception):
+    # Dosya karşılaştırma sırasında ya da sonrasında değişti
+    pass
+
+
+def dedupe_range(src_fd, dest_fd, size):
+    """Çekirdeğe iki dosyanın aynı bloklarını paylaşmasını söyler (FIDEDUPERANGE).
+    Çekirdek her parçayı iki dosyayı da kilitleyerek bayt bayt karşılaştırır; içerik
+    farklıysa hiçbir şey değişmez ve False döner."""
+    offset = 0
+    while offset < size:
+        length = min(DEDUPE_CHUNK, size - offset)
+        buf = bytearray(_RANGE_HEADER.pack(offset, length, 1, 0, 0) + _RANGE_INFO.pack(dest_fd, offset, 0, 0, 0))
+        fcntl.ioctl(src_fd, FIDEDUPERANGE, buf)
+        _fd, _offset, deduped, status, _reserved = _RANGE_INFO.unpack_from(buf, _RANGE_HEADER.size)
+        if status < 0:
+            raise OSError(-status, os.strerror(-status))
+        if status == FILE_DEDUPE_RANGE_DIFFERS or deduped == 0:
+            return False
+        offset += deduped
+    return True
+
+
+def _same_state(st, other):
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns) == (other.st_dev, other.st_ino, other.st_size, other.st_mtime_ns)
+
+
+def _verify_equal(keep_fd, dup_fd, size):
+    """İki dosya paylaşımlı kilit altındayken bayt bayt aynı mı? Karşılaştırma
+    süresince biri değişirse (boyut, mtime) _Changed yükseltilir."""
+    before = (os.fstat(keep_fd), os.fstat(dup_fd))
+    fcntl.flock(keep_fd, fcntl.LOCK_SH)
+    fcntl.flock(dup_fd, fcntl.LOCK_SH)
+    try:
+        offset = 0
+        while offset < size:
+            a = os.pread(keep_fd, COMPARE_CHUNK, offset)
+            b = os.pread(dup_fd, COMPARE_CHUNK, offset)
+            if a != b or not a:
+                return False
+            offset += len(a)
+        after = (os.fstat(keep_fd), os.fstat(dup_fd))
+    finally:
+        fcntl.flock(dup_fd, fcntl.LOCK_UN)
+        fcntl.flock(keep_fd, fcntl.LOCK_UN)
+    if not (_same_state(before[0], after[0]) and _same_state(before[1], after[1])):
+        raise _Changed()
+    return True
+
+
+def _temp_name(path):
+    parent, name = os.path.split(path)
+    return os.path.join(parent, f".{name}.maid-{os.getpid()}-{threading.get_ident()}")
+
+
+def _replace_checked(tmp_path, dup_path, dup_st):
+    # Yol hâlâ doğrulanan dosyayı gösteriyorsa geçici dosya atomik olarak yerine konur
+    try:
+        if not _same_state(os.lstat(dup_path), dup_st):
+            raise _Changed()
+        os.replace(tmp_path, dup_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _clone_over(keep_fd, dup_fd, dup_path, size):
+    """FIDEDUPERANGE desteklenmiyorsa: korunan dosyanın klonu (FICLONE) yanına yazılır,
+    içerik doğrulanır ve kopyanın izinleri ile zamanları aktarılarak üzerine taşınır."""
+    dup_st = os.fstat(dup_fd)
+    tmp_path = _temp_name(dup_path)
+    tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_CLOEXEC, stat.S_IMODE(dup_st.st_mode))
+    try:
+        try:
+            fcntl.ioctl(tmp_fd, FICLONE, keep_fd)
+            if not _verify_equal(keep_fd, dup_fd, size):
+                raise _Changed()
+            os.fchmod(tmp_fd, stat.S_IMODE(dup_st.st_mode))
+            os.utime(tmp_fd, ns=(dup_st.st_atime_ns, dup_st.st_mtime_ns))
+        finally:
+            os.close(tmp_fd)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _replace_checked(tmp_path, dup_path, dup_st)
+
+
+def _can_hardlink(keep_st, dup_st, hardlink):
+    # Sabit bağlantıda iki yol aynı inode'u (izin, sahip, içerik) paylaşır; bu yüzden
+    # varsayılan olarak yalnızca kimsenin yazamadığı salt okunur dosyalar birleştirilir
+    if hardlink == "never" or keep_st.st_dev != dup_st.st_dev:
+        return False
+    if (keep_st.st_uid, keep_st.st_gid, keep_st.st_mode) != (dup_st.st_uid, dup_st.st_gid, dup_st.st_mode):
+        return False
+    if hardlink == "readonly" and keep_st.st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+        return False
+    return True
+
+
+def _hardlink_over(keep_path, keep_fd, dup_fd, dup_path, size):
+    dup_st = os.fstat(dup_fd)
+    if not _verify_equal(keep_fd, dup_fd, size):
+        raise _Changed()
+    tmp_path = _temp_name(dup_path)
+    os.link(keep_path, tmp_path, follow_symlinks=False)
+    _replace_checked(tmp_path, dup_path, dup_st)
+
+
+def _open_dest(path):
+    # FIDEDUPERANGE hedefin yazılabilir açılmasını ister; salt okunur dosyaların
+    # sahibi ise dosyayı okuma kipinde de birleştirebilir
+    try:
+        return os.open(path, os.O_RDWR | os.O_NOFOLLOW | os.O_CLOEXEC)
+    except PermissionError:
+        return os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+
+
+def merge_copy(keep_path, dup_path, hardlink="readonly", stats=None):
+    """Tek bir kopyayı korunan dosyayla birleştirir. Sıra: FIDEDUPERANGE (çekirdek
+    doğrular), FICLONE ile klonlayıp değiştirme, son olarak sabit bağlantı."""
+    stats = stats if stats is not None else DedupeStats()
+    try:
+        keep_fd = os.open(keep_path, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+    except OSError as e:
+        stats.add_error(keep_path, e)
+        return stats
+    try:
+        dup_fd = _open_dest(dup_path)
+    except OSError as e:
+        os.close(keep_fd)
+        stats.add_error(dup_path, e)
+        return stats
+    try:
+        keep_st = os.fstat(keep_fd)
+        dup_st = os.fstat(dup_fd)
+        if (not stat.S_ISREG(keep_st.st_mode) or not stat.S_ISREG(dup_st.st_mode)
+                or keep_st.st_size != dup_st.st_size or (keep_st.st_dev, keep_st.st_ino) == (dup_st.st_dev, dup_st.st_ino)):
+            stats.skipped += 1
+            return stats
+        size = keep_st.st_size
+        freed = dup_st.st_blocks * 512 if dup_st.st_nlink <= 1 else 0
+        try:
+            if dedupe_range(keep_fd, dup_fd, size):
+                stats.reflinked += 1
+                stats.bytes += freed
+            else:
+                stats.skipped += 1
+            return stats
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+        try:
+            _clone_over(keep_fd, dup_fd, dup_path, size)
+            stats.reflinked += 1
+            stats.bytes += freed
+            return stats
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+        if _can_hardlink(keep_st, dup_st, hardlink):
+            _hardlink_over(keep_path, keep_fd, dup_fd, dup_path, size)
+            stats.hardlinked += 1
+            stats.bytes += freed
+        else:
+            stats.skipped += 1
+    except _Changed:
+        stats.skipped += 1
+    except OSError as e:
+        stats.add_error(dup_path, e)
+    finally:
+        os.close(dup_fd)
+        os.close(keep_fd)
+    return stats
+
+
+def protected_roots(config=None):
+    """Birleştirmede dokunulmayan ağaçlar: dedupe_exclude_paths ayarı ve geliştirici araç
+    önbellekleri. Bu ağaçlardaki dosyalar (ör. salt okunur ~/go/pkg/mod) sabit bağlantıya
+    çevrilirse araçların izin ya da içerik değişiklikleri diğer kopyaya da yansır."""
+    config = config or settings.load()
+    roots = [os.path.expanduser(path) for path in config["dedupe_exclude_paths"]]
+    roots.extend(tool.root() for tool in toolchains.TOOLS)
+    return roots
+
+
+def split_protected(groups, roots):
+    """Korunan ağaçlardaki yolları gruplardan çıkarır. Dönen değer: (en az iki yolu kalan
+    gruplar, çıkarılan yol sayısı)."""
+    trie = exclusions.PrefixTrie(roots)
+    kept_groups = []
+    removed = 0
+    for group in groups:
+        paths = [path for path in group.paths if not trie.covers(path)]
+        removed += len(group.paths) - len(paths)
+        if len(paths) > 1:
+            kept_groups.append(group._replace(paths=paths))
+    return kept_groups, removed
+
+
+def merge_group(group, hardlink="readonly"):
+    """Gruptaki ilk yol korunur, diğer kopyalar onunla birleştirilir."""
+    stats = DedupeStats()
+    stats.groups = 1
+    keep_path = group.paths[0]
+    for dup_path in group.paths[1:]:
+        merge_copy(keep_path, dup_path, hardlink, stats)
+    return stats
+
+
+def merge_groups(groups, hardlink="readonly", workers=None):
+    """Doğrulanmış kopya gruplarını (duplicates.DuplicateGroup) iş parçacığı havuzunda
+    birleştirir; hiçbir dosyanın içeriği silinmez."""
+    total = DedupeStats()
+    if not groups:
+        return total
+    workers = workers or min(len(groups), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-dedupe") as pool:
+        for stats in pool.map(lambda group: merge_group(group, hardlink), groups):
+            total.merge(stats)
+    return total
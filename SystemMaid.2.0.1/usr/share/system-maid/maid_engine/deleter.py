@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+import errno
+import os
+import stat
+
+# Dizinler her zaman üst dizinin tanıtıcısına göre (dir_fd) açılır; yol bir daha
+# çözümlenmez ve sembolik bağlantılar asla izlenmez.
+DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC
+
+# Hata listesinin sınırsız büyümemesi için tutulan en fazla hata sayısı
+MAX_ERRORS = 50
+
+
+class DeleteStats:
+    """Silme sırasında boşalan alan ve inode sayıları."""
+
+    def __init__(self):
+        self.files = 0
+        self.dirs = 0
+        # Son bağlantısı silinen dosyaların ayrılmış blokları (gerçekten boşalan alan)
+        self.bytes = 0
+        # Başka bir dosya sistemine geçtiği için girilmeyen dizinler
+        self.skipped_mounts = 0
+        self.errors = []
+        self.error_count = 0
+
+    @property
+    def inodes(self):
+        return self.files + self.dirs
+
+    def add_file(self, st):
+        self.files += 1
+        if st.st_nlink <= 1:
+            self.bytes += st.st_blocks * 512
+
+    def add_error(self, name, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{name}: {error.strerror or error}")
+
+    def merge(self, other):
+        self.files += other.files
+        self.dirs += other.dirs
+        self.bytes += other.bytes
+        self.skipped_mounts += other.skipped_mounts
+        self.error_count += other.error_count
+        self.errors.extend(other.errors[:max(0, MAX_ERRORS - len(self.errors))])
+
+
+def _open_child_dir(name, parent_fd):
+    """Dizini açar; (tanıtıcı, geri yüklenecek izinler ya da None) döndürür."""
+    fd = os.open(name, DIR_FLAGS, dir_fd=parent_fd)
+    # rm -rf gibi: yazma izni olmayan dizinlerin (ör. Go modül önbelleği) içi de boşaltılabilsin
+    mode = os.fstat(fd).st_mode
+    if mode & (stat.S_IWUSR | stat.S_IXUSR) != (stat.S_IWUSR | stat.S_IXUSR):
+        try:
+            os.fchmod(fd, stat.S_IMODE(mode) | stat.S_IRWXU)
+            return fd, stat.S_IMODE(mode)
+        except OSError:
+            pass
+    return fd, None
+
+
+def _restore_mode(fd, mode, name, stats):
+    # Korunan dizinin izinleri boşaltıldıktan sonra eski haline getirilir
+    try:
+        os.fchmod(fd, mode)
+    except OSError as e:
+        stats.add_error(name, e)
+
+
+def _clear_fd(top_fd, keep_dirs, stats):
+    # Özyineleme yerine açık bir yığın kullanılır; çok derin ağaçlarda da güvenlidir
+    dev = os.fstat(top_fd).st_dev
+    stack = [(top_fd, os.scandir(top_fd), None, None)]
+    try:
+        while stack:
+            dir_fd, it, name, mode = stack[-1]
+            entry = next(it, None)
+            if entry is None:
+                it.close()
+                stack.pop()
+                if name is not None:
+                    if keep_dirs and mode is not None:
+                        _restore_mode(dir_fd, mode, name, stats)
+                    os.close(dir_fd)
+                    if not keep_dirs:
+                        try:
+                            os.rmdir(name, dir_fd=stack[-1][0])
+                            stats.dirs += 1
+                        except OSError as e:
+                            stats.add_error(name, e)
+                continue
+
+            try:
+                st = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(st.st_mode):
+                    if st.st_dev != dev:
+                        # rm --one-file-system gibi: bağlama noktalarının içine girilmez
+                        stats.skipped_mounts += 1
+                        continue
+                    child_fd, child_mode = _open_child_dir(entry.name, dir_fd)
+                    try:
+                        child_it = os.scandir(child_fd)
+                    except OSError:
+                        if keep_dirs and child_mode is not None:
+                            _restore_mode(child_fd, child_mode, entry.name, stats)
+                        os.close(child_fd)
+                        raise
+                    stack.append((child_fd, child_it, entry.name, child_mode))
+                else:
+                    os.unlink(entry.name, dir_fd=dir_fd)
+                    stats.add_file(st)
+            except OSError as e:
+                stats.add_error(entry.name, e)
+    finally:
+        # Hata durumunda açık kalan alt dizin tanıtıcıları kapatılır
+        for dir_fd, it, name, mode in stack:
+            it.close()
+            if name is not None:
+                if keep_dirs and mode is not None:
+                    _restore_mode(dir_fd, mode, name, stats)
+                os.close(dir_fd)
+
+
+def clear_directory(path, keep_dirs=False, stats=None):
+    """Dizinin içeriğini (dizinin kendisini değil) fork/exec olmadan siler.
+    keep_dirs=True ise yalnızca dosyalar silinir, dizin yapısı korunur."""
+    stats = stats if stats is not None else DeleteStats()
+    try:
+        fd = os.open(path, DIR_FLAGS)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            stats.add_error(path, e)
+        return stats
+    try:
+        _clear_fd(fd, keep_dirs, stats)
+    finally:
+        os.close(fd)
+    return stats
+
+
+def remove_path(path, stats=None):
+    """Tek bir dosyayı, bağlantıyı ya da dizini (içeriğiyle birlikte) siler."""
+    stats = stats if stats is not None else DeleteStats()
+    parent, name = os.path.split(os.path.normpath(path))
+    try:
+        parent_fd = os.open(parent or ".", DIR_FLAGS)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            stats.add_error(path, e)
+        return stats
+    try:
+        st = os.stat(name, dir_fd=parent_fd, follow_symlinks=False)
+        if stat.S_ISDIR(st.st_mode):
+            fd, _mode = _open_child_dir(name, parent_fd)
+            try:
+                _clear_fd(fd, False, stats)
+            finally:
+                os.close(fd)
+            os.rmdir(name, dir_fd=parent_fd)
+            stats.dirs += 1
+        else:
+            os.unlink(name, dir_fd=parent_fd)
+            stats.add_file(st)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            stats.add_error(path, e)
+    finally:
+        os.close(parent_fd)
+    return stats
+
+
+def remove_files(paths, stats=None):
+    """Dosya ve bağlantıları toplu siler: aynı dizindeki girdiler için üst dizin
+    bir kez açılır ve adlar o tanıtıcıya göre silinir. Dizinlere dokunulmaz."""
+    stats = stats if stats is not None else DeleteStats()
+    by_parent = {}
+    for path in paths:
+        parent, name = os.path.split(os.path.normpath(path))
+        by_parent.setdefault(parent, []).append(name)
+    for parent, names in by_parent.items():
+        try:
+            parent_fd = os.open(parent or ".", DIR_FLAGS)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                stats.add_error(parent, e)
+            continue
+        try:
+            for name in names:
+                try:
+                    st = os.stat(name, dir_fd=parent_fd, follow_symlinks=False)
+                    if stat.S_ISDIR(st.st_mode):
+                        continue
+                    os.unlink(name, dir_fd=parent_fd)
+                    stats.add_file(st)
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        stats.add_error(os.path.join(parent, name), e)
+        finally:
+            os.close(parent_fd)
+    return stats
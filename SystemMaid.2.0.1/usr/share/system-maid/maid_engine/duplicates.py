@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+import array
+import hashlib
+import mmap
+import multiprocessing
+import os
+import sqlite3
+import stat
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from maid_engine import exclusions, pathtable, scanner, scanindex
+
+HASH_CACHE_FILE = os.path.join(scanindex.CACHE_DIR, "hash-cache.sqlite")
+SCHEMA_VERSION = 2
+
+# Ön eleme için dosyanın başından ve sonundan okunan miktar
+PARTIAL_BYTES = 64 * 1024
+# Tam özet mmap üzerinden bu boyutta parçalarla hesaplanır
+HASH_CHUNK = 4 * 1024 * 1024
+
+# Aynı içerikli dosyalar: boyut, tam özet ve yollar (aynı inode'a bağlı sabit bağlantılar ayrı sayılmaz)
+DuplicateGroup = namedtuple("DuplicateGroup", ["size", "digest", "paths"])
+
+
+class _FileRef:
+    # Yol nesnede tutulmaz; gerektiğinde taramanın PathTable'ından kurulur
+    __slots__ = ("paths", "node", "dev", "ino", "size", "mtime_ns")
+
+    def __init__(self, paths, node, dev, ino, size, mtime_ns):
+        self.paths = paths
+        self.node = node
+        self.dev = dev
+        self.ino = ino
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def path(self):
+        return self.paths.path(self.node)
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=20)
+
+
+def partial_hash(path, size):
+    """Dosyanın ilk ve son 64 KiB'ının özeti; küçük dosyalarda tamamının özetidir."""
+    h = _digest()
+    with open(path, "rb") as f:
+        h.update(f.read(PARTIAL_BYTES))
+        if size > 2 * PARTIAL_BYTES:
+            f.seek(size - PARTIAL_BYTES)
+            h.update(f.read(PARTIAL_BYTES))
+        elif size > PARTIAL_BYTES:
+            h.update(f.read())
+    return h.digest()
+
+
+def full_hash(path):
+    h = _digest()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return h.digest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            # Çekirdeğe sıralı okunacağı bildirilir; önden okuma penceresi büyür
+            m.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(m)
+            try:
+                for offset in range(0, size, HASH_CHUNK):
+                    h.update(view[offset:offset + HASH_CHUNK])
+            finally:
+                view.release()
+    return h.digest()
+
+
+def _full_hash_job(path):
+    # Süreç havuzunda çalışır; hatalar ana sürece değer olarak döndürülür
+    try:
+        return path, full_hash(path)
+    except (OSError, ValueError):
+        return path, None
+
+
+def _partial_hash_job(ref):
+    try:
+        return ref, partial_hash(ref.path, ref.size)
+    except OSError:
+        return ref, None
+
+
+class HashCache:
+    """Dosya özetlerini (aygıt, inode, boyut, mtime_ns) anahtarıyla saklar;
+    değişmemiş dosyalar sonraki taramalarda yeniden okunmaz. Her kaydın son görüldüğü
+    yol da tutulur; bir klasörün taraması yalnızca o klasörün altındaki kayıtları budar."""
+
+    def __init__(self, path=HASH_CACHE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS hashes")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "path TEXT NOT NULL, partial BLOB, full BLOB, PRIMARY KEY (dev, ino))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS hashes_path ON hashes (path)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get(self, ref, column):
+        row = self.conn.execute(
+            f"SELECT {column} FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+            (ref.dev, ref.ino, ref.size, ref.mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def put(self, ref, column, digest):
+        # Dosya değiştiyse (boyut ya da mtime farklı) eski özetlerin ikisi de geçersizdir
+        self.conn.execute(
+            "INSERT INTO hashes (dev, ino, size, mtime_ns, path) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (dev, ino) DO UPDATE SET partial = CASE WHEN size = excluded.size AND "
+            "mtime_ns = excluded.mtime_ns THEN partial END, full = CASE WHEN size = excluded.size AND "
+            "mtime_ns = excluded.mtime_ns THEN full END, size = excluded.size, mtime_ns = excluded.mtime_ns, "
+            "path = excluded.path",
+            (ref.dev, ref.ino, ref.size, ref.mtime_ns, ref.path))
+        self.conn.execute(f"UPDATE hashes SET {column} = ? WHERE dev = ? AND ino = ?", (digest, ref.dev, ref.ino))
+
+    def retain(self, root, refs):
+        # root altında artık aday olmayan (silinmiş ya da boyutu tekilleşmiş) dosyaların
+        # kayıtları atılır; başka klasörlerin taramalarından kalan kayıtlara dokunulmaz
+        keep = {(ref.dev, ref.ino) for ref in refs}
+        prefix = root.rstrip("/") + "/"
+        # prefix ile başlayan yollar [prefix, son "/" yerine "0" konmuş prefix) aralığına düşer
+        # ("0", "/" karakterinden hemen sonra gelir); aralık path dizininden okunur
+        rows = self.conn.execute("SELECT dev, ino FROM hashes WHERE path >= ? AND path < ?",
+                                 (prefix, prefix[:-1] + "0"))
+        stale = [row for row in rows if tuple(row) not in keep]
+        self.conn.executemany("DELETE FROM hashes WHERE dev = ? AND ino = ?", stale)
+
+
+def _collect(root, min_size, exclude):
+    # Boyuta göre kovalar; aynı inode'a bağlı yollar tek dosya sayılır. Taranan her dosya
+    # sütunlarda (dosya başına ~48 bayt, yol dahil) tutulur; nesne yalnızca boyutu başka
+    # bir dosyayla çakışanlar için oluşturulur
+    paths = pathtable.PathTable()
+    nodes = array.array("i")
+    devs = array.array("Q")
+    inos = array.array("Q")
+    sizes = array.array("q")
+    mtimes = array.array("q")
+    seen_links = set()
+    for path, entries in scanner.walk(root, exclude=exclude):
+        directory = paths.enter(path)
+        for entry in entries:
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if st.st_size < min_size or not stat.S_ISREG(st.st_mode):
+                continue
+            # Yalnızca birden fazla bağlantısı olan dosyalar akılda tutulur
+            if st.st_nlink > 1:
+                if (st.st_dev, st.st_ino) in seen_links:
+                    continue
+                seen_links.add((st.st_dev, st.st_ino))
+            nodes.append(paths.add(directory, entry.name))
+            devs.append(st.st_dev)
+            inos.append(st.st_ino)
+            sizes.append(st.st_size)
+            mtimes.append(st.st_mtime_ns)
+    paths.finish()
+    counts = Counter(sizes)
+    by_size = {}
+    for i, size in enumerate(sizes):
+        if counts[size] > 1:
+            by_size.setdefault(size, []).append(_FileRef(paths, nodes[i], devs[i], inos[i], size, mtimes[i]))
+    return list(by_size.values())
+
+
+def _regroup(refs_with_digest):
+    groups = {}
+    for ref, digest in refs_with_digest:
+        if digest is not None:
+            groups.setdefault((ref.size, digest), []).append(ref)
+    return groups
+
+
+def _full_hashes(paths, workers):
+    # Qt iş parçacıkları varken fork güvenli değildir; işçiler forkserver ile başlatılır.
+    # Süreç havuzu kurulamazsa kalan dosyalar iş parçacıklarında özetlenir
+    # (hashlib büyük tamponlarda GIL'i bırakır).
+    done = {}
+    try:
+        context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for path, digest in pool.map(_full_hash_job, paths, chunksize=8):
+                done[path] = digest
+    except (OSError, ValueError, BrokenProcessPool):
+        remaining = [path for path in paths if path not in done]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-hash") as pool:
+            for path, digest in pool.map(_full_hash_job, remaining):
+                done[path] = digest
+    return done
+
+
+def find_duplicates(root=None, min_size=1, workers=None, exclude=None, progress=None, stats=None):
+    """Üç aşamalı arama: boyut kovaları, ilk/son 64 KiB özeti, ardından yalnızca
+    kalanların tam özeti. Tam özetler çekirdek sayısı kadar süreçte hesaplanır.
+    Gruplar boşa harcanan alana göre büyükten küçüğe sıralı döner."""
+    root = root or os.path.expanduser("~")
+    exclude = exclude if exclude is not None else exclusions.default()
+    workers = workers or os.cpu_count() or 1
+    stats = stats if stats is not None else {}
+    stats.update(files=0, partial_hashed=0, full_hashed=0, cached=0)
+    report = progress or (lambda text: None)
+
+    report("Grouping files by size...")
+    buckets = _collect(root, max(1, min_size), exclude)
+    candidates = [ref for refs in buckets for ref in refs]
+    stats["files"] = len(candidates)
+
+    cache = HashCache()
+    try:
+        # 1. aşama: ilk/son 64 KiB (önbellekte yoksa iş parçacıklarında okunur)
+        results = []
+        missing = []
+        for ref in candidates:
+            digest = cache.get(ref, "partial")
+            if digest is None:
+                missing.append(ref)
+            else:
+                stats["cached"] += 1
+                results.append((ref, digest))
+        report(f"Prefiltering {len(missing):,} files ({len(candidates) - len(missing):,} cached)...")
+        with ThreadPoolExecutor(max_workers=scanner.default_workers(), thread_name_prefix="maid-hash") as pool:
+            for ref, digest in pool.map(_partial_hash_job, missing):
+                if digest is not None:
+                    cache.put(ref, "partial", digest)
+                    stats["partial_hashed"] += 1
+                results.append((ref, digest))
+        cache.conn.commit()
+
+        survivors = [ref for refs in _regroup(results).values() if len(refs) > 1 for ref in refs]
+
+        # 2. aşama: kalanların tam özeti (süreç havuzunda)
+        results = []
+        missing = []
+        for ref in survivors:
+            digest = cache.get(ref, "full")
+            if digest is None:
+                missing.append(ref)
+            else:
+                stats["cached"] += 1
+                results.append((ref, digest))
+        report(f"Hashing {len(missing):,} files...")
+        if missing:
+            by_path = {ref.path: ref for ref in missing}
+            for path, digest in _full_hashes(list(by_path), workers).items():
+                ref = by_path[path]
+                if digest is not None:
+                    cache.put(ref, "full", digest)
+                    stats["full_hashed"] += 1
+                results.append((ref, digest))
+        cache.retain(os.path.abspath(root), candidates)
+        cache.conn.commit()
+    finally:
+        cache.close()
+
+    groups = [
+        DuplicateGroup(size, digest, sorted(ref.path for ref in refs))
+        for (size, digest), refs in _regroup(results).items() if len(refs) > 1
+    ]
+    groups.sort(key=lambda group: group.size * (len(group.paths) - 1), reverse=True)
+    return groups
+
+
+def wasted_bytes(groups):
+    return sum(group.size * (len(group.paths) - 1) for group in groups)
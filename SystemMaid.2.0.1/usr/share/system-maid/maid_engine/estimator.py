@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+import stat
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from maid_engine import browsers, caches, exclusions, scanner, scanindex, settings, toolchains, trash
+
+HOME = os.path.expanduser("~")
+
+# Her kategori için silinecek dosya sayısı ve diskte boşalacak alan (bayt);
+# details, varsa ilk iki alanı (ad, bayt) olan alt kırılımdır (ör. tarayıcı profilleri).
+# error doluysa kategori hesaplanamamıştır (ör. tarama indeksi kilitli)
+Estimate = namedtuple("Estimate", ["category", "files", "bytes", "details", "error"], defaults=[(), None])
+
+APT_CACHE_DIR = "/var/cache/apt"
+JOURNAL_DIRS = ["/var/log/journal", "/run/log/journal"]
+
+# create_opt_page içindeki journalctl --vacuum-time=3d --vacuum-size=50M ile aynı sınırlar
+JOURNAL_KEEP_SECONDS = 3 * 24 * 3600
+JOURNAL_KEEP_BYTES = 50 * 1024 * 1024
+
+
+class _Tally:
+    # Sabit bağlantılar (hard link) inode başına bir kez sayılır
+    __slots__ = ("files", "bytes", "details", "_seen")
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.details = ()
+        self._seen = set()
+
+    def add(self, st):
+        if st.st_nlink > 1:
+            key = (st.st_dev, st.st_ino)
+            if key in self._seen:
+                return
+            self._seen.add(key)
+        self.files += 1
+        # Boşalacak gerçek alan, dosya boyutu değil ayrılmış bloklardır
+        self.bytes += st.st_blocks * 512
+
+    def add_path(self, path):
+        try:
+            self.add(os.lstat(path))
+        except OSError:
+            pass
+
+    def add_tree(self, top, workers=None):
+        if not os.path.isdir(top):
+            self.add_path(top)
+            return
+        for _path, entries in scanner.walk(top, workers=workers):
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        continue
+                    self.add(entry.stat(follow_symlinks=False))
+                except OSError:
+                    pass
+
+
+def _estimate_trash(tracker=None):
+    # Yaş/kota sınırları ve diğer disklerdeki çöp kutuları dahil, gerçekten silinecek öğeler
+    tally = _Tally()
+    items = trash.selected_items(home_items=tracker.trash_items() if tracker is not None else None)
+    tally.files = len(items)
+    tally.bytes = sum(item.size for item in items)
+    return tally
+
+
+def _estimate_thumbnails(tracker=None):
+    tally = _Tally()
+    live = tracker.area_stats("thumbnails") if tracker is not None else None
+    if live is None:
+        tally.add_tree(os.path.join(HOME, ".cache/thumbnails"))
+    else:
+        for st in live:
+            tally.add(st)
+    return tally
+
+
+def _estimate_recent(tracker=None):
+    tally = _Tally()
+    tally.add_path(os.path.join(HOME, ".local/share/recently-used.xbel"))
+    tally.add_tree(os.path.join(HOME, ".local/share/RecentDocuments"))
+    tally.add_tree(os.path.join(HOME, ".local/share/zeitgeist"))
+    return tally
+
+
+def _estimate_thumbs_db(tracker=None):
+    tally = _Tally()
+    if tracker is not None and tracker.can_serve(["thumbs_db"]):
+        candidates = tracker.collect(["thumbs_db"])
+    else:
+        # Sıcak indekste bu tarama yalnızca dizinlerin stat bilgisini okur
+        candidates = scanindex.indexed_scan(HOME, scanner.get_rules(["thumbs_db"]), exclude=exclusions.default())
+    for candidate in candidates:
+        tally.add_path(candidate.path)
+    return tally
+
+
+def _estimate_browsers(tracker=None):
+    # Bütçe kipinde yalnızca profil başına bütçeyi aşan kısım, "all" kipinde
+    # tarayıcısı kapalı profillerin önbelleklerinin tamamı silinir
+    config = settings.load()
+    budget = config["browser_cache_budget_mb"] * 1024 * 1024
+    tally = _Tally()
+    details = []
+    for profile, caches in browsers.measure(browsers.discover()).items():
+        size = sum(caches.values())
+        if not size:
+            continue
+        details.append((f"{profile.browser} ({profile.name})", size))
+        if config["browser_cache_mode"] == "all":
+            if not browsers.is_running(profile):
+                tally.bytes += size
+        else:
+            tally.bytes += max(0, size - budget)
+    tally.files = len(details)
+    tally.details = sorted(details, key=lambda item: item[1], reverse=True)
+    return tally
+
+
+def _estimate_user_caches(tracker=None):
+    # cache_policies ayarına göre ~/.cache altında silinecek dosyalar; details uygulama başına kullanımdır
+    tally = _Tally()
+    usages = caches.account()
+    tally.files = sum(usage.reclaimable_files for usage in usages)
+    tally.bytes = sum(usage.reclaimable for usage in usages)
+    tally.details = usages
+    return tally
+
+
+def _estimate_toolchains(tracker=None):
+    # Kullanılmayan ve kilit dosyalarında geçmeyen paketler; details araç başına kullanımdır
+    tally = _Tally()
+    usages = toolchains.account()
+    tally.files = sum(usage.reclaimable_units for usage in usages)
+    tally.bytes = sum(usage.reclaimable for usage in usages)
+    tally.details = usages
+    return tally
+
+
+def _estimate_apt_cache(tracker=None):
+    # apt-get clean: archives/*.deb, archives/partial/* ve *.bin önbellekleri
+    tally = _Tally()
+    for pattern in ("archives/*.deb", "archives/partial/*", "*.bin"):
+        for path in glob.glob(os.path.join(APT_CACHE_DIR, pattern)):
+            tally.add_path(path)
+    return tally
+
+
+def _estimate_journal(tracker=None):
+    # journalctl vacuum yalnızca arşivlenmiş (adında '@' olan) dosyaları siler
+    tally = _Tally()
+    total = 0
+    archived = []
+    for journal_dir in JOURNAL_DIRS:
+        for path in glob.glob(os.path.join(journal_dir, "*", "*.journal*")):
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            total += st.st_blocks * 512
+            if "@" in os.path.basename(path):
+                archived.append((st.st_mtime, path, st))
+
+    archived.sort()
+    cutoff = time.time() - JOURNAL_KEEP_SECONDS
+    for mtime, _path, st in archived:
+        if mtime < cutoff or total > JOURNAL_KEEP_BYTES:
+            tally.add(st)
+            total -= st.st_blocks * 512
+    return tally
+
+
+CATEGORIES = {
+    "trash": _estimate_trash,
+    "thumbnails": _estimate_thumbnails,
+    "recent": _estimate_recent,
+    "thumbs_db": _estimate_thumbs_db,
+    "browsers": _estimate_browsers,
+    "user_caches": _estimate_user_caches,
+    "toolchains": _estimate_toolchains,
+    "apt_cache": _estimate_apt_cache,
+    "journal": _estimate_journal,
+}
+
+
+def estimate(categories=None, tracker=None):
+    """Hiçbir şey silmeden kategorilerin boşaltacağı alanı eşzamanlı hesaplar.
+    Sonuçlar hesaplandıkça (bitiş sırasıyla) Estimate olarak üretilir."""
+    if categories is None:
+        categories = list(CATEGORIES)
+    with ThreadPoolExecutor(max_workers=len(categories), thread_name_prefix="maid-estimate") as pool:
+        futures = {pool.submit(CATEGORIES[name], tracker): name for name in categories}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                tally = future.result()
+            except Exception as e:
+                # Bir kategorinin hatası (bozuk ayar, okunamayan kilit dosyası...) diğerlerinin
+                # sonuçlarını engellemez
+                yield Estimate(name, 0, 0, error=str(e) or type(e).__name__)
+                continue
+            yield Estimate(name, tally.files, tally.bytes, tally.details)
+
+
+def format_size(num_bytes):
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import fnmatch
+import os
+
+from maid_engine import mounts, settings
+
+
+class PrefixTrie:
+    """Yol bileşenleri üzerine kurulu önek ağacı. Bir yolun, eklenmiş
+    öneklerden birinin altında olup olmadığını bileşen sayısı kadar adımda bulur."""
+
+    _END = object()
+
+    def __init__(self, paths=()):
+        self._root = {}
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        node = self._root
+        for part in _split(path):
+            node = node.setdefault(part, {})
+        node[self._END] = True
+
+    def covers(self, path):
+        node = self._root
+        if self._END in node:
+            return True
+        for part in _split(path):
+            node = node.get(part)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+    def __bool__(self):
+        return bool(self._root)
+
+
+def _split(path):
+    return [part for part in os.path.normpath(path).split(os.sep) if part]
+
+
+class ExclusionSet:
+    """Taramalarda hiç okunmadan atlanacak alt ağaçlar: mutlak yol önekleri
+    (trie) ve dizin adı kuralları (tam ad ya da joker karakterli kalıp)."""
+
+    def __init__(self, prefixes=(), names=(), mounts=None):
+        self.trie = PrefixTrie(os.path.expanduser(p) for p in prefixes)
+        self.names = set()
+        self.patterns = []
+        for name in names:
+            if any(ch in name for ch in "*?["):
+                self.patterns.append(name)
+            else:
+                self.names.add(name)
+        # Ağ/FUSE bağlama noktalarını ayıklayan mounts.MountTable (isteğe bağlı)
+        self.mounts = mounts
+        # Budanan (hiç okunmayan) dizin ve bağlama noktası sayıları
+        self.skipped = 0
+        self.skipped_mounts = 0
+
+    def prunes(self, path):
+        if self.mounts is not None and self.mounts.skips(path):
+            self.skipped_mounts += 1
+            return True
+        name = os.path.basename(path)
+        if name in self.names or self.trie.covers(path) or any(fnmatch.fnmatchcase(name, p) for p in self.patterns):
+            self.skipped += 1
+            return True
+        return False
+
+
+def default():
+    """settings.json içindeki scan_exclude_* ve scan_allowed_mounts değerlerinden kurulur.
+    Bağlama tablosu her çağrıda (yani her taramada) bir kez okunur."""
+    config = settings.load()
+    mount_table = mounts.MountTable(allowed=config["scan_allowed_mounts"])
+    return ExclusionSet(config["scan_exclude_paths"], config["scan_exclude_names"], mount_table)
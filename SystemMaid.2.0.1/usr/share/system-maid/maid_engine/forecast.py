@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from maid_engine import mounts, scanindex
+
+HISTORY_FILE = os.path.join(scanindex.CACHE_DIR, "free-space.sqlite")
+
+# Bundan daha sık alınan örnekler yazılmaz (açılış, temizlik sonu ve zamanlayıcı çakışabilir)
+MIN_SAMPLE_INTERVAL = 60
+# Bu kadar günden eski örnekler silinir
+KEEP_DAYS = 30
+# Eğilim yalnızca son bu kadar günün örneklerinden hesaplanır
+WINDOW_DAYS = 7
+# Eğilim için gereken en az örnek sayısı ve zaman aralığı
+MIN_SAMPLES = 5
+MIN_SPAN = 3600
+# Boş alan bir anda toplamın bu payından fazla artarsa (temizlik, silme) eğilim o andan
+# yeniden başlar; öncesindeki dolma hızı artık geçerli değildir
+RESET_FRACTION = 0.01
+# Bundan uzak tahminler gösterilmez
+MAX_DAYS = 365
+
+# Bellekte duran dosya sistemleri; dolmaları diskle ilgili değildir
+MEMORY_FSTYPES = {"tmpfs", "ramfs"}
+
+# Bir bağlama noktasının dolma tahmini. rate günlük değişimdir (negatifse disk doluyor);
+# days_left disk bu hızla dolmaya devam ederse kalan gün sayısı (dolmuyorsa None)
+Forecast = namedtuple("Forecast", ["mountpoint", "total", "avail", "rate", "days_left", "samples"])
+
+
+def local_mounts(table=None):
+    """Örneklenecek yazılabilir yerel dosya sistemleri: aygıt başına bir bağlama noktası.
+    Aynı aygıtın bind ve alt birim bağlamaları aynı boş alanı gösterir."""
+    table = table or mounts.MountTable()
+    chosen = set()
+    for group in table.local_groups().values():
+        group = [mount for mount in group if mount.fstype not in MEMORY_FSTYPES]
+        if group:
+            chosen.add(min(group, key=lambda mount: len(mount.mountpoint)).mountpoint)
+    return sorted(chosen)
+
+
+def read_free_space(mountpoint):
+    """(toplam, kullanılabilir) bayt; salt okunur ya da boyutsuz dosya sistemlerinde None."""
+    try:
+        st = os.statvfs(mountpoint)
+    except OSError:
+        return None
+    if st.f_flag & os.ST_RDONLY or not st.f_blocks:
+        return None
+    return st.f_blocks * st.f_frsize, st.f_bavail * st.f_frsize
+
+
+def fit(samples, now=None):
+    """(zaman, toplam, kullanılabilir) örneklerine en küçük kareler doğrusu uydurur ve
+    Forecast alanlarından (rate, days_left) döndürür. Son büyük boş alan artışından
+    önceki örnekler kullanılmaz."""
+    start = 0
+    for i in range(1, len(samples)):
+        _t, total, avail = samples[i]
+        _pt, prev_total, prev_avail = samples[i - 1]
+        if total != prev_total or avail - prev_avail > total * RESET_FRACTION:
+            start = i
+    samples = samples[start:]
+    if len(samples) < MIN_SAMPLES or samples[-1][0] - samples[0][0] < MIN_SPAN:
+        return None, None
+    origin = samples[0][0]
+    xs = [(t - origin) / 86400 for t, _total, _avail in samples]
+    ys = [avail for _t, _total, avail in samples]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if not var:
+        return None, None
+    rate = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+    if rate >= 0:
+        return rate, None
+    # Doğrunun sıfırı kestiği gün, bugünden itibaren
+    now_x = ((now or time.time()) - origin) / 86400
+    days_left = max(0.0, mean_x + (0 - mean_y) / rate - now_x)
+    return rate, (days_left if days_left <= MAX_DAYS else None)
+
+
+class History:
+    """Bağlama noktası başına boş alan örneklerini SQLite'ta tutar. Bir örnek
+    /proc/self/mountinfo okuması ve her dosya sistemi için tek bir statvfs çağrısıdır;
+    diske dokunmadığı için birkaç dakikada bir alınabilir."""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            "mountpoint TEXT NOT NULL, time REAL NOT NULL, total INTEGER NOT NULL, avail INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS samples_mount_time ON samples (mountpoint, time)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, mountpoints=None, now=None):
+        """Her bağlama noktası için bir örnek yazar; yazılan örnek sayısını döndürür."""
+        now = now or time.time()
+        last = self.conn.execute("SELECT MAX(time) FROM samples").fetchone()[0]
+        if last is not None and 0 <= now - last < MIN_SAMPLE_INTERVAL:
+            return 0
+        rows = []
+        for mountpoint in (local_mounts() if mountpoints is None else mountpoints):
+            usage = read_free_space(mountpoint)
+            if usage is not None:
+                rows.append((mountpoint, now, usage[0], usage[1]))
+        self.conn.executemany("INSERT INTO samples (mountpoint, time, total, avail) VALUES (?, ?, ?, ?)", rows)
+        self.conn.execute("DELETE FROM samples WHERE time < ?", (now - KEEP_DAYS * 86400,))
+        self.conn.commit()
+        return len(rows)
+
+    def forecasts(self, now=None, window_days=WINDOW_DAYS):
+        """Son örneği olan her bağlama noktası için Forecast; en yakın dolacak olan başta."""
+        now = now or time.time()
+        by_mount = {}
+        for mountpoint, t, total, avail in self.conn.execute(
+                "SELECT mountpoint, time, total, avail FROM samples WHERE time >= ? ORDER BY mountpoint, time",
+                (now - window_days * 86400,)):
+            by_mount.setdefault(mountpoint, []).append((t, total, avail))
+        results = []
+        for mountpoint, samples in by_mount.items():
+            rate, days_left = fit(samples, now)
+            _t, total, avail = samples[-1]
+            results.append(Forecast(mountpoint, total, avail, rate, days_left, len(samples)))
+        results.sort(key=lambda f: (f.days_left is None, f.days_left or 0, f.mountpoint))
+        return results
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+from collections import namedtuple
+
+MOUNTINFO_FILE = "/proc/self/mountinfo"
+
+NETWORK_FSTYPES = {
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "ceph", "glusterfs",
+    "9p", "lustre", "davfs", "coda", "gfs2", "ocfs2",
+}
+
+# Bellek ya da çekirdek tabanlı, temizlenecek kullanıcı verisi barındırmayan dosya sistemleri
+PSEUDO_FSTYPES = {
+    "proc", "sysfs", "devtmpfs", "devpts", "cgroup", "cgroup2", "securityfs", "debugfs",
+    "tracefs", "configfs", "fusectl", "mqueue", "hugetlbfs", "pstore", "bpf", "autofs",
+    "binfmt_misc", "efivarfs", "nsfs", "rpc_pipefs", "selinuxfs",
+}
+
+# Ağ üzerinden çalışan FUSE sürücüleri (fuse.<ad> biçiminde görünür)
+NETWORK_FUSE_DRIVERS = {"sshfs", "rclone", "s3fs", "gcsfuse", "davfs2", "curlftpfs", "gvfsd-fuse"}
+
+# Çıkarılabilir disklerin bağlandığı yerler; buradaki kayıp dosyalar disk takılı olmadığı
+# için görünmüyor olabilir
+REMOVABLE_ROOTS = ("/media/", "/run/media/", "/mnt/")
+
+Mount = namedtuple("Mount", ["mount_id", "device", "mountpoint", "fstype", "source", "kind"])
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(field):
+    # mountinfo boşluk ve benzeri karakterleri \040 biçiminde kaçırır
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def classify(fstype):
+    """Bağlama noktasını 'local', 'network', 'fuse' ya da 'pseudo' olarak sınıflandırır."""
+    if fstype in NETWORK_FSTYPES:
+        return "network"
+    if fstype == "fuseblk":
+        # ntfs-3g, exfat-fuse gibi yerel blok aygıtı üzerindeki FUSE sürücüleri
+        return "local"
+    if fstype.startswith("fuse"):
+        driver = fstype.partition(".")[2]
+        return "network" if driver in NETWORK_FUSE_DRIVERS else "fuse"
+    if fstype in PSEUDO_FSTYPES:
+        return "pseudo"
+    return "local"
+
+
+def parse_mountinfo(path=MOUNTINFO_FILE):
+    mounts = []
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return mounts
+    for line in lines:
+        fields = line.split(" ")
+        try:
+            separator = fields.index("-", 6)
+            mount_id = int(fields[0])
+            major, minor = (int(x) for x in fields[2].split(":"))
+            mountpoint = _unescape(fields[4])
+            fstype = fields[separator + 1]
+            source = _unescape(fields[separator + 2])
+        except (ValueError, IndexError):
+            continue
+        mounts.append(Mount(mount_id, (major, minor), mountpoint, fstype, source, classify(fstype)))
+    return mounts
+
+
+class MountTable:
+    """/proc/self/mountinfo bir kez okunur; taramalar bu tablo üzerinden
+    hangi bağlama noktalarına girilmeyeceğine karar verir."""
+
+    def __init__(self, mounts=None, allowed=()):
+        self.mounts = parse_mountinfo() if mounts is None else mounts
+        # Aynı noktaya birden fazla bağlama yapılmışsa en son bağlanan geçerlidir
+        self.by_mountpoint = {}
+        for mount in self.mounts:
+            self.by_mountpoint[mount.mountpoint] = mount
+        self.allowed = {os.path.normpath(os.path.expanduser(p)) for p in allowed}
+
+    def find(self, path):
+        """Yolu içeren en derin bağlama noktasını döndürür."""
+        path = os.path.normpath(path)
+        while True:
+            mount = self.by_mountpoint.get(path)
+            if mount is not None:
+                return mount
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+    def skips(self, path):
+        # Dosya sistemi sınırı yalnızca bağlama noktalarında aşılır
+        mount = self.by_mountpoint.get(path)
+        if mount is None or mount.kind == "local":
+            return False
+        return mount.mountpoint not in self.allowed
+
+    def local_groups(self):
+        """Yerel bağlama noktalarını arkalarındaki aygıta (major:minor) göre gruplar."""
+        groups = {}
+        for mount in self.mounts:
+            if mount.kind == "local":
+                groups.setdefault(mount.device, []).append(mount)
+        return groups
+
+    def of_kind(self, *kinds):
+        return [mount for mount in self.mounts if mount.kind in kinds]
+
+
+class MissingTargets:
+    """Bir dosyanın gerçekten silinip silinmediğine karar verir (son kullanılanlar,
+    önizleme önbelleği). Takılı olmayan çıkarılabilir disklerdeki, bağlanmamış ya da
+    yerel olmayan bağlama noktalarındaki hedefler kayıp sayılmaz; disk yeniden
+    takıldığında kayıtları yerinde kalır."""
+
+    def __init__(self, mount_table=None):
+        self.mount_table = mount_table or MountTable()
+        self._verdicts = {}
+
+    def __call__(self, path):
+        if os.path.lexists(path) or path.startswith(REMOVABLE_ROOTS):
+            return False
+        return self.parent_gone(os.path.dirname(path))
+
+    def parent_gone(self, parent):
+        """parent dizininde bulunmayan dosyalar gerçekten silinmiş sayılabilir mi;
+        dizinin kendisi de kayıp olabilir. Sonuç dizin başına bir kez hesaplanır."""
+        if parent.startswith(REMOVABLE_ROOTS):
+            return False
+        # Var olan en yakın üst dizin: hedefin hangi bağlama noktasında kaldığını gösterir
+        verdict = self._verdicts.get(parent)
+        if verdict is None:
+            verdict = self._verdicts[parent] = self._parent_decides(parent)
+        return verdict
+
+    def _parent_decides(self, parent):
+        missing = []
+        while not os.path.lexists(parent):
+            missing.append(parent)
+            parent = os.path.dirname(parent)
+        mount = self.mount_table.find(parent)
+        if mount is None or mount.kind != "local":
+            return False
+        if missing and not os.path.ismount(parent):
+            # Ara dizinler yoksa ve var olan üst dizin boşsa burası büyük olasılıkla
+            # bağlanmamış bir bağlama noktasıdır (fstab, autofs, elle bağlanan disk)
+            try:
+                if not os.listdir(parent):
+                    return False
+            except OSError:
+                return False
+        return True
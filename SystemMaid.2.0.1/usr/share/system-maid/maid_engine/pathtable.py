@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import array
+import os
+
+
+class PathTable:
+    """Tarama sonuçları için sıkıştırılmış yol deposu. Her düğüm üst düğümünün sırası
+    ve adının sırasıyla iki sayı dizisinde (düğüm başına 8 bayt) tutulur; aynı adlar
+    (index.js, __init__.py...) bir kez saklanır. Tam yol yalnızca istendiğinde kurulur."""
+
+    __slots__ = ("parents", "names", "_strings", "_ids", "_open")
+
+    def __init__(self):
+        self.parents = array.array("i")
+        self.names = array.array("I")
+        self._strings = []
+        self._ids = {}
+        # enter() için kökten o anki dizine kadar (yol, sıra) çiftleri
+        self._open = []
+
+    def __len__(self):
+        return len(self.parents)
+
+    def intern(self, name):
+        if self._ids is None:
+            self._ids = {string: index for index, string in enumerate(self._strings)}
+        index = self._ids.get(name)
+        if index is None:
+            index = self._ids[name] = len(self._strings)
+            self._strings.append(name)
+        return index
+
+    def add(self, parent, name):
+        """parent düğümünün altına name adlı düğüm ekler (kök için parent = -1, name tam yol)."""
+        index = len(self.parents)
+        self.parents.append(parent)
+        self.names.append(self.intern(name))
+        return index
+
+    def enter(self, path):
+        """scanner.walk gibi ön sıralı dolaşımda okunan dizini ekler ve sırasını döndürür.
+        Üst dizin her zaman açık yoldadır; bitmiş kardeş alt ağaçlar yoldan çıkarılır."""
+        parent = os.path.dirname(path)
+        stack = self._open
+        while stack and stack[-1][0] != parent:
+            stack.pop()
+        index = self.add(stack[-1][1], os.path.basename(path)) if stack else self.add(-1, path)
+        stack.append((path, index))
+        return index
+
+    def finish(self):
+        # Ekleme bitti; ad sözlüğü ve açık yol bırakılır (intern gerekirse sözlüğü yeniden kurar)
+        self._ids = None
+        self._open = []
+
+    def name(self, index):
+        return self._strings[self.names[index]]
+
+    def path(self, index):
+        parts = []
+        while index >= 0:
+            parts.append(self._strings[self.names[index]])
+            index = self.parents[index]
+        return os.path.join(*reversed(parts))
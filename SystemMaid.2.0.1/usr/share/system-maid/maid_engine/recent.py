@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+import calendar
+import os
+import stat
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote_to_bytes, urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+from maid_engine import mounts
+
+HOME = os.path.expanduser("~")
+XBEL_FILE = os.path.join(HOME, ".local/share/recently-used.xbel")
+RECENT_DOCUMENTS_DIR = os.path.join(HOME, ".local/share/RecentDocuments")
+
+# GLib'in (GBookmarkFile) yazdığı önekler; dosyada bildirilmemişlerse bunlar kullanılır
+NAMESPACES = {
+    "http://www.freedesktop.org/standards/desktop-bookmarks": "bookmark",
+    "http://www.freedesktop.org/standards/shared-mime-info": "mime",
+}
+
+_TIME_ATTRIBUTES = ("visited", "modified", "added")
+
+
+class PruneStats:
+    """Yeniden yazma sonucu: kalan ve çıkarılan kayıtlar, dosyanın önceki ve yeni boyutu."""
+
+    def __init__(self):
+        self.kept = 0
+        self.missing = 0
+        self.expired = 0
+        self.size_before = 0
+        self.size_after = 0
+        # Güvenli silmede ezilemediği için yerinde bırakılan eski dosya kopyaları
+        self.not_erased = []
+
+    @property
+    def removed(self):
+        return self.missing + self.expired
+
+
+def _qualified(name, prefixes):
+    # "{uri}ad" biçimindeki ElementTree adlarını "önek:ad" biçimine çevirir
+    if name.startswith("{"):
+        uri, _, local = name[1:].partition("}")
+        if uri == "http://www.w3.org/XML/1998/namespace":
+            return "xml:" + local
+        return f"{prefixes[uri]}:{local}"
+    return name
+
+
+def _write_start(out, elem, prefixes, declarations):
+    out.write(f"<{_qualified(elem.tag, prefixes)}")
+    for key, value in elem.attrib.items():
+        out.write(f" {_qualified(key, prefixes)}={quoteattr(value)}")
+    for prefix, uri in declarations:
+        out.write(f" xmlns:{prefix}={quoteattr(uri)}")
+
+
+def _write_element(out, elem, indent, prefixes, declared):
+    tag = _qualified(elem.tag, prefixes)
+    out.write(indent)
+    _write_start(out, elem, prefixes, declared.get(elem, ()))
+    children = list(elem)
+    text = (elem.text or "").strip()
+    if not children and not text:
+        out.write("/>\n")
+        return
+    out.write(">")
+    if text:
+        out.write(escape(text))
+    if children:
+        out.write("\n")
+        for child in children:
+            _write_element(out, child, indent + "  ", prefixes, declared)
+        out.write(indent)
+    out.write(f"</{tag}>\n")
+
+
+def _parse_time(value):
+    # 2024-05-01T10:20:30Z ya da 2024-05-01T10:20:30.123456Z (UTC)
+    try:
+        return calendar.timegm(time.strptime(value[:19], "%Y-%m-%dT%H:%M:%S"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _local_path(uri):
+    parts = urlsplit(uri)
+    if parts.scheme != "file" or parts.netloc not in ("", "localhost"):
+        return None
+    return os.fsdecode(unquote_to_bytes(parts.path))
+
+
+def _last_used(bookmark):
+    times = [_parse_time(bookmark.get(name)) for name in _TIME_ATTRIBUTES if bookmark.get(name)]
+    times = [t for t in times if t is not None]
+    return max(times) if times else None
+
+
+def prune_xbel(path=XBEL_FILE, max_age_days=0, drop_missing=True, eraser=None):
+    """recently-used.xbel dosyasını iterparse ile akış halinde okur ve yalnızca
+    hedefi hâlâ var olan, max_age_days günden yeni kayıtları yeni bir dosyaya yazar.
+    Bellekte aynı anda tek bir <bookmark> öğesi tutulur; dosya atomik olarak değiştirilir.
+    eraser verilirse eski dosyanın içeriği ezilerek silinir."""
+    stats = PruneStats()
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return stats
+    stats.size_before = st.st_size
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+    is_missing = mounts.MissingTargets() if drop_missing else None
+
+    parent = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".recently-used.", dir=parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            prefixes = {}
+            # Ad alanı bildirimleri hangi öğede yapıldıysa yeniden yazarken de orada yapılır
+            pending = []
+            declared = {}
+            depth = 0
+            root = None
+            for event, item in ET.iterparse(path, events=("start-ns", "start", "end")):
+                if event == "start-ns":
+                    prefix, uri = item
+                    if uri not in prefixes:
+                        # Varsayılan ad alanı da önekli olarak yazılır; anlamı değişmez
+                        prefixes[uri] = prefix or NAMESPACES.get(uri) or f"ns{len(prefixes)}"
+                        pending.append((prefixes[uri], uri))
+                    continue
+
+                elem = item
+                if event == "start":
+                    depth += 1
+                    if pending:
+                        declared[elem] = pending
+                        pending = []
+                    if depth == 1:
+                        root = elem
+                        # GLib'in beklediği bookmark/mime önekleri her durumda kökte bildirilir
+                        declarations = list(declared.pop(elem, []))
+                        for uri, prefix in NAMESPACES.items():
+                            if uri not in prefixes:
+                                prefixes[uri] = prefix
+                                declarations.append((prefix, uri))
+                        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                        _write_start(out, elem, prefixes, declarations)
+                        out.write(">\n")
+                    continue
+
+                depth -= 1
+                if depth != 1:
+                    if depth == 0:
+                        out.write(f"</{_qualified(elem.tag, prefixes)}>\n")
+                    continue
+
+                # Kök altındaki tam bir öğe okundu: karar verilir, yazılır ve bellekten atılır
+                keep = True
+                if elem.tag == "bookmark":
+                    local = _local_path(elem.get("href", ""))
+                    last_used = _last_used(elem)
+                    if drop_missing and local is not None and is_missing(local):
+                        stats.missing += 1
+                        keep = False
+                    elif cutoff is not None and last_used is not None and last_used < cutoff:
+                        stats.expired += 1
+                        keep = False
+                    else:
+                        stats.kept += 1
+                if keep:
+                    _write_element(out, elem, "  ", prefixes, declared)
+                declared.clear()
+                root.clear()
+            out.flush()
+            os.fsync(out.fileno())
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+
+        if not stats.removed:
+            os.unlink(tmp_path)
+            stats.size_after = stats.size_before
+            return stats
+
+        old_link = None
+        if eraser is not None:
+            # Eski içerik ezilebilsin diye değiştirilmeden önce ikinci bir adla tutulur
+            old_link = tmp_path + ".old"
+            os.link(path, old_link)
+        os.replace(tmp_path, path)
+        if old_link is not None:
+            # Ezilemeyen eski kopya düz silinmez; çağıran bildirir
+            stats.not_erased = eraser.erase_files([old_link]).failed
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    stats.size_after = os.stat(path).st_size
+    return stats
+
+
+def _desktop_url(path):
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                # KDE ortam değişkeni içeren değerleri URL[$e]= biçiminde yazar
+                if key.strip() in ("URL", "URL[$e]"):
+                    return value.strip()
+    except OSError:
+        pass
+    return None
+
+
+def stale_recent_documents(max_age_days=0, drop_missing=True, top=RECENT_DOCUMENTS_DIR):
+    """KDE RecentDocuments klasöründe hedefi kaybolmuş ya da eskimiş .desktop kayıtları."""
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+    is_missing = mounts.MissingTargets() if drop_missing else None
+    stale = []
+    try:
+        entries = list(os.scandir(top))
+    except OSError:
+        return stale
+    for entry in entries:
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if cutoff is not None and st.st_mtime < cutoff:
+            stale.append(entry.path)
+            continue
+        if drop_missing and entry.name.endswith(".desktop"):
+            url = _desktop_url(entry.path) or ""
+            # KDE, URL= satırına ya file:// adresi ya da doğrudan mutlak yol yazar
+            local = url if url.startswith("/") else _local_path(url)
+            if local is not None and is_missing(local):
+                stale.append(entry.path)
+    return stale
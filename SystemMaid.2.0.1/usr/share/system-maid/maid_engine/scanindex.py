@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import time
+
+from maid_engine import scanner
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "system-maid")
+INDEX_FILE = os.path.join(CACHE_DIR, "scan-index.sqlite")
+
+# Şema değişirse eski dizin bilgileri kullanılmaz, tablo yeniden kurulur
+SCHEMA_VERSION = 1
+
+# mtime çözünürlüğü yüzünden, taramayla aynı anda değişen dizinlerin
+# mtime değerine güvenilmez; bir sonraki taramada mutlaka yeniden okunurlar
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+# Bu dizinler için kaydedilen "hep yeniden oku" işareti
+UNTRUSTED_MTIME = -1
+
+
+class _Fresh:
+    __slots__ = ("entries", "mtime_ns")
+
+    def __init__(self, entries, mtime_ns):
+        self.entries = entries
+        self.mtime_ns = mtime_ns
+
+
+class _Cached:
+    __slots__ = ("subdirs", "links", "candidates")
+
+    def __init__(self, data):
+        self.subdirs = data["d"]
+        self.links = data["l"]
+        self.candidates = data["c"]
+
+
+class ScanIndex:
+    """Dizinlerin mtime değerini ve içlerindeki çöp adaylarını SQLite'ta saklar.
+    Sonraki taramalarda mtime değeri değişmeyen dizinler yeniden okunmaz."""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tahmin ve temizlik aynı anda tarayabilir: okuyucular yazıcıyı WAL sayesinde
+        # beklemez, iki yazıcı ise 5000 satırlık toplu yazmaları bekleyecek kadar sırada durur
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS dirs")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # Yol anahtarı bayt olarak tutulur; UTF-8 olmayan dosya adları da sorunsuz saklanır
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path BLOB PRIMARY KEY, mtime_ns INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self.conn.commit()
+        self.stats = {"cached": 0, "rescanned": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self, root):
+        prefix = os.fsencode(root.rstrip("/")) + b"/"
+        rows = self.conn.execute(
+            "SELECT path, mtime_ns, data FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+            (prefix[:-1], prefix, prefix[:-1] + b"0"),
+        )
+        return {path: (mtime_ns, data) for path, mtime_ns, data in rows}
+
+    def _forget_subtree(self, path):
+        prefix = os.fsencode(path) + b"/"
+        self.conn.execute(
+            "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+            (prefix[:-1], prefix, prefix[:-1] + b"0"),
+        )
+
+    def scan(self, root, rules, workers=None, on_error=None, exclude=None):
+        """scanner.scan_tree ile aynı adayları üretir; değişmeyen dizinleri indeksten okur."""
+        known = self._load(root)
+        wanted = {rule.name for rule in rules}
+        link_rules = [rule for rule in rules if rule.link_recheck]
+        # İndeks, seçili olmasa da önbelleğe alınabilen tüm kuralların adaylarını tutar;
+        # böylece farklı seçimlerle yapılan taramalar aynı kayıtları paylaşır.
+        index_rules = [rule for rule in scanner.RULES.values() if not rule.link_recheck]
+        racy_limit = time.time_ns() - RACY_WINDOW_NS
+        self.stats = {"cached": 0, "rescanned": 0}
+
+        def read(path):
+            try:
+                mtime_ns = os.stat(path, follow_symlinks=False).st_mtime_ns
+            except OSError as e:
+                return None, e
+            row = known.get(os.fsencode(path))
+            if row is not None and row[0] == mtime_ns:
+                return _Cached(json.loads(row[1])), None
+            entries, error = scanner._read_dir(path)
+            if error is not None:
+                return None, error
+            return _Fresh(entries, mtime_ns), None
+
+        def children(path, node):
+            if isinstance(node, _Cached):
+                return [os.path.join(path, name) for name in node.subdirs]
+            return scanner._subdirs(node.entries)
+
+        pending_writes = 0
+        for path, node in scanner.walk_nodes(root, read, children, workers=workers,
+                                                  on_error=on_error, exclude=exclude):
+            if isinstance(node, _Cached):
+                self.stats["cached"] += 1
+                for rule_name, name in node.candidates:
+                    if rule_name in wanted:
+                        yield scanner.Candidate(rule_name, os.path.join(path, name) if name is not None else path)
+                for name in node.links:
+                    link_path = os.path.join(path, name)
+                    for rule in link_rules:
+                        if rule.link_recheck(link_path):
+                            yield scanner.Candidate(rule.name, link_path)
+                continue
+
+            self.stats["rescanned"] += 1
+            is_root = (path == root)
+            found = scanner.evaluate_dir(path, node.entries, index_rules, is_root=is_root)
+            subdirs = []
+            links = []
+            for entry in node.entries:
+                if entry.is_symlink():
+                    links.append(entry.name)
+                else:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                    except OSError:
+                        pass
+
+            for candidate in found:
+                if candidate.rule in wanted:
+                    yield candidate
+            for name in links:
+                link_path = os.path.join(path, name)
+                for rule in link_rules:
+                    if rule.link_recheck(link_path):
+                        yield scanner.Candidate(rule.name, link_path)
+
+            # Silinen alt dizinlerin kayıtları da temizlenir
+            key = os.fsencode(path)
+            old = known.get(key)
+            if old is not None:
+                for name in set(json.loads(old[1])["d"]) - set(subdirs):
+                    self._forget_subtree(os.path.join(path, name))
+
+            data = {
+                "d": subdirs,
+                "l": links,
+                "c": [[c.rule, None if c.path == path else os.path.basename(c.path)] for c in found],
+            }
+            mtime_ns = node.mtime_ns if node.mtime_ns < racy_limit else UNTRUSTED_MTIME
+            # ensure_ascii sayesinde çözülemeyen dosya adları da güvenle saklanır
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dirs (path, mtime_ns, data) VALUES (?, ?, ?)",
+                (key, mtime_ns, json.dumps(data)),
+            )
+            pending_writes += 1
+            if pending_writes >= 5000:
+                self.conn.commit()
+                pending_writes = 0
+
+        self.conn.commit()
+
+
+def indexed_scan(root, rules, workers=None, on_error=None, stats=None, exclude=None):
+    """İndeks açılamazsa (salt okunur önbellek, kilitli veritabanı vb.) düz taramaya döner."""
+    try:
+        index = ScanIndex()
+    except (OSError, sqlite3.Error):
+        yield from scanner.scan_tree(root, rules, on_error=on_error, workers=workers, exclude=exclude)
+        return
+    with index:
+        yield from index.scan(root, rules, workers=workers, on_error=on_error, exclude=exclude)
+        if stats is not None:
+            stats.update(index.stats)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import settings
+
+# Taramada bulunan her aday: hangi kurala uyduğu ve tam yolu
+Candidate = namedtuple("Candidate", ["rule", "path"])
+
+
+class JunkRule:
+    """Tek geçişli tarama sırasında dizin girdilerine uygulanan temizlik kuralı."""
+
+    def __init__(self, name, entry_test=None, dir_test=None, link_recheck=None):
+        self.name = name
+        # entry_test(entry) -> bool : her DirEntry için çağrılır
+        self.entry_test = entry_test
+        # dir_test(path, names) -> bool : dizin okunduktan sonra dizinin kendisi için çağrılır
+        self.dir_test = dir_test
+        # Sonucu dizinin mtime değerine bağlı olmayan kurallar (ör. kırık bağlantılar)
+        # yalnızca sembolik bağlantılarla eşleşebilir; önbellekten gelen dizinlerde
+        # bu fonksiyon bağlantının yolu ile yeniden çağrılır.
+        self.link_recheck = link_recheck
+
+
+def _is_thumbs_db(entry):
+    return entry.name.lower() == "thumbs.db" and entry.is_file(follow_symlinks=False)
+
+
+def _is_broken_symlink(entry):
+    # find -xtype l ile aynı: hedefi çözülemeyen sembolik bağlantılar
+    return entry.is_symlink() and not os.path.exists(entry.path)
+
+
+def _link_is_broken(path):
+    return not os.path.exists(path)
+
+
+def _is_empty_dir(path, names):
+    return not names
+
+
+RULES = {
+    "thumbs_db": JunkRule("thumbs_db", entry_test=_is_thumbs_db),
+    "broken_symlink": JunkRule("broken_symlink", entry_test=_is_broken_symlink, link_recheck=_link_is_broken),
+    "empty_dir": JunkRule("empty_dir", dir_test=_is_empty_dir),
+}
+
+
+def get_rules(names):
+    return [RULES[name] for name in names]
+
+
+def default_workers():
+    # scandir/stat çağrıları GIL'i bıraktığı için G/Ç ağırlıklı taramada
+    # çekirdek sayısından fazla iş parçacığı kullanmak işe yarar
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+def _read_dir(path):
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+        # d_type bilinmeyen dosya sistemlerinde stat çağrısı burada, havuz iş parçacığında yapılır
+        for entry in entries:
+            try:
+                entry.is_dir(follow_symlinks=False)
+            except OSError:
+                pass
+        return entries, None
+    except OSError as e:
+        return None, e
+
+
+def _subdirs(entries):
+    subdirs = []
+    for entry in entries:
+        try:
+            # Sembolik bağlantı olan dizinlerin içine girilmez (find varsayılanı gibi)
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        except OSError:
+            pass
+    return subdirs
+
+
+def walk(root, workers=None, on_error=None, exclude=None):
+    """Dizinleri iş parçacığı havuzunda okur, sonuçları (yol, girdiler) olarak
+    derinlik öncelikli sırayla üretir. Sıra, havuz boyutundan bağımsızdır.
+    exclude (ExclusionSet) verilirse eşleşen alt ağaçlar hiç okunmaz."""
+    return walk_nodes(root, _read_dir, lambda path, entries: _subdirs(entries),
+                      workers=workers, on_error=on_error, exclude=exclude)
+
+
+def walk_nodes(root, read, children, workers=None, on_error=None, exclude=None):
+    # walk() fonksiyonunun genel hali: read(path) -> (düğüm, hata) havuzda çalışır,
+    # children(path, düğüm) ise inilecek alt dizinlerin listesini verir.
+    if workers is None:
+        workers = settings.load()["scan_workers"] or default_workers()
+    if exclude is not None:
+        # Budama, okuma kuyruğa girmeden önce yapılır
+        unfiltered = children
+        children = lambda path, node: [sub for sub in unfiltered(path, node) if not exclude.prunes(sub)]
+
+    if workers <= 1:
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            node, error = read(path)
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                continue
+            yield path, node
+            stack.extend(reversed(children(path, node)))
+        return
+
+    # Aynı anda bekleyen okuma sayısı sınırlı tutulur; böylece çok geniş
+    # ağaçlarda bellek ve açık dosya tanıtıcısı sayısı patlamaz
+    max_pending = workers * 4
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-scan")
+    try:
+        stack = [(root, pool.submit(read, root))]
+        pending = 1
+        while stack:
+            path, future = stack.pop()
+            if future is None:
+                future = pool.submit(read, path)
+            else:
+                pending -= 1
+            node, error = future.result()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                continue
+
+            yield path, node
+
+            next_level = []
+            for sub in children(path, node):
+                if pending < max_pending:
+                    next_level.append((sub, pool.submit(read, sub)))
+                    pending += 1
+                else:
+                    next_level.append((sub, None))
+            stack.extend(reversed(next_level))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def evaluate_dir(path, entries, rules, is_root=False):
+    """Okunmuş tek bir dizinin girdilerine kuralları uygular."""
+    candidates = []
+    for entry in entries:
+        for rule in rules:
+            if rule.entry_test and rule.entry_test(entry):
+                candidates.append(Candidate(rule.name, entry.path))
+
+    # Kök dizinin kendisi aday sayılmaz (find -mindepth 1)
+    if not is_root:
+        names = None
+        for rule in rules:
+            if rule.dir_test:
+                if names is None:
+                    names = [entry.name for entry in entries]
+                if rule.dir_test(path, names):
+                    candidates.append(Candidate(rule.name, path))
+    return candidates
+
+
+def scan_tree(root, rules, on_error=None, workers=None, exclude=None):
+    """Ağacı bir kez dolaşır ve etkin tüm kuralları aynı geçişte uygular."""
+    for path, entries in walk(root, workers=workers, on_error=on_error, exclude=exclude):
+        yield from evaluate_dir(path, entries, rules, is_root=(path == root))
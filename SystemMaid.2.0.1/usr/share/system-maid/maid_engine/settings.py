@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "system-maid")
+SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
+
+# Ayar dosyasında bulunmayan anahtarlar için varsayılan değerler
+DEFAULTS = {
+    # Dizin taramasında kullanılacak iş parçacığı sayısı (0 = otomatik)
+    "scan_workers": 0,
+    # Ev dizini taramalarında hiç okunmayacak alt ağaçlar (~ kullanılabilir)
+    "scan_exclude_paths": [
+        "~/.local/share/containers",
+        "~/.local/share/docker",
+        "~/.local/share/virtualenvs",
+        "~/.virtualenvs",
+        "~/.pyenv/versions",
+        "~/.local/share/Steam/steamapps",
+    ],
+    # Nerede olursa olsun atlanacak dizin adları (joker karakter kullanılabilir)
+    "scan_exclude_names": [".git", ".hg", ".svn", "node_modules", ".venv", "venv", ".tox", "__pycache__"],
+    # Ağ (NFS, CIFS, sshfs...) ve FUSE bağlama noktalarına girilmez; yine de
+    # taranması istenen bağlama noktaları buraya yazılır
+    "scan_allowed_mounts": [],
+    # Güvenli silmede rastgele veri geçişi sayısı (shred -n) ve iş parçacığı sayısı (0 = otomatik)
+    "secure_erase_passes": 1,
+    "secure_erase_workers": 0,
+    # "auto": SSD'lerde tek geçiş + discard, HDD'lerde tam geçiş; "overwrite": her yerde tam geçiş
+    "secure_erase_ssd_policy": "auto",
+    # Çöp adaylarını inotify ile arka planda güncel tut
+    "live_tracking": False,
+    # inotify izleme sınırının (max_user_watches) kullanılacak payı
+    "inotify_watch_share": 0.5,
+    # Önizleme önbelleği: "all" hepsini siler, "orphans" yalnızca özgün dosyası silinmiş
+    # önizlemeleri siler, "budget" en eski kullanılanlardan başlayarak önbelleği
+    # thumbnail_budget_mb altına indirir
+    "thumbnail_mode": "all",
+    "thumbnail_budget_mb": 256,
+    # Bütçe kipinde sıralama: "atime" (son erişim) ya da "thumb_mtime" (PNG içindeki Thumb::MTime)
+    "thumbnail_eviction_order": "atime",
+    # Çöp kutusu: yalnızca bu kadar günden eski öğeler silinir (0 = yaşına bakılmaz)
+    "trash_max_age_days": 0,
+    # Çöp kutusu bu boyutun altına inene kadar en eski öğeler silinir (0 = sınır yok)
+    "trash_quota_mb": 0,
+    # Diğer disklerdeki .Trash-$UID ve .Trash/$UID dizinleri de temizlenir
+    "trash_include_mounts": True,
+    # Son kullanılanlar: "all" geçmişin tamamını siler, "prune" yalnızca hedefi silinmiş
+    # ve recent_max_age_days günden eski kayıtları çıkarır (0 = yaşına bakılmaz)
+    "recent_mode": "all",
+    "recent_max_age_days": 90,
+    # Tarayıcı önbellekleri: "budget" her profili browser_cache_budget_mb altına indirir
+    # (tarayıcı açıkken de), "all" tarayıcısı kapalı profillerin önbelleğini tamamen boşaltır
+    "browser_cache_mode": "budget",
+    "browser_cache_budget_mb": 300,
+    # ~/.cache politikaları: uygulama dizini adı -> {"max_mb": N, "max_age_days": N, "whole": bool}.
+    # "whole" true ise dosyalar tek tek silinmez; uygulama dizini yalnızca içindeki her şey
+    # max_age_days günden eskiyse bütün olarak silinir. "*" diğer tüm uygulamalara her zaman
+    # bu kipte uygulanır (küçük resimler ve tarayıcılar hariç)
+    "cache_policies": {
+        "*": {"max_age_days": 90},
+    },
+    # Kopya dosya aramasında bu boyuttan küçük dosyalar dikkate alınmaz (KB)
+    "duplicate_min_size_kb": 64,
+    # Kopyalar paylaşılan bloklarla (reflink) birleştirilemezse sabit bağlantıya çevrilir:
+    # "readonly" yalnızca salt okunur dosyalarda, "always" her zaman, "never" hiçbir zaman
+    "dedupe_hardlink": "readonly",
+    # Kopya birleştirmede dokunulmayan ağaçlar; geliştirici araç önbellekleri (~/go/pkg/mod,
+    # ~/.cargo, ~/.npm, ~/.m2, ~/.gradle/caches, pip) her zaman bunlara eklenir
+    "dedupe_exclude_paths": ["~/.local/share/flatpak", "~/snap"],
+    # Geliştirici araç önbellekleri (pip, npm, cargo, go, gradle, maven): bu kadar gündür
+    # kullanılmayan paketler silinir; proje köklerindeki kilit dosyalarında geçenler korunur
+    "toolchain_max_age_days": 90,
+    "toolchain_project_roots": ["~/Projects", "~/projects", "~/src", "~/code", "~/workspace", "~/git", "~/dev"],
+    # Diskler için boş alan örneği alma sıklığı (dakika) ve dolmasına bu kadar gün kalan
+    # diskler için ana pencerede uyarı gösterilir
+    "free_space_sample_minutes": 5,
+    "free_space_warn_days": 14,
+}
+
+
+def load():
+    """Varsayılanların üzerine kullanıcının settings.json dosyasını bindirir."""
+    settings = dict(DEFAULTS)
+    try:
+        with open(SETTINGS_FILE, encoding="utf-8") as f:
+            user_settings = json.load(f)
+        if isinstance(user_settings, dict):
+            settings.update(user_settings)
+    except (OSError, ValueError):
+        # Dosya yoksa ya da bozuksa varsayılanlarla devam edilir
+        pass
+    return settings
+
+
+def save(settings):
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    tmp_path = SETTINGS_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, SETTINGS_FILE)
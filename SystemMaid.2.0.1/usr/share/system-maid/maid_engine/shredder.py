@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+import os
+import resource
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import scanner, settings, storage
+
+# Tüm iş parçacıklarının paylaştığı sıfır deseni ve her iş parçacığının kendi rastgele tamponu
+# (rastgele tampon her parça yazılmadan önce yeniden doldurulur)
+BUFFER_SIZE = 1024 * 1024
+
+# Küçük dosyalar gruplar halinde ezilir; fdatasync her dosya için değil, grup başına
+# bir geçişin sonunda toplu olarak çağrılır
+BATCH_FILES = 256
+BATCH_BYTES = 64 * 1024 * 1024
+
+# Tüm iş parçacıklarında aynı anda açık tutulan dosya sayısı RLIMIT_NOFILE yumuşak
+# sınırının bu payını aşmaz; kalan tanıtıcılar arayüz, SQLite ve taramalar içindir
+FD_SHARE = 0.5
+
+MAX_ERRORS = 50
+
+_ZEROS = bytes(BUFFER_SIZE)
+
+
+def _batch_limit(workers):
+    """Bir grupta aynı anda açık tutulacak en fazla dosya: workers x grup boyutu
+    RLIMIT_NOFILE yumuşak sınırının FD_SHARE payını aşmaz."""
+    try:
+        soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (OSError, ValueError):
+        soft = 1024
+    if soft == resource.RLIM_INFINITY:
+        return BATCH_FILES
+    return max(1, min(BATCH_FILES, int(soft * FD_SHARE) // max(1, workers)))
+
+
+class EraseStats:
+    """Güvenli silme sonucu ve yazma hızı."""
+
+    def __init__(self):
+        self.files = 0
+        # Ezilen dosyaların toplam boyutu ve tüm geçişlerde diske yazılan veri
+        self.bytes = 0
+        self.written = 0
+        self.seconds = 0.0
+        self.errors = []
+        self.error_count = 0
+        # Ezilemediği için yerinde bırakılan dosyalar. Çağıran bunları düz silmeye
+        # geçmemeli; içerikleri hâlâ diskte durur
+        self.failed = []
+        # Aygıt adı -> [kullanılan strateji, dosya sayısı]
+        self.by_device = {}
+
+    @property
+    def mb_per_s(self):
+        if self.seconds <= 0:
+            return 0.0
+        return self.written / (1024 * 1024) / self.seconds
+
+    def add_error(self, path, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{path}: {error.strerror or error}")
+
+    def merge(self, other):
+        self.files += other.files
+        self.bytes += other.bytes
+        self.written += other.written
+        self.error_count += other.error_count
+        self.errors.extend(other.errors[:max(0, MAX_ERRORS - len(self.errors))])
+        self.failed.extend(other.failed)
+        for device, (strategy, files) in other.by_device.items():
+            entry = self.by_device.setdefault(device, [strategy, 0])
+            entry[1] += files
+
+
+class SecureEraser:
+    """shred -n <passes> [-z] -u ile aynı geçiş düzeni: passes kadar rastgele veri,
+    istenirse son olarak sıfır geçişi, ardından ad gizleme ve silme.
+    Dosyalar iş parçacığı havuzunda gruplar halinde işlenir. Her dosyanın
+    bulunduğu aygıta göre (HDD/SSD) strateji seçilir; bkz. storage.erase_strategy."""
+
+    def __init__(self, passes=None, zero=True, workers=None, policy=None):
+        config = settings.load()
+        self.passes = config["secure_erase_passes"] if passes is None else passes
+        self.zero = zero
+        self.workers = workers or config["secure_erase_workers"] or min(8, os.cpu_count() or 1)
+        self.policy = policy or config["secure_erase_ssd_policy"]
+        self._local = threading.local()
+        self.batch_files = _batch_limit(self.workers)
+
+    def _random_buffer(self):
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = bytearray(BUFFER_SIZE)
+        return buf
+
+    def _write_pattern(self, fd, length, kind):
+        # Rastgele geçişlerde her parça için tampon yeniden doldurulur; aynı blok dosya
+        # boyunca ya da dosyalar arasında tekrarlanmaz
+        if kind == "random":
+            buf = self._random_buffer()
+            view = memoryview(buf)
+        else:
+            view = memoryview(_ZEROS)
+        offset = 0
+        while offset < length:
+            chunk = min(length - offset, BUFFER_SIZE)
+            if kind == "random":
+                buf[:chunk] = os.urandom(chunk)
+            offset += os.pwrite(fd, view[:chunk], offset)
+        return offset
+
+    def _unlink_obscured(self, path):
+        # shred -u gibi: silmeden önce dosya adı aynı uzunlukta sıfırlarla değiştirilir
+        parent, name = os.path.split(path)
+        hidden = os.path.join(parent, "0" * len(name))
+        if hidden != path and not os.path.lexists(hidden):
+            try:
+                os.rename(path, hidden)
+                path = hidden
+            except OSError:
+                pass
+        os.unlink(path)
+
+    def _erase_batch(self, job):
+        device, strategy, batch = job
+        stats = EraseStats()
+        opened = []
+        # Açılamayan, yazılamayan ya da diske indirilemeyen dosyalar; silinmezler
+        bad = set()
+        for path in batch:
+            try:
+                # O_NONBLOCK: lstat ile açma arasında yerine FIFO konmuşsa açılışta beklenmez
+                fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK | os.O_NOFOLLOW | os.O_CLOEXEC)
+            except OSError as e:
+                stats.add_error(path, e)
+                stats.failed.append(path)
+                continue
+            try:
+                st = os.fstat(fd)
+            except OSError as e:
+                os.close(fd)
+                stats.add_error(path, e)
+                stats.failed.append(path)
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                # Açılan şey normal dosya değil (aygıt, FIFO...): üzerine yazılmaz
+                os.close(fd)
+                continue
+            # shred gibi son bloğun artık (slack) kısmı da ezilir
+            block = st.st_blksize or 4096
+            length = -(-st.st_size // block) * block
+            opened.append((path, fd, length, st.st_size))
+
+        patterns = ["random"] * strategy.passes + (["zero"] if strategy.zero else [])
+        try:
+            for kind in patterns:
+                for path, fd, length, _size in opened:
+                    if path in bad:
+                        continue
+                    try:
+                        stats.written += self._write_pattern(fd, length, kind)
+                    except OSError as e:
+                        stats.add_error(path, e)
+                        bad.add(path)
+                for path, fd, _length, _size in opened:
+                    if path in bad:
+                        continue
+                    try:
+                        os.fdatasync(fd)
+                    except OSError as e:
+                        stats.add_error(path, e)
+                        bad.add(path)
+            if strategy.punch_hole:
+                for path, fd, length, _size in opened:
+                    if path in bad:
+                        continue
+                    try:
+                        storage.punch_hole(fd, length)
+                    except OSError:
+                        # Delik açmayı desteklemeyen dosya sistemlerinde ezme yeterlidir
+                        pass
+        finally:
+            for _path, fd, _length, _size in opened:
+                os.close(fd)
+
+        for path, _fd, _length, size in opened:
+            if path in bad:
+                # shred gibi: ezme tamamlanmadıysa dosya silinmez
+                stats.failed.append(path)
+                continue
+            try:
+                self._unlink_obscured(path)
+                stats.files += 1
+                stats.bytes += size
+            except OSError as e:
+                stats.add_error(path, e)
+        stats.by_device[device] = [strategy.name, stats.files]
+        return stats
+
+    def _batches(self, paths):
+        # Dosyalar aygıtlarına göre ayrı gruplara konur; her grup kendi stratejisiyle ezilir
+        open_batches = {}
+        for path in paths:
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            if st.st_dev not in open_batches:
+                info = storage.device_info(st.st_dev, path)
+                device = info.name if info else "%d:%d" % (os.major(st.st_dev), os.minor(st.st_dev))
+                strategy = storage.erase_strategy(info, self.passes, self.zero, self.policy)
+                open_batches[st.st_dev] = [device, strategy, [], 0]
+            current = open_batches[st.st_dev]
+            current[2].append(path)
+            current[3] += st.st_size
+            if len(current[2]) >= self.batch_files or current[3] >= BATCH_BYTES:
+                yield current[0], current[1], current[2]
+                current[2] = []
+                current[3] = 0
+        for device, strategy, batch, _size in open_batches.values():
+            if batch:
+                yield device, strategy, batch
+
+    def erase_files(self, paths):
+        """Verilen normal dosyaları ezer ve siler; diğer dosya türlerine dokunmaz.
+        Ezilemeyen dosyalar silinmez ve sonucun failed listesinde döner."""
+        total = EraseStats()
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="maid-shred") as pool:
+            for stats in pool.map(self._erase_batch, self._batches(paths)):
+                total.merge(stats)
+        total.seconds = time.monotonic() - started
+        return total
+
+    def erase_tree(self, top):
+        """Dizin altındaki tüm normal dosyaları ezer; dizinler ve bağlantılar
+        ardından deleter ile silinmek üzere yerinde bırakılır."""
+        if os.path.isfile(top) and not os.path.islink(top):
+            return self.erase_files([top])
+        if not os.path.isdir(top):
+            return EraseStats()
+        files = []
+        for _path, entries in scanner.walk(top):
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files.append(entry.path)
+        return self.erase_files(files)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+import array
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+from maid_engine import pathtable, scanindex
+
+try:
+    import numpy
+except ImportError:
+    # numpy yoksa sütunlar array modülüyle tutulur, karşılaştırma düz döngüyle yapılır
+    numpy = None
+
+SNAPSHOT_DIR = os.path.join(scanindex.CACHE_DIR, "snapshots")
+# Her kök için saklanan en fazla anlık görüntü sayısı
+KEEP_SNAPSHOTS = 10
+
+MAGIC = b"MAIDSNP1"
+VERSION = 1
+# Başlık: sihirli sayı, sürüm, kök yolu uzunluğu, dizin sayısı, oluşturulma zamanı, sıkıştırılmış ad tablosu uzunluğu
+_HEADER = struct.Struct("<8sIIQdQ")
+
+# Dizin başına sabit genişlikli sütunlar (dizin başına 28 bayt + sıkıştırılmış ad):
+# keys yolun 64 bitlik özeti, parents üst dizinin sırası (kök için -1), bytes alt ağacın
+# toplam boyutu, files ve mtimes dizinin doğrudan içindeki dosya sayısı ve en yeni mtime
+COLUMNS = (("keys", "Q"), ("parents", "i"), ("bytes", "q"), ("files", "I"), ("mtimes", "I"))
+_NUMPY_TYPES = {"Q": "<u8", "i": "<i4", "q": "<i8", "I": "<u4"}
+
+# İki anlık görüntü arasında büyüyen dizin
+Growth = namedtuple("Growth", ["path", "grown", "bytes", "old_bytes"])
+
+
+def path_key(path):
+    # Dizinler görüntüler arasında yolun özetiyle eşleştirilir; yolların kendisi karşılaştırılmaz
+    return int.from_bytes(hashlib.blake2b(os.fsencode(path), digest_size=8).digest(), "little")
+
+
+def _root_slug(root):
+    return hashlib.blake2b(os.fsencode(root), digest_size=8).hexdigest()
+
+
+class Builder:
+    """Dolaşım sırasında (ön sıralı) dizinleri sütunlara ekler. Bir dizinin sırası
+    her zaman üst dizininkinden büyüktür."""
+
+    def __init__(self, root):
+        self.root = os.path.normpath(root)
+        self.created = time.time()
+        self.columns = {name: array.array(code) for name, code in COLUMNS}
+        # Üst dizin sütunu ve adlar yol tablosunda tutulur; sık geçen adlar bir kez saklanır
+        self.paths = pathtable.PathTable()
+        self.columns["parents"] = self.paths.parents
+
+    def add(self, path, parent, own_bytes, files, mtime):
+        index = self.paths.add(parent, os.path.basename(path) if parent >= 0 else self.root)
+        self.columns["keys"].append(path_key(path))
+        self.columns["bytes"].append(own_bytes)
+        self.columns["files"].append(min(files, 0xFFFFFFFF))
+        self.columns["mtimes"].append(min(max(int(mtime), 0), 0xFFFFFFFF))
+        return index
+
+    def set_total(self, index, total_bytes):
+        self.columns["bytes"][index] = total_bytes
+
+    def snapshot(self):
+        # Kökün adı dosyada boş yazılır; kök yolu başlıkta durur
+        names = zlib.compress(b"\0".join(os.fsencode(self.paths.name(i)) if i else b""
+                                         for i in range(len(self.paths))), 6)
+        return Snapshot(self.root, self.created, dict(self.columns), names)
+
+    def save(self, directory=SNAPSHOT_DIR):
+        return self.snapshot().save(directory)
+
+
+class Snapshot:
+    """Bir ağacın dizin başına boyut özetleri. load() ile açılan görüntülerde sütunlar
+    dosyanın bellek eşlemesinden okunur; numpy varsa kopyalanmadan kullanılır."""
+
+    def __init__(self, root, created, columns, names_blob):
+        self.root = root
+        self.created = created
+        self.columns = columns
+        self._names_blob = names_blob
+        self._names = None
+
+    def __len__(self):
+        return len(self.columns["keys"])
+
+    @property
+    def total_bytes(self):
+        return int(self.columns["bytes"][0]) if len(self) else 0
+
+    def save(self, directory=SNAPSHOT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        root = os.fsencode(self.root)
+        path = os.path.join(directory, f"{_root_slug(self.root)}-{int(self.created * 1000)}.snap")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(root), len(self), self.created, len(self._names_blob)))
+            f.write(root)
+            for name, code in COLUMNS:
+                column = self.columns[name]
+                if numpy is not None and isinstance(column, numpy.ndarray):
+                    f.write(column.astype(_NUMPY_TYPES[code], copy=False).tobytes())
+                    continue
+                if sys.byteorder != "little":
+                    column = array.array(code, column)
+                    column.byteswap()
+                column.tofile(f)
+            f.write(self._names_blob)
+        os.replace(tmp_path, path)
+        prune(self.root, directory)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, root_len, count, created, names_len = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a System Maid snapshot")
+        offset = _HEADER.size
+        root = os.fsdecode(mm[offset:offset + root_len])
+        offset += root_len
+        columns = {}
+        for name, code in COLUMNS:
+            size = array.array(code).itemsize * count
+            if numpy is not None:
+                columns[name] = numpy.frombuffer(mm, dtype=_NUMPY_TYPES[code], count=count, offset=offset)
+            else:
+                column = array.array(code)
+                column.frombytes(mm[offset:offset + size])
+                if sys.byteorder != "little":
+                    column.byteswap()
+                columns[name] = column
+            offset += size
+        names_blob = mm[offset:offset + names_len]
+        if numpy is None:
+            # Sütunlar kopyalandı; eşleme artık gerekmez
+            mm.close()
+        return cls(root, created, columns, names_blob)
+
+    def path(self, index):
+        # Tam yol yalnızca gerektiğinde, üst dizin zinciri izlenerek kurulur
+        if self._names is None:
+            self._names = zlib.decompress(self._names_blob).split(b"\0")
+        parts = []
+        parents = self.columns["parents"]
+        while index > 0:
+            parts.append(self._names[index])
+            index = int(parents[index])
+        return os.path.join(self.root, *(os.fsdecode(part) for part in reversed(parts)))
+
+    def own_bytes(self):
+        """Dizinlerin alt dizinleri hariç kendi boyutu: toplamdan çocukların toplamı çıkarılır."""
+        totals = self.columns["bytes"]
+        parents = self.columns["parents"]
+        if numpy is not None:
+            totals = numpy.asarray(totals, dtype="<i8")
+            parents = numpy.asarray(parents, dtype="<i4")
+            children = numpy.zeros(len(totals), dtype="<i8")
+            numpy.add.at(children, parents[1:], totals[1:])
+            return totals - children
+        own = array.array("q", totals)
+        for index in range(1, len(own)):
+            own[parents[index]] -= totals[index]
+        return own
+
+
+def list_snapshots(root, directory=SNAPSHOT_DIR):
+    """Köke ait anlık görüntü dosyaları, eskiden yeniye."""
+    prefix = _root_slug(os.path.normpath(root)) + "-"
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith(prefix) and name.endswith(".snap")]
+    except OSError:
+        return []
+    names.sort(key=lambda name: int(name[len(prefix):-len(".snap")]))
+    return [os.path.join(directory, name) for name in names]
+
+
+def prune(root, directory=SNAPSHOT_DIR, keep=KEEP_SNAPSHOTS):
+    for path in list_snapshots(root, directory)[:-keep]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def latest(root, directory=SNAPSHOT_DIR, before=None):
+    """Kökün en yeni (ya da before zamanından önceki en yeni) anlık görüntüsü."""
+    for path in reversed(list_snapshots(root, directory)):
+        try:
+            snapshot = Snapshot.load(path)
+        except (OSError, ValueError, struct.error):
+            continue
+        if before is None or snapshot.created < before:
+            return snapshot
+    return None
+
+
+def diff(old, new, top=50, by="total"):
+    """new görüntüsünde en çok büyüyen dizinler. by="total" alt ağaç toplamına,
+    by="own" dizinin doğrudan içindeki dosyalara bakar (büyümenin asıl kaynağı).
+    Eski görüntüde olmayan dizinlerin eski boyutu sıfır sayılır."""
+    if by == "own":
+        new_bytes, old_bytes_all = new.own_bytes(), old.own_bytes()
+    else:
+        new_bytes, old_bytes_all = new.columns["bytes"], old.columns["bytes"]
+    if numpy is not None:
+        new_keys = numpy.asarray(new.columns["keys"])
+        old_keys = numpy.asarray(old.columns["keys"])
+        new_bytes = numpy.asarray(new_bytes, dtype="<i8")
+        old_bytes_all = numpy.asarray(old_bytes_all, dtype="<i8")
+        # Eski anahtarlar sıralanır, yeni anahtarlar ikili aramayla eşleştirilir
+        order = numpy.argsort(old_keys, kind="stable")
+        sorted_keys = old_keys[order]
+        if len(sorted_keys):
+            positions = numpy.minimum(numpy.searchsorted(sorted_keys, new_keys), len(sorted_keys) - 1)
+            found = sorted_keys[positions] == new_keys
+            old_bytes = numpy.where(found, old_bytes_all[order[positions]], 0)
+        else:
+            old_bytes = numpy.zeros(len(new_keys), dtype="<i8")
+        grown = new_bytes - old_bytes
+        count = min(top, len(grown))
+        if not count:
+            return []
+        candidates = numpy.argpartition(-grown, count - 1)[:count]
+        ranked = candidates[numpy.argsort(-grown[candidates], kind="stable")]
+        return [Growth(new.path(int(i)), int(grown[i]), int(new_bytes[i]), int(old_bytes[i]))
+                for i in ranked if grown[i] > 0]
+    old_index = dict(zip(old.columns["keys"], old_bytes_all))
+    grown = [(size - old_index.get(key, 0), index)
+             for index, (key, size) in enumerate(zip(new.columns["keys"], new_bytes))]
+    return [Growth(new.path(index), delta, new_bytes[index], new_bytes[index] - delta)
+            for delta, index in heapq.nlargest(top, grown) if delta > 0]
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import ctypes
+import ctypes.util
+import os
+from collections import namedtuple
+
+from maid_engine import mounts
+
+SYS_DEV_BLOCK = "/sys/dev/block"
+
+# <linux/falloc.h>
+FALLOC_FL_KEEP_SIZE = 0x01
+FALLOC_FL_PUNCH_HOLE = 0x02
+
+DeviceInfo = namedtuple("DeviceInfo", ["name", "rotational", "discard"])
+
+# Güvenli silme stratejisi: kaç rastgele geçiş, sıfır geçişi ve silmeden önce delik açma (discard)
+Strategy = namedtuple("Strategy", ["name", "passes", "zero", "punch_hole"])
+
+_device_cache = {}
+_mount_table = None
+
+
+def _read_sys(path, default=None):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _block_device_of(path, st_dev):
+    # btrfs gibi dosya sistemleri st_dev olarak anonim (0:xx) aygıt numarası verir;
+    # bu durumda bağlama tablosundaki kaynak aygıt kullanılır
+    global _mount_table
+    if os.major(st_dev) != 0:
+        return os.major(st_dev), os.minor(st_dev)
+    if path is None:
+        return None
+    if _mount_table is None:
+        _mount_table = mounts.MountTable()
+    mount = _mount_table.find(path)
+    if mount is None or not mount.source.startswith("/dev/"):
+        return None
+    try:
+        rdev = os.stat(mount.source).st_rdev
+    except OSError:
+        return None
+    return os.major(rdev), os.minor(rdev)
+
+
+def device_info(st_dev, path=None):
+    """Dosyanın bulunduğu blok aygıtının dönen disk (HDD) olup olmadığını ve
+    discard (TRIM) desteğini /sys/block/*/queue altından okur."""
+    if st_dev in _device_cache:
+        return _device_cache[st_dev]
+    info = None
+    numbers = _block_device_of(path, st_dev)
+    if numbers is not None:
+        sys_path = os.path.realpath(os.path.join(SYS_DEV_BLOCK, "%d:%d" % numbers))
+        # Bölümlerin kendi queue dizini yoktur, bilgiler üstteki diskten okunur
+        if os.path.exists(os.path.join(sys_path, "partition")):
+            sys_path = os.path.dirname(sys_path)
+        rotational = _read_sys(os.path.join(sys_path, "queue", "rotational"))
+        if rotational is not None:
+            discard_max = _read_sys(os.path.join(sys_path, "queue", "discard_max_bytes"), "0")
+            info = DeviceInfo(os.path.basename(sys_path), rotational == "1", discard_max not in ("", "0"))
+    _device_cache[st_dev] = info
+    return info
+
+
+def erase_strategy(info, passes, zero, policy="auto"):
+    """HDD'lerde tam geçişli ezme; SSD'lerde tek geçiş, destekleniyorsa ardından discard.
+    Flash bellekte ek geçişler silmeyi garanti etmez, yalnızca yazma ömrünü tüketir."""
+    if policy == "overwrite" or info is None or info.rotational:
+        label = "multi-pass overwrite" if passes > 1 or zero else "overwrite"
+        return Strategy(label, passes, zero, False)
+    if info.discard:
+        return Strategy("single overwrite + discard", 1, False, True)
+    return Strategy("single overwrite", 1, False, False)
+
+
+_libc = None
+
+
+def punch_hole(fd, length):
+    """Dosyanın bloklarını serbest bırakır; discard ile bağlanmış dosya sistemlerinde
+    bloklar SSD'ye hemen TRIM olarak iletilir."""
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        _libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    if _libc.fallocate(fd, FALLOC_FL_PUNCH_HOLE | FALLOC_FL_KEEP_SIZE, 0, length) != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
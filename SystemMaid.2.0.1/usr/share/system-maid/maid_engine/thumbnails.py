@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import errno
+import hashlib
+import os
+import struct
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from maid_engine import deleter, mounts, scanner
+
+THUMBNAILS_DIR = os.path.join(os.path.expanduser("~"), ".cache", "thumbnails")
+
+# freedesktop.org thumbnail spesifikasyonundaki boyut klasörleri ve başarısız önizlemeler
+SIZE_DIRS = ("normal", "large", "x-large", "xx-large", "fail")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHUNK_HEADER = struct.Struct(">I4s")
+
+# Önizlemeler iş parçacıklarına tek tek değil, bu boyuttaki gruplar halinde dağıtılır
+CHUNK_SIZE = 256
+
+_ORPHAN = object()
+
+
+def read_png_text(path, wanted=None):
+    """PNG dosyasının tEXt parçalarını okur; görüntü verisine (IDAT) gelindiğinde durur,
+    böylece dosyanın yalnızca ilk birkaç yüz baytı okunur."""
+    texts = {}
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return texts
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, kind = _CHUNK_HEADER.unpack(header)
+            if kind in (b"IDAT", b"IEND"):
+                break
+            if kind == b"tEXt":
+                data = f.read(length)
+                f.seek(4, os.SEEK_CUR)
+                key, _, value = data.partition(b"\0")
+                key = key.decode("latin-1")
+                if wanted is None or key in wanted:
+                    texts[key] = value.decode("latin-1")
+                    if wanted is not None and len(texts) == len(wanted):
+                        break
+            else:
+                f.seek(length + 4, os.SEEK_CUR)
+    return texts
+
+
+def _thumb_mtime(path, st):
+    try:
+        return float(read_png_text(path, {"Thumb::MTime"})["Thumb::MTime"])
+    except (OSError, KeyError, ValueError):
+        return st.st_mtime
+
+
+def list_thumbnails(root=THUMBNAILS_DIR):
+    """(yol, stat) çiftlerini üretir; fail/<uygulama>/ alt klasörleri de dahildir."""
+    for size_dir in SIZE_DIRS:
+        top = os.path.join(root, size_dir)
+        if not os.path.isdir(top):
+            continue
+        for _path, entries in scanner.walk(top):
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat(follow_symlinks=False)
+                except OSError:
+                    pass
+
+
+def _remove(victims, eraser=None):
+    # victims: (yol, stat) çiftleri; eraser verilirse dosyalar önce ezilir
+    stats = deleter.DeleteStats()
+    if eraser is not None:
+        erased = eraser.erase_files([path for path, _st in victims])
+        # Yalnızca gerçekten silinen önizlemeler sayılır; ezilemeyen ya da
+        # silinemeyen dosyalar yerinde kalır ve boşalan alana eklenmez
+        for path, st in victims:
+            if not os.path.lexists(path):
+                stats.add_file(st)
+        stats.errors = erased.errors
+        stats.error_count = erased.error_count
+        return stats
+    for path, st in victims:
+        try:
+            os.unlink(path)
+            stats.add_file(st)
+        except OSError as e:
+            stats.add_error(path, e)
+    return stats
+
+
+def evict_to_budget(budget_bytes, order="atime", root=THUMBNAILS_DIR, eraser=None):
+    """Önbelleği budget_bytes altına indirene kadar en uzun süredir kullanılmayan
+    önizlemeleri siler. order="atime" son erişim zamanına (relatime ile günde bir
+    güncellenir), order="thumb_mtime" PNG içindeki Thumb::MTime değerine göre sıralar.
+    Dönen değer (silme istatistiği, önbelleğin kalan boyutu) çiftidir."""
+    items = []
+    total = 0
+    for path, st in list_thumbnails(root):
+        size = st.st_blocks * 512
+        total += size
+        if order == "thumb_mtime":
+            last_used = _thumb_mtime(path, st)
+        else:
+            # atime hiç güncellenmiyorsa (noatime) en azından oluşturulma zamanı kullanılır
+            last_used = max(st.st_atime, st.st_mtime)
+        items.append((last_used, size, path, st))
+
+    if total <= budget_bytes:
+        return deleter.DeleteStats(), total
+
+    items.sort(key=lambda item: item[0])
+    victims = []
+    for _last_used, size, path, st in items:
+        if total <= budget_bytes:
+            break
+        victims.append((path, st))
+        total -= size
+
+    return _remove(victims, eraser), total
+
+
+def _source_of(item):
+    # Önizlemenin ait olduğu özgün dosyanın yolu; dosya adı URI'nin MD5 özeti olmalıdır.
+    # Dönen değer: yerel yol, _ORPHAN (ad URI ile uyuşmuyor ya da URI yok) veya None (denetlenemez)
+    path, _st = item
+    try:
+        uri = read_png_text(path, {"Thumb::URI"}).get("Thumb::URI")
+    except OSError:
+        return None
+    if not uri:
+        return _ORPHAN
+    name = os.path.basename(path)
+    if name != hashlib.md5(uri.encode("latin-1")).hexdigest() + ".png":
+        # Bu ada hiçbir URI'den ulaşılamaz; önizleme bir daha kullanılmayacak
+        return _ORPHAN
+    parts = urlsplit(uri)
+    if parts.scheme != "file" or parts.netloc not in ("", "localhost"):
+        # smb://, mtp://, trash:// gibi adreslerin varlığı buradan denetlenemez
+        return None
+    return os.fsdecode(unquote_to_bytes(parts.path))
+
+
+def _sources_of(chunk):
+    return [(item, _source_of(item)) for item in chunk]
+
+
+def _existing_names(parent, missing):
+    # Aynı dizindeki tüm özgün dosyalar tek bir listdir çağrısıyla denetlenir.
+    # None: dizin okunamadı ya da takılı olmayan bir diskte, içindekiler hakkında karar verilmez.
+    # Kayıp dizinler için son kullanılanlar temizliğiyle aynı kural (mounts.MissingTargets) geçerlidir
+    try:
+        return parent, set(os.listdir(parent))
+    except OSError as e:
+        if e.errno == errno.ENOTDIR or (e.errno == errno.ENOENT and missing.parent_gone(parent)):
+            return parent, set()
+        return parent, None
+
+
+def find_orphans(root=THUMBNAILS_DIR, workers=None):
+    """Özgün dosyası artık bulunmayan önizlemelerin (yol, stat) listesini döndürür.
+    PNG başlıkları iş parçacığı havuzunda okunur; varlık denetimi her üst dizin için
+    bir kez yapılır."""
+    workers = workers or scanner.default_workers()
+    items = list(list_thumbnails(root))
+    chunks = [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+    orphans = []
+    by_parent = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-thumbs") as pool:
+        for results in pool.map(_sources_of, chunks):
+            for item, source in results:
+                if source is _ORPHAN:
+                    orphans.append(item)
+                elif source is not None:
+                    parent, name = os.path.split(source)
+                    by_parent[parent].append((name, item))
+        missing = mounts.MissingTargets()
+        for parent, names in pool.map(lambda parent: _existing_names(parent, missing), list(by_parent)):
+            if names is None:
+                continue
+            orphans.extend(item for name, item in by_parent[parent] if name not in names)
+    return orphans
+
+
+def remove_orphans(root=THUMBNAILS_DIR, eraser=None, workers=None):
+    """Yalnızca yetim önizlemeleri siler; diğerleri önbellekte kalır."""
+    return _remove(find_orphans(root, workers), eraser)
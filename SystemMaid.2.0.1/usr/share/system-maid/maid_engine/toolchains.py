@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import binascii
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import deleter, exclusions, mounts, scanner, settings
+
+HOME = os.path.expanduser("~")
+
+# Kilit dosyası aranırken ayrıca girilmeyen derleme çıktısı dizinleri
+LOCKFILE_SKIP_NAMES = ["target", "build", "dist", ".gradle", ".cargo", ".npm", ".m2"]
+
+# Önbellekteki silinebilir birim: bir dosya ya da bütün olarak silinen bir dizin (ör. modül sürümü)
+Unit = namedtuple("Unit", ["path", "bytes", "last_used", "is_dir"])
+
+# Bir aracın önbellek kullanımı; protected, yaşı dolduğu halde kilit dosyalarında geçtiği için korunan alandır
+ToolUsage = namedtuple("ToolUsage", ["name", "bytes", "units", "reclaimable", "reclaimable_units",
+                                     "protected", "label", "root"])
+
+
+def _env_dir(variable, default):
+    return os.environ.get(variable) or default
+
+
+def _last_used(st):
+    # relatime ile atime günde bir güncellenir; noatime bağlamalarda mtime kullanılır
+    return max(st.st_atime, st.st_mtime)
+
+
+def _measure(path):
+    """Birimin ayrılmış boyutu ve en son kullanılan dosyasının zamanı."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path) or os.path.islink(path):
+        return Unit(path, st.st_blocks * 512, _last_used(st), False)
+    total = 0
+    # Dizinlerin atime değeri bu taramanın kendisiyle güncellenir; yalnızca dosyalara bakılır
+    last_used = st.st_mtime
+    for _dir, entries in scanner.walk(path, workers=1):
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            total += st.st_blocks * 512
+            last_used = max(last_used, _last_used(st))
+    return Unit(path, total, last_used, True)
+
+
+def _files_under(root):
+    for _dir, entries in scanner.walk(root, workers=1):
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    yield entry.path
+            except OSError:
+                continue
+
+
+def _entries(path):
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def _subdirs_at_depth(root, depth):
+    # root/<1>/<2>/.../<depth> biçimindeki dizinler
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for path in level:
+            for entry in _entries(path):
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        next_level.append(entry.path)
+                except OSError:
+                    continue
+        level = next_level
+    return level
+
+
+# --- Araçların önbellek düzenleri ---
+# Her araç: units(kök) silinebilir birimlerin yollarını, keys(kök, yol) ise birimin
+# kilit dosyalarındaki karşılıklarını ("ad alanı", anahtar) verir.
+
+def _pip_key(name, version):
+    # Tekerlek (wheel) dosya adlarında ad küçük harfe ve alt çizgiye indirgenir (PEP 427/503)
+    return ("pip", re.sub(r"[-_.]+", "_", name).lower() + "-" + version)
+
+
+def _pip_units(root):
+    return _files_under(root)
+
+
+def _pip_keys(root, path):
+    name = os.path.basename(path)
+    if not name.endswith(".whl"):
+        return ()
+    parts = name.split("-")
+    return (_pip_key(parts[0], parts[1]),) if len(parts) >= 5 else ()
+
+
+def _integrity_key(algorithm, digest):
+    return ("npm", f"{algorithm}-{digest.hex()}")
+
+
+def _npm_units(root):
+    for sub in ("content-v2", "index-v5"):
+        yield from _files_under(os.path.join(root, sub))
+
+
+def _npm_keys(root, path):
+    relative = os.path.relpath(path, root).split(os.sep)
+    if relative[0] == "content-v2" and len(relative) >= 3:
+        # content-v2/<algoritma>/<ilk 2>/<sonraki 2>/<kalan onaltılık özet>
+        try:
+            return (_integrity_key(relative[1], bytes.fromhex("".join(relative[2:]))),)
+        except ValueError:
+            return ()
+    # Dizin (index) kovası: her satır "<sha1>\t<json>" ve JSON içinde integrity alanı
+    keys = []
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                _hash, _, data = line.partition("\t")
+                try:
+                    integrity = json.loads(data).get("integrity") or ""
+                except (ValueError, AttributeError):
+                    continue
+                keys.extend(_parse_integrity(integrity))
+    except OSError:
+        pass
+    return keys
+
+
+def _cargo_units(root):
+    registry = os.path.join(root, "registry")
+    for cache in _subdirs_at_depth(os.path.join(registry, "cache"), 1):
+        for entry in _entries(cache):
+            yield entry.path
+    # Açılmış kaynaklar ve git bağımlılıkları dizin olarak silinir
+    yield from _subdirs_at_depth(os.path.join(registry, "src"), 2)
+    yield from _subdirs_at_depth(os.path.join(root, "git", "checkouts"), 2)
+    yield from _subdirs_at_depth(os.path.join(root, "git", "db"), 1)
+
+
+def _cargo_keys(root, path):
+    name = os.path.basename(path)
+    if name.endswith(".crate"):
+        name = name[:-len(".crate")]
+    if os.path.relpath(path, root).startswith("git"):
+        return ()
+    return (("cargo", name),)
+
+
+def _go_escape(module_path):
+    # Modül önbelleğinde büyük harfler "!" ve küçük harf olarak saklanır
+    return re.sub(r"[A-Z]", lambda m: "!" + m.group(0).lower(), module_path)
+
+
+def _go_units(root):
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        for entry in _entries(path):
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if path == root and entry.name == "cache":
+                continue
+            if "@" in entry.name:
+                yield entry.path
+            else:
+                stack.append(entry.path)
+    # İndirilmiş zip/mod/info dosyaları: cache/download/<modül>/@v/<sürüm>.<uzantı>
+    for path in _files_under(os.path.join(root, "cache", "download")):
+        if os.path.basename(os.path.dirname(path)) == "@v":
+            yield path
+
+
+def _go_keys(root, path):
+    relative = os.path.relpath(path, root)
+    if relative.startswith("cache" + os.sep):
+        module = os.path.dirname(os.path.dirname(os.path.relpath(path, os.path.join(root, "cache", "download"))))
+        version = os.path.splitext(os.path.basename(path))[0]
+        if version == "list":
+            return ()
+        return (("go", f"{module}@{version}"),)
+    return (("go", relative),)
+
+
+def _gradle_units(root):
+    yield from _subdirs_at_depth(os.path.join(root, "modules-2", "files-2.1"), 3)
+    yield from _files_under(os.path.join(root, "build-cache-1"))
+
+
+def _gradle_keys(root, path):
+    relative = os.path.relpath(path, os.path.join(root, "modules-2", "files-2.1")).split(os.sep)
+    if len(relative) != 3 or relative[0] == "..":
+        return ()
+    return (("maven", ":".join(relative)),)
+
+
+def _maven_units(root):
+    # <grup yolu>/<artifact>/<sürüm>/<artifact>-<sürüm>[.pom|.jar|-sınıflandırıcı...]
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        entries = _entries(path)
+        prefix = f"{os.path.basename(os.path.dirname(path))}-{os.path.basename(path)}"
+        if path != root and any(entry.name.startswith(prefix) for entry in entries):
+            yield path
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+            except OSError:
+                continue
+
+
+def _maven_keys(root, path):
+    relative = os.path.relpath(path, root).split(os.sep)
+    if len(relative) < 3:
+        return ()
+    return (("maven", f"{'.'.join(relative[:-2])}:{relative[-2]}:{relative[-1]}"),)
+
+
+Tool = namedtuple("Tool", ["name", "label", "root", "units", "keys"])
+
+TOOLS = [
+    Tool("pip", "pip", lambda: _env_dir("PIP_CACHE_DIR", os.path.join(HOME, ".cache", "pip")), _pip_units, _pip_keys),
+    Tool("npm", "npm", lambda: os.path.join(_env_dir("npm_config_cache", os.path.join(HOME, ".npm")), "_cacache"),
+         _npm_units, _npm_keys),
+    Tool("cargo", "Cargo", lambda: _env_dir("CARGO_HOME", os.path.join(HOME, ".cargo")), _cargo_units, _cargo_keys),
+    Tool("go", "Go modules", lambda: _env_dir("GOMODCACHE", os.path.join(
+        (_env_dir("GOPATH", os.path.join(HOME, "go")).split(os.pathsep)[0]), "pkg", "mod")), _go_units, _go_keys),
+    Tool("gradle", "Gradle", lambda: os.path.join(_env_dir("GRADLE_USER_HOME", os.path.join(HOME, ".gradle")), "caches"),
+         _gradle_units, _gradle_keys),
+    Tool("maven", "Maven", lambda: os.path.join(HOME, ".m2", "repository"), _maven_units, _maven_keys),
+]
+TOOLS_BY_NAME = {tool.name: tool for tool in TOOLS}
+
+
+# --- Kilit dosyaları ---
+
+_INTEGRITY = re.compile(r"\b(sha1|sha256|sha384|sha512)-([A-Za-z0-9+/]+={0,2})")
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*===?\s*([^\s;#,]+)", re.MULTILINE)
+_TOML_NAME = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+_TOML_VERSION = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+_POM_DEPENDENCY = re.compile(r"<dependency>(.*?)</dependency>", re.DOTALL)
+
+
+def _parse_integrity(text):
+    keys = []
+    for algorithm, encoded in _INTEGRITY.findall(text):
+        try:
+            keys.append(_integrity_key(algorithm, base64.b64decode(encoded, validate=True)))
+        except (binascii.Error, ValueError):
+            continue
+    return keys
+
+
+def _toml_packages(text):
+    # Cargo.lock, poetry.lock ve uv.lock: her [[package]] bloğunda name ve version
+    for block in text.split("[[package]]")[1:]:
+        name = _TOML_NAME.search(block)
+        version = _TOML_VERSION.search(block)
+        if name and version:
+            yield name.group(1), version.group(1)
+
+
+def _parse_pip(name, text):
+    if name == "Pipfile.lock":
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return []
+        return [_pip_key(package, info["version"].lstrip("="))
+                for section in ("default", "develop") for package, info in (data.get(section) or {}).items()
+                if isinstance(info, dict) and isinstance(info.get("version"), str)]
+    if name.endswith(".txt"):
+        return [_pip_key(package, version) for package, version in _REQUIREMENT.findall(text)]
+    return [_pip_key(package, version) for package, version in _toml_packages(text)]
+
+
+def _parse_cargo(name, text):
+    return [("cargo", f"{package}-{version}") for package, version in _toml_packages(text)]
+
+
+def _parse_go(name, text):
+    keys = []
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 3:
+            version = fields[1].removesuffix("/go.mod")
+            keys.append(("go", f"{_go_escape(fields[0])}@{_go_escape(version)}"))
+    return keys
+
+
+def _parse_npm(name, text):
+    return _parse_integrity(text)
+
+
+def _parse_gradle(name, text):
+    keys = []
+    for line in text.splitlines():
+        coordinate = line.partition("=")[0].strip()
+        if coordinate.count(":") == 2 and not coordinate.startswith("#"):
+            keys.append(("maven", coordinate))
+    return keys
+
+
+def _parse_pom(name, text):
+    keys = []
+    for block in _POM_DEPENDENCY.findall(text):
+        fields = {}
+        for field in ("groupId", "artifactId", "version"):
+            match = re.search(f"<{field}>\\s*([^<\\s]+)\\s*</{field}>", block)
+            if match:
+                fields[field] = match.group(1)
+        # Özellikle (${...}) verilen sürümler çözülemez
+        if len(fields) == 3 and "${" not in fields["version"]:
+            keys.append(("maven", f"{fields['groupId']}:{fields['artifactId']}:{fields['version']}"))
+    return keys
+
+
+LOCKFILE_PARSERS = {
+    "poetry.lock": _parse_pip,
+    "uv.lock": _parse_pip,
+    "pdm.lock": _parse_pip,
+    "Pipfile.lock": _parse_pip,
+    "package-lock.json": _parse_npm,
+    "npm-shrinkwrap.json": _parse_npm,
+    "yarn.lock": _parse_npm,
+    "pnpm-lock.yaml": _parse_npm,
+    "Cargo.lock": _parse_cargo,
+    "go.sum": _parse_go,
+    "gradle.lockfile": _parse_gradle,
+    "pom.xml": _parse_pom,
+}
+
+
+def _parser_for(name):
+    parser = LOCKFILE_PARSERS.get(name)
+    if parser is not None:
+        return parser
+    if name.endswith(".txt") and (name.startswith("requirements") or name.startswith("constraints")):
+        return _parse_pip
+    if name.endswith(".lockfile"):
+        # Gradle'ın eski düzeni: gradle/dependency-locks/<yapılandırma>.lockfile
+        return _parse_gradle
+    return None
+
+
+def lockfile_references(roots=None):
+    """Proje köklerindeki kilit dosyalarında geçen paketler: {("ad alanı", anahtar)}."""
+    config = settings.load()
+    if roots is None:
+        roots = config["toolchain_project_roots"]
+    exclude = exclusions.ExclusionSet(config["scan_exclude_paths"],
+                                      config["scan_exclude_names"] + LOCKFILE_SKIP_NAMES,
+                                      mounts.MountTable(allowed=config["scan_allowed_mounts"]))
+    references = set()
+    for root in roots:
+        root = os.path.expanduser(root)
+        if not os.path.isdir(root):
+            continue
+        for _path, entries in scanner.walk(root, exclude=exclude):
+            for entry in entries:
+                parser = _parser_for(entry.name)
+                if parser is None:
+                    continue
+                try:
+                    with open(entry.path, encoding="utf-8", errors="replace") as f:
+                        references.update(parser(entry.name, f.read()))
+                except OSError:
+                    continue
+    return references
+
+
+# --- Ölçme ve temizleme ---
+
+def _units_of(tool):
+    root = tool.root()
+    if not os.path.isdir(root):
+        return root, []
+    units = []
+    for path in tool.units(root):
+        unit = _measure(path)
+        if unit is not None and unit.bytes:
+            units.append(unit)
+    return root, units
+
+
+def _select(tool, root, units, references, max_age_days, now):
+    # Yaşı dolan birimler; kilit dosyalarında geçenler ayrıca döndürülür
+    cutoff = now - max_age_days * 86400
+    chosen = []
+    protected = []
+    for unit in units:
+        if unit.last_used >= cutoff:
+            continue
+        if any(key in references for key in tool.keys(root, unit.path)):
+            protected.append(unit)
+        else:
+            chosen.append(unit)
+    return chosen, protected
+
+
+def _scan(names, max_age_days, roots, workers):
+    tools = [TOOLS_BY_NAME[name] for name in names]
+    workers = workers or min(len(tools) + 1, scanner.default_workers())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maid-toolchain") as pool:
+        # Kilit dosyaları önbellekler ölçülürken aynı anda okunur
+        references = pool.submit(lockfile_references, roots)
+        measured = list(pool.map(_units_of, tools))
+        references = references.result()
+    now = time.time()
+    for tool, (root, units) in zip(tools, measured):
+        chosen, protected = _select(tool, root, units, references, max_age_days, now)
+        yield tool, root, units, chosen, protected
+
+
+def account(names=None, max_age_days=None, roots=None, workers=None):
+    """Araç önbelleklerini paralel ölçer; her araç için ToolUsage döndürür."""
+    if max_age_days is None:
+        max_age_days = settings.load()["toolchain_max_age_days"]
+    usages = []
+    for tool, root, units, chosen, protected in _scan(names or list(TOOLS_BY_NAME), max_age_days, roots, workers):
+        usages.append(ToolUsage(
+            tool.name, sum(unit.bytes for unit in units), len(units), sum(unit.bytes for unit in chosen),
+            len(chosen), sum(unit.bytes for unit in protected), tool.label, root))
+    return usages
+
+
+def clean(names, max_age_days=None, roots=None, workers=None):
+    """Seçilen araçların yaşı dolmuş ve hiçbir kilit dosyasında geçmeyen birimlerini siler.
+    Dönen değer: [(araç, silme istatistiği, korunan bayt)]."""
+    if max_age_days is None:
+        max_age_days = settings.load()["toolchain_max_age_days"]
+    results = []
+    for tool, _root, _units, chosen, protected in _scan(names, max_age_days, roots, workers):
+        stats = deleter.remove_files([unit.path for unit in chosen if not unit.is_dir])
+        for unit in chosen:
+            if unit.is_dir:
+                deleter.remove_path(unit.path, stats)
+        results.append((tool, stats, sum(unit.bytes for unit in protected)))
+    return results
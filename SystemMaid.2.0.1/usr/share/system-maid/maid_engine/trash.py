@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from maid_engine import deleter, mounts, scanner, settings
+
+HOME_TRASH = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "Trash")
+
+# Çöp kutusundaki tek bir öğe: files/ altındaki girdi ve ona ait .trashinfo dosyası.
+# deleted: silinme zamanı (epoch); bilgi dosyası yoksa ya da bozuksa None
+TrashItem = namedtuple("TrashItem", ["trash", "name", "file_path", "info_path", "deleted", "size"])
+
+# Bir çöp kutusu dizini ve bulunduğu aygıt
+TrashDir = namedtuple("TrashDir", ["top", "device"])
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _trash_dir(top):
+    try:
+        st = os.lstat(top)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    return TrashDir(top, st.st_dev)
+
+
+def _valid_shared_trash(path):
+    # Spesifikasyona göre $topdir/.Trash yapışkan (sticky) bir dizin olmalı ve
+    # sembolik bağlantı olmamalıdır; aksi halde güvenilmez
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and bool(st.st_mode & stat.S_ISVTX)
+
+
+def discover(mount_table=None):
+    """Ev dizinindeki çöp kutusunu ve yerel bağlama noktalarındaki
+    .Trash/$UID ile .Trash-$UID dizinlerini bulur."""
+    uid = os.getuid()
+    mount_table = mount_table or mounts.MountTable()
+    found = []
+    seen = set()
+
+    def add(top):
+        trash = _trash_dir(top)
+        if trash is None:
+            return
+        # Bind bağlamalar aynı çöp kutusunu birden fazla yoldan gösterebilir
+        key = (trash.device, os.lstat(top).st_ino)
+        if key not in seen:
+            seen.add(key)
+            found.append(trash)
+
+    add(HOME_TRASH)
+    for mount in mount_table.of_kind("local"):
+        shared = os.path.join(mount.mountpoint, ".Trash")
+        if _valid_shared_trash(shared):
+            add(os.path.join(shared, str(uid)))
+        add(os.path.join(mount.mountpoint, f".Trash-{uid}"))
+    return found
+
+
+def _parse_info(path):
+    # [Trash Info] bölümündeki DeletionDate=YYYY-MM-DDThh:mm:ss (yerel saat) satırı
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("DeletionDate="):
+                    value = line.partition("=")[2].strip()
+                    return time.mktime(time.strptime(value[:19], DATE_FORMAT))
+    except (OSError, ValueError, OverflowError):
+        pass
+    return None
+
+
+def _sizes(files_dir, workers=None):
+    # files/ altındaki ağaç tek geçişte dolaşılır; bloklar üst düzey öğelere toplanır
+    sizes = {}
+    prefix_len = len(files_dir) + 1
+    for path, entries in scanner.walk(files_dir, workers=workers):
+        top_name = path[prefix_len:].split(os.sep, 1)[0] if len(path) > len(files_dir) else None
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            name = top_name or entry.name
+            sizes[name] = sizes.get(name, 0) + st.st_blocks * 512
+    return sizes
+
+
+def list_items(trash, workers=None):
+    """Çöp kutusunun öğelerini silinme zamanı ve diskteki boyutlarıyla döndürür.
+    Bilgi dosyası olmayan öğeler ile karşılığı olmayan bilgi dosyaları da listelenir."""
+    files_dir = os.path.join(trash.top, "files")
+    info_dir = os.path.join(trash.top, "info")
+    sizes = _sizes(files_dir, workers) if os.path.isdir(files_dir) else {}
+    items = []
+    try:
+        with os.scandir(info_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".trashinfo"):
+                    continue
+                name = entry.name[:-len(".trashinfo")]
+                file_path = os.path.join(files_dir, name)
+                size = sizes.pop(name, 0)
+                try:
+                    size += entry.stat(follow_symlinks=False).st_blocks * 512
+                except OSError:
+                    pass
+                items.append(TrashItem(trash, name, file_path, entry.path, _parse_info(entry.path), size))
+    except OSError:
+        pass
+    for name, size in sizes.items():
+        items.append(TrashItem(trash, name, os.path.join(files_dir, name), None, None, size))
+    return items
+
+
+def select(items, max_age_days=0, quota_bytes=0, now=None):
+    """Silinecek öğeleri seçer: max_age_days günden eski olanlar, ardından toplam
+    boyut quota_bytes altına inene kadar en eski öğeler. İkisi de 0 ise tümü.
+    Silinme zamanı bilinmeyen öğeler en eski sayılır."""
+    if not max_age_days and not quota_bytes:
+        return list(items)
+    now = time.time() if now is None else now
+    ordered = sorted(items, key=lambda item: item.deleted or 0)
+    chosen = []
+    kept = []
+    cutoff = now - max_age_days * 86400
+    for item in ordered:
+        if max_age_days and (item.deleted is None or item.deleted < cutoff):
+            chosen.append(item)
+        else:
+            kept.append(item)
+    if quota_bytes:
+        total = sum(item.size for item in kept)
+        for item in kept:
+            if total <= quota_bytes:
+                break
+            chosen.append(item)
+            total -= item.size
+    return chosen
+
+
+def selected_items(config=None, home_items=None):
+    """Ayarlardaki yaş ve kota sınırlarına göre silinecek öğeleri döndürür.
+    home_items verilirse (canlı izleyicinin listesi) ev dizinindeki çöp kutusu okunmaz."""
+    config = config or settings.load()
+    if config["trash_include_mounts"]:
+        trashes = discover()
+    else:
+        trashes = [trash for trash in [_trash_dir(HOME_TRASH)] if trash is not None]
+    items = []
+    for trash in trashes:
+        if home_items is not None and trash.top == HOME_TRASH:
+            items.extend(home_items)
+        else:
+            items.extend(list_items(trash))
+    return select(items, config["trash_max_age_days"], config["trash_quota_mb"] * 1024 * 1024)
+
+
+class PurgeStats(deleter.DeleteStats):
+    """Çöp boşaltma sonucu; güvenli silmede ezilemediği için çöpte bırakılan öğeler de sayılır."""
+
+    def __init__(self):
+        super().__init__()
+        self.kept_items = 0
+
+    def merge(self, other):
+        super().merge(other)
+        self.kept_items += getattr(other, "kept_items", 0)
+
+
+def _purge_device(items, eraser):
+    stats = PurgeStats()
+    if eraser is not None:
+        files = {}
+        for item in items:
+            if os.path.isdir(item.file_path) and not os.path.islink(item.file_path):
+                for _path, entries in scanner.walk(item.file_path, workers=1):
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            files[entry.path] = item
+            elif os.path.isfile(item.file_path) and not os.path.islink(item.file_path):
+                files[item.file_path] = item
+        erased = eraser.erase_files(list(files))
+        # Ezilen dosyalar eraser tarafından silinir; remove_path geriye kalan dizinleri ve bağlantıları siler
+        stats.files += erased.files
+        stats.bytes += erased.bytes
+        stats.error_count += erased.error_count
+        stats.errors.extend(erased.errors[:deleter.MAX_ERRORS])
+        # Bir dosyası bile ezilemeyen öğe düz silinmez; bilgi dosyasıyla birlikte çöpte kalır
+        kept = {id(files[path]) for path in erased.failed}
+        stats.kept_items = len(kept)
+        items = [item for item in items if id(item) not in kept]
+    for item in items:
+        # Önce dosya, sonra bilgi dosyası: yarıda kalırsa geriye yalnızca zararsız bir .trashinfo kalır
+        deleter.remove_path(item.file_path, stats)
+        if item.info_path is not None:
+            deleter.remove_path(item.info_path, stats)
+    return stats
+
+
+def purge(items, eraser=None):
+    """Seçilen öğeleri siler. Her aygıt bağımsız olduğu için aygıtlar paralel işlenir."""
+    by_device = {}
+    for item in items:
+        by_device.setdefault(item.trash.device, []).append(item)
+    total = PurgeStats()
+    if not by_device:
+        return total
+    with ThreadPoolExecutor(max_workers=len(by_device), thread_name_prefix="maid-trash") as pool:
+        for stats in pool.map(lambda group: _purge_device(group, eraser), list(by_device.values())):
+            total.merge(stats)
+    return total
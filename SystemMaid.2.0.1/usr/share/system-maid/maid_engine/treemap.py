@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import stat
+import time
+from collections import namedtuple
+
+from maid_engine import scanner, scanindex
+
+TREEMAP_FILE = os.path.join(scanindex.CACHE_DIR, "treemap.sqlite")
+
+# Şema değişirse eski boyut bilgileri kullanılmaz, tablo yeniden kurulur
+SCHEMA_VERSION = 2
+
+# Haritada bir dizin kutusu: is_dir False ise dizinin doğrudan içindeki dosyaların toplamıdır
+Tile = namedtuple("Tile", ["path", "name", "bytes", "files", "is_dir"])
+
+
+class _Fresh:
+    __slots__ = ("entries", "mtime_ns")
+
+    def __init__(self, entries, mtime_ns):
+        self.entries = entries
+        self.mtime_ns = mtime_ns
+
+
+class _Cached:
+    __slots__ = ("own_bytes", "own_files", "subdirs", "total_bytes", "total_files", "file_bytes", "file_files",
+                 "links")
+
+    def __init__(self, row):
+        (self.own_bytes, self.own_files, subdirs, self.total_bytes, self.total_files,
+         self.file_bytes, self.file_files, links) = row
+        self.subdirs = json.loads(subdirs)
+        self.links = [tuple(link) for link in json.loads(links)]
+
+
+class _Open:
+    # Dolaşımda alt ağacı henüz bitmemiş dizin
+    __slots__ = ("path", "node", "mtime_ns", "subdirs", "file_bytes", "file_files", "links",
+                 "own_bytes", "own_files", "total_bytes", "total_files")
+
+    def __init__(self, path, node, mtime_ns, subdirs, file_bytes, file_files, links, seen_links):
+        self.path = path
+        self.node = node
+        self.mtime_ns = mtime_ns
+        self.subdirs = subdirs
+        self.file_bytes = file_bytes
+        self.file_files = file_files
+        self.links = links
+        self.own_bytes = file_bytes
+        self.own_files = file_files
+        # usage.analyze gibi: sabit bağlantılı bir dosya dolaşımda ilk görüldüğü dizine yazılır
+        for dev, ino, size in links:
+            if (dev, ino) in seen_links:
+                continue
+            seen_links.add((dev, ino))
+            self.own_bytes += size
+            self.own_files += 1
+        self.total_bytes = self.own_bytes
+        self.total_files = self.own_files
+
+
+def _own_usage(entries):
+    # Dizinin doğrudan içindeki dosyaların ayrılmış blokları. Sabit bağlantılı dosyalar
+    # (aygıt, inode, boyut) olarak ayrıca döner; her inode usage.analyze'daki gibi
+    # tüm ağaçta bir kez sayılsın diye önbellekteki dizinler için de saklanırlar.
+    own_bytes = 0
+    own_files = 0
+    links = []
+    for entry in entries:
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        size = st.st_blocks * 512
+        if stat.S_ISDIR(st.st_mode):
+            own_bytes += size
+            continue
+        if st.st_nlink > 1:
+            links.append((st.st_dev, st.st_ino, size))
+            continue
+        own_bytes += size
+        own_files += 1
+    return own_bytes, own_files, links
+
+
+class SizeIndex:
+    """Dizin başına boyut toplamlarını SQLite'ta saklar. Yenilemede yalnızca mtime değeri
+    değişen dizinler okunur; diğerlerinin kendi boyutu ve alt dizin listesi indeksten gelir.
+    Harita açılırken ve alt dizinlere inilirken hiç tarama yapılmaz."""
+
+    def __init__(self, path=TREEMAP_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        # Arayüz okurken arka plandaki yenileme yazabilsin diye WAL kipi kullanılır
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS dirs")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # Yol anahtarları bayt olarak tutulur; UTF-8 olmayan dosya adları da sorunsuz saklanır
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path BLOB PRIMARY KEY, parent BLOB, mtime_ns INTEGER NOT NULL, "
+            "own_bytes INTEGER NOT NULL, own_files INTEGER NOT NULL, subdirs TEXT NOT NULL, "
+            "total_bytes INTEGER NOT NULL, total_files INTEGER NOT NULL, "
+            "file_bytes INTEGER NOT NULL, file_files INTEGER NOT NULL, links TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent)")
+        self.conn.commit()
+        self.stats = {"cached": 0, "rescanned": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self, root):
+        prefix = os.fsencode(root.rstrip("/")) + b"/"
+        rows = self.conn.execute(
+            "SELECT path, mtime_ns, own_bytes, own_files, subdirs, total_bytes, total_files, "
+            "file_bytes, file_files, links FROM dirs "
+            "WHERE path = ? OR (path >= ? AND path < ?)",
+            (prefix[:-1], prefix, prefix[:-1] + b"0"),
+        )
+        return {row[0]: (row[1], row[2:]) for row in rows}
+
+    def _forget_subtree(self, path):
+        prefix = os.fsencode(path) + b"/"
+        self.conn.execute(
+            "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+            (prefix[:-1], prefix, prefix[:-1] + b"0"),
+        )
+
+    def refresh(self, root, full=False, one_file_system=True, workers=None, progress=None):
+        """Ağacı dolaşır ve toplamları günceller. Dizin mtime değeri yalnızca girdi eklenip
+        silindiğinde değişir; var olan dosyaların büyümesi, dizinleri bir sonraki
+        değişiklikte ya da full=True ile yapılan yenilemede görülür."""
+        root = os.path.normpath(root)
+        known = self._load(root)
+        # Tam yenilemede indeks yalnızca silinen dizinleri ayıklamak için kullanılır
+        reusable = {} if full else known
+        root_dev = os.lstat(root).st_dev
+        racy_limit = time.time_ns() - scanindex.RACY_WINDOW_NS
+        self.stats = {"cached": 0, "rescanned": 0}
+        failed = []
+        seen_links = set()
+
+        def read(path):
+            try:
+                mtime_ns = os.stat(path, follow_symlinks=False).st_mtime_ns
+            except OSError as e:
+                return None, e
+            row = reusable.get(os.fsencode(path))
+            if row is not None and row[0] == mtime_ns:
+                return _Cached(row[1]), None
+            entries, error = scanner._read_dir(path)
+            if error is not None:
+                return None, error
+            return _Fresh(entries, mtime_ns), None
+
+        def children(path, node):
+            if isinstance(node, _Cached):
+                return [os.path.join(path, name) for name in node.subdirs]
+            subdirs = []
+            for entry in node.entries:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    # du -x gibi: başka dosya sistemlerine geçilmez
+                    if one_file_system and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                        continue
+                except OSError:
+                    continue
+                subdirs.append(entry.path)
+            return subdirs
+
+        def on_error(error):
+            if error.filename:
+                failed.append(os.fsdecode(error.filename))
+
+        pending_writes = 0
+        stack = []
+
+        def close_top():
+            nonlocal pending_writes
+            item = stack.pop()
+            if stack:
+                stack[-1].total_bytes += item.total_bytes
+                stack[-1].total_files += item.total_files
+            node = item.node
+            if (isinstance(node, _Cached) and node.total_bytes == item.total_bytes
+                    and node.total_files == item.total_files and node.own_bytes == item.own_bytes
+                    and node.own_files == item.own_files):
+                return
+            # Kök de üst dizinine bağlanır; böylece daha üstten yapılan bir taramada
+            # değişmeyen bu kayıt yeniden yazılmadan haritada görünür
+            parent = os.path.dirname(item.path)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns, own_bytes, own_files, subdirs, "
+                "total_bytes, total_files, file_bytes, file_files, links) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (os.fsencode(item.path), os.fsencode(parent) if parent != item.path else None,
+                 item.mtime_ns, item.own_bytes, item.own_files, json.dumps(item.subdirs),
+                 item.total_bytes, item.total_files, item.file_bytes, item.file_files, json.dumps(item.links)),
+            )
+            pending_writes += 1
+            if pending_writes >= 5000:
+                self.conn.commit()
+                pending_writes = 0
+
+        for path, node in scanner.walk_nodes(root, read, children, workers=workers, on_error=on_error):
+            parent = os.path.dirname(path)
+            while stack and stack[-1].path != parent:
+                close_top()
+            if isinstance(node, _Cached):
+                self.stats["cached"] += 1
+                row = known[os.fsencode(path)]
+                stack.append(_Open(path, node, row[0], node.subdirs, node.file_bytes, node.file_files,
+                                   node.links, seen_links))
+            else:
+                self.stats["rescanned"] += 1
+                subdirs = [os.path.basename(sub) for sub in children(path, node)]
+                # Silinen alt dizinlerin kayıtları da temizlenir
+                old = known.get(os.fsencode(path))
+                if old is not None:
+                    for name in set(json.loads(old[1][2])) - set(subdirs):
+                        self._forget_subtree(os.path.join(path, name))
+                file_bytes, file_files, links = _own_usage(node.entries)
+                # mtime çözünürlüğü yüzünden taramayla aynı anda değişen dizinlere güvenilmez
+                mtime_ns = node.mtime_ns if node.mtime_ns < racy_limit else scanindex.UNTRUSTED_MTIME
+                stack.append(_Open(path, node, mtime_ns, subdirs, file_bytes, file_files, links, seen_links))
+            if progress is not None and (self.stats["cached"] + self.stats["rescanned"]) % 2000 == 0:
+                progress(self.stats)
+        while stack:
+            close_top()
+        # Okunamayan dizinlerin eski toplamları haritada kalmasın
+        for path in failed:
+            self._forget_subtree(path)
+        self.conn.commit()
+        return self.stats
+
+    def tile(self, path):
+        row = self.conn.execute(
+            "SELECT total_bytes, total_files FROM dirs WHERE path = ?", (os.fsencode(path),)).fetchone()
+        if row is None:
+            return None
+        return Tile(path, os.path.basename(path) or path, row[0], row[1], True)
+
+    def children(self, path):
+        """Dizinin alt dizinleri ve doğrudan içindeki dosyalar (tek kutu), büyükten küçüğe."""
+        key = os.fsencode(path)
+        own = self.conn.execute("SELECT own_bytes, own_files FROM dirs WHERE path = ?", (key,)).fetchone()
+        if own is None:
+            return []
+        tiles = []
+        for sub, total_bytes, total_files in self.conn.execute(
+                "SELECT path, total_bytes, total_files FROM dirs WHERE parent = ?", (key,)):
+            sub = os.fsdecode(sub)
+            tiles.append(Tile(sub, os.path.basename(sub), total_bytes, total_files, True))
+        if own[0]:
+            tiles.append(Tile(path, "(files)", own[0], own[1], False))
+        tiles.sort(key=lambda tile: tile.bytes, reverse=True)
+        return tiles
+
+
+def _worst_ratio(row, side):
+    # Satırdaki kutuların en kötü en-boy oranı (squarified treemap, Bruls vd.)
+    total = sum(row)
+    if not total or not side:
+        return float("inf")
+    side_sq = side * side
+    return max(max(side_sq * area / (total * total), (total * total) / (side_sq * area)) for area in row if area)
+
+
+def squarify(sizes, x, y, width, height):
+    """Büyükten küçüğe sıralı boyutları kareye yakın dikdörtgenlere böler.
+    Dönen değer: her boyut için (x, y, genişlik, yükseklik)."""
+    rects = []
+    total = sum(sizes)
+    if total <= 0 or width <= 0 or height <= 0:
+        return [(x, y, 0, 0)] * len(sizes)
+    scale = width * height / total
+    areas = [size * scale for size in sizes]
+    index = 0
+    while index < len(areas):
+        side = min(width, height)
+        row = [areas[index]]
+        index += 1
+        while index < len(areas) and _worst_ratio(row + [areas[index]], side) <= _worst_ratio(row, side):
+            row.append(areas[index])
+            index += 1
+        row_total = sum(row)
+        if width >= height:
+            # Satır sol kenara dikey şerit olarak yerleşir
+            strip = row_total / height if height else 0
+            offset = y
+            for area in row:
+                h = area / strip if strip else 0
+                rects.append((x, offset, strip, h))
+                offset += h
+            x += strip
+            width -= strip
+        else:
+            strip = row_total / width if width else 0
+            offset = x
+            for area in row:
+                w = area / strip if strip else 0
+                rects.append((offset, y, w, strip))
+                offset += w
+            y += strip
+            height -= strip
+    return rects
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import json
+import os
+import stat
+import time
+
+from maid_engine import scanner
+
+# Raporda tutulan en büyük dosya ve dizin sayısı
+DEFAULT_TOP = 100
+# İlerleme bildirimi kaç dizinde bir yapılır
+PROGRESS_EVERY = 2000
+
+
+class UsageReport:
+    """En büyük K dosya ve dizin ile toplam kullanım. Dolaşım boyunca yalnızca
+    iki sınırlı yığın (heap) ve kökten o anki dizine kadar olan yol tutulur."""
+
+    def __init__(self, root, top):
+        self.root = root
+        self.top = top
+        self.total_bytes = 0
+        self.files = 0
+        self.dirs = 0
+        self.errors = 0
+        self.seconds = 0.0
+        # (bayt, yol) çiftlerinden oluşan en küçük-yığınlar; kökte en küçük eleman durur
+        self._files = []
+        self._dirs = []
+
+    @staticmethod
+    def _push(heap, size, path, top):
+        if len(heap) < top:
+            heapq.heappush(heap, (size, path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, path))
+
+    def add_file(self, size, path):
+        self._push(self._files, size, path, self.top)
+
+    def add_dir(self, size, path):
+        self._push(self._dirs, size, path, self.top)
+
+    @property
+    def largest_files(self):
+        return sorted(self._files, reverse=True)
+
+    @property
+    def largest_dirs(self):
+        return sorted(self._dirs, reverse=True)
+
+    def as_dict(self):
+        return {
+            "root": self.root,
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "total_bytes": self.total_bytes,
+            "files": self.files,
+            "dirs": self.dirs,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 2),
+            "largest_files": [{"path": path, "bytes": size} for size, path in self.largest_files],
+            "largest_dirs": [{"path": path, "bytes": size} for size, path in self.largest_dirs],
+        }
+
+    def export_json(self, path):
+        tmp_path = path + ".tmp"
+        # UTF-8 olmayan dosya adları diskteki baytlarıyla yazılır
+        with open(tmp_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+            json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def analyze(root, top=DEFAULT_TOP, one_file_system=True, workers=None, progress=None, snapshot=None):
+    """Ağacı bir kez dolaşır; dizin boyutları derinlik öncelikli sırayla aşağıdan
+    yukarıya toplanır. Bir dizinin tüm alt ağacı bittiğinde boyutu üst dizine eklenir
+    ve dizin bellekten çıkar. Boyutlar ayrılmış bloklardır (du gibi).
+    snapshot (snapshots.Builder) verilirse aynı dolaşımda dizin özetleri de ona yazılır."""
+    root = os.path.normpath(root)
+    report = UsageReport(root, top)
+    started = time.monotonic()
+    root_dev = os.lstat(root).st_dev
+    # Sabit bağlantılı dosyalar bir kez sayılır; yalnızca nlink > 1 olanlar akılda tutulur
+    seen_links = set()
+
+    def on_error(error):
+        report.errors += 1
+
+    def children(path, entries):
+        subdirs = []
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                # du -x gibi: başka dosya sistemlerine geçilmez
+                if one_file_system and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                    continue
+            except OSError:
+                continue
+            subdirs.append(entry.path)
+        return subdirs
+
+    # [yol, boyut, görüntüdeki sıra] listelerinden oluşan açık dizin yolu (kökten o anki dizine)
+    stack = []
+
+    def close_top():
+        path, size, index = stack.pop()
+        report.add_dir(size, path)
+        if snapshot is not None:
+            snapshot.set_total(index, size)
+        if stack:
+            stack[-1][1] += size
+
+    for path, entries in scanner.walk_nodes(root, scanner._read_dir, children, workers=workers, on_error=on_error):
+        # Ön sıralı dolaşımda üst dizin her zaman yığındadır; kardeş alt ağaçlar kapatılır
+        parent = os.path.dirname(path)
+        while stack and stack[-1][0] != parent:
+            close_top()
+        own = 0
+        files = 0
+        newest = 0
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            size = st.st_blocks * 512
+            if stat.S_ISDIR(st.st_mode):
+                # Alt dizinin kendi blokları (girdi tablosu) bu dizine yazılır
+                if st.st_dev == root_dev or not one_file_system:
+                    own += size
+                continue
+            if st.st_nlink > 1:
+                key = (st.st_dev, st.st_ino)
+                if key in seen_links:
+                    continue
+                seen_links.add(key)
+            own += size
+            files += 1
+            newest = max(newest, st.st_mtime)
+            report.add_file(size, entry.path)
+        report.files += files
+        report.dirs += 1
+        report.total_bytes += own
+        index = None
+        if snapshot is not None:
+            index = snapshot.add(path, stack[-1][2] if stack else -1, own, files, newest)
+        stack.append([path, own, index])
+        if progress is not None and report.dirs % PROGRESS_EVERY == 0:
+            progress(report)
+    while stack:
+        close_top()
+    report.seconds = time.monotonic() - started
+    return report
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import stat
+import struct
+import threading
+from collections import deque
+
+from maid_engine import exclusions, scanner, scanindex, settings, thumbnails, trash
+
+# <sys/inotify.h> sabitleri
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_CLOSE_WRITE
+              | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+              | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+MAX_USER_WATCHES_FILE = "/proc/sys/fs/inotify/max_user_watches"
+
+HOME = os.path.expanduser("~")
+
+# Ev dizini izlenirken içerikleri ayrıca tutulan alanlar. Tahminler ve çöp boşaltma
+# bu alanları yeniden dolaşmak yerine canlı listeyi kullanır.
+TRASH_FILES_DIR = os.path.join(trash.HOME_TRASH, "files")
+TRASH_INFO_DIR = os.path.join(trash.HOME_TRASH, "info")
+AREAS = {
+    "thumbnails": thumbnails.THUMBNAILS_DIR,
+    "trash_files": TRASH_FILES_DIR,
+    "trash_info": TRASH_INFO_DIR,
+}
+
+# Canlı izlenebilen kurallar: dizin kuralları (ör. boş dizinler) alt girdilerin
+# sayımını gerektirdiği için izlenmez, bunlar için normal tarama yapılır.
+LIVE_RULES = ("thumbs_db", "broken_symlink")
+
+
+def _area_of(path):
+    for name, root in AREAS.items():
+        if path.startswith(root + "/"):
+            return name
+    return None
+
+
+def _libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+def read_watch_limit():
+    try:
+        with open(MAX_USER_WATCHES_FILE) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        # Çoğu çekirdeğin eski varsayılanı
+        return 8192
+
+
+class WatchBudget:
+    """fs.inotify.max_user_watches sınırının yalnızca bir payını kullanır;
+    kalan izlemeler masaüstü ortamı ve diğer uygulamalara bırakılır."""
+
+    def __init__(self, share=None):
+        if share is None:
+            share = settings.load()["inotify_watch_share"]
+        self.limit = max(1, int(read_watch_limit() * share))
+        self.used = 0
+        self.exhausted = False
+
+    def take(self):
+        if self.exhausted or self.used >= self.limit:
+            self.exhausted = True
+            return False
+        self.used += 1
+        return True
+
+    def give_back(self):
+        self.used = max(0, self.used - 1)
+
+    def mark_exhausted(self):
+        # inotify_add_watch ENOSPC döndürdüyse sistem genelindeki sınır dolmuştur
+        self.exhausted = True
+
+
+class _StatEntry:
+    # Tek bir olay için üst dizinin tamamını okumamak adına os.DirEntry
+    # yerine kullanılan, lstat sonucundan oluşturulan küçük eşdeğer
+    __slots__ = ("path", "name", "_st")
+
+    def __init__(self, path, st):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._st = st
+
+    def is_symlink(self):
+        return stat.S_ISLNK(self._st.st_mode)
+
+    def is_dir(self, follow_symlinks=True):
+        if follow_symlinks and self.is_symlink():
+            return os.path.isdir(self.path)
+        return stat.S_ISDIR(self._st.st_mode)
+
+    def is_file(self, follow_symlinks=True):
+        if follow_symlinks and self.is_symlink():
+            return os.path.isfile(self.path)
+        return stat.S_ISREG(self._st.st_mode)
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks and self.is_symlink():
+            return os.stat(self.path)
+        return self._st
+
+
+class LiveJunkTracker(threading.Thread):
+    """Ev dizinini inotify ile izleyerek çöp adayı listesini güncel tutar.
+    İzleme bütçesine sığmayan alt ağaçlar, temizlik sırasında kalıcı indeks
+    üzerinden (mtime tabanlı) yeniden taranır."""
+
+    def __init__(self, root=HOME, rule_names=LIVE_RULES, budget=None, exclude=None):
+        super().__init__(name="maid-inotify", daemon=True)
+        self.root = root
+        self.rules = scanner.get_rules(rule_names)
+        self.rule_names = set(rule_names)
+        self.budget = budget or WatchBudget()
+        self.exclude = exclude if exclude is not None else exclusions.default()
+        self.ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._libc = _libc()
+        self._fd = -1
+        self._wd_to_path = {}
+        self._path_to_wd = {}
+        self._candidates = {name: set() for name in rule_names}
+        self._links = set()
+        # Alan adı -> {yol: lstat sonucu}; çöp bilgi dosyaları için (lstat, silinme zamanı)
+        self._areas = {name: {} for name in AREAS}
+        # İzlenemeyen alt ağaçların kökleri
+        self._unwatched = set()
+        # Kuyruk taşması gibi durumlarda liste güvenilmez olur, tam tarama gerekir
+        self._stale = False
+
+    # --- Durum sorguları (arayüz iş parçacığından çağrılabilir) ---
+
+    def _serving(self):
+        # İş parçacığı beklenmedik bir hatayla durduysa liste artık güncel değildir
+        return self.ready.is_set() and self.is_alive() and not self._stale
+
+    def can_serve(self, rule_names):
+        return self._serving() and set(rule_names) <= self.rule_names
+
+    def _area_complete(self, name):
+        # Alanın kökü izleniyor ve altında izlenemeyen bir alt ağaç yoksa liste eksiksizdir
+        root = AREAS[name]
+        if root not in self._path_to_wd:
+            return False
+        prefix = root + "/"
+        return not any(path == root or path.startswith(prefix) or root.startswith(path + "/")
+                       for path in self._unwatched)
+
+    def area_stats(self, name):
+        """Alandaki dosyaların lstat sonuçları; liste güvenilir değilse None."""
+        if not self._serving():
+            return None
+        with self._lock:
+            if not self._area_complete(name):
+                return None
+            return list(self._areas[name].values())
+
+    def trash_items(self):
+        """Ev dizinindeki çöp kutusunun öğeleri (trash.list_items ile aynı biçimde);
+        liste güvenilir değilse None."""
+        if not self._serving():
+            return None
+        with self._lock:
+            if not (self._area_complete("trash_files") and self._area_complete("trash_info")):
+                return None
+            files = dict(self._areas["trash_files"])
+            infos = dict(self._areas["trash_info"])
+        home_trash = trash._trash_dir(trash.HOME_TRASH)
+        if home_trash is None:
+            return []
+        # files/ altındaki bloklar üst düzey öğelere toplanır
+        sizes = {}
+        prefix_len = len(TRASH_FILES_DIR) + 1
+        for path, st in files.items():
+            name = path[prefix_len:].split(os.sep, 1)[0]
+            sizes[name] = sizes.get(name, 0) + st.st_blocks * 512
+        items = []
+        for info_path, (st, deleted) in infos.items():
+            name = os.path.basename(info_path)[:-len(".trashinfo")]
+            size = sizes.pop(name, 0) + st.st_blocks * 512
+            items.append(trash.TrashItem(home_trash, name, os.path.join(TRASH_FILES_DIR, name), info_path,
+                                         deleted, size))
+        for name, size in sizes.items():
+            items.append(trash.TrashItem(home_trash, name, os.path.join(TRASH_FILES_DIR, name), None, None, size))
+        return items
+
+    def collect(self, rule_names, workers=None):
+        """Canlı listeden adayları üretir; izlenemeyen alt ağaçlar indeksle taranır."""
+        wanted = scanner.get_rules(rule_names)
+        with self._lock:
+            snapshot = [(name, sorted(self._candidates[name])) for name in rule_names if name in self._candidates]
+            links = sorted(self._links)
+            unwatched = sorted(self._unwatched)
+
+        for name, paths in snapshot:
+            if name == "broken_symlink":
+                continue
+            for path in paths:
+                if os.path.lexists(path):
+                    yield scanner.Candidate(name, path)
+
+        # Bağlantının hedefi silindiğinde bağlantının dizini değişmez; bu yüzden
+        # bilinen bağlantılar her seferinde yeniden denetlenir
+        for rule in wanted:
+            if rule.link_recheck:
+                for path in links:
+                    if os.path.islink(path) and rule.link_recheck(path):
+                        yield scanner.Candidate(rule.name, path)
+
+        for root in unwatched:
+            yield from scanindex.indexed_scan(root, wanted, workers=workers, exclude=self.exclude)
+
+    def stop(self):
+        self._stop_event.set()
+
+    # --- İzleme yönetimi ---
+
+    def _add_watch(self, path):
+        if not self.budget.take():
+            return False
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            self.budget.give_back()
+            if ctypes.get_errno() == errno.ENOSPC:
+                self.budget.mark_exhausted()
+            return False
+        self._wd_to_path[wd] = path
+        self._path_to_wd[path] = wd
+        return True
+
+    def _forget_tree(self, path):
+        prefix = path + "/"
+        for watched in [p for p in self._path_to_wd if p == path or p.startswith(prefix)]:
+            wd = self._path_to_wd.pop(watched)
+            self._wd_to_path.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+            self.budget.give_back()
+        for group in list(self._candidates.values()) + [self._links]:
+            for item in [p for p in group if p == path or p.startswith(prefix)]:
+                group.discard(item)
+        for area in self._areas.values():
+            for item in [p for p in area if p == path or p.startswith(prefix)]:
+                del area[item]
+        for root in [p for p in self._unwatched if p == path or p.startswith(prefix)]:
+            self._unwatched.discard(root)
+
+    def _note_entry(self, entry_path, entry):
+        for rule in self.rules:
+            if rule.entry_test and rule.entry_test(entry):
+                self._candidates[rule.name].add(entry_path)
+        if entry.is_symlink():
+            self._links.add(entry_path)
+        area = _area_of(entry_path)
+        if area is not None:
+            self._note_area_entry(area, entry_path, entry)
+
+    def _note_area_entry(self, area, entry_path, entry):
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            return
+        if area == "trash_files":
+            # trash._sizes gibi: dizinlerin kendi blokları da öğenin boyutuna dahildir
+            self._areas[area][entry_path] = st
+        elif area == "thumbnails":
+            if not stat.S_ISDIR(st.st_mode):
+                self._areas[area][entry_path] = st
+        elif entry_path.endswith(".trashinfo") and os.path.dirname(entry_path) == TRASH_INFO_DIR:
+            self._areas[area][entry_path] = (st, trash._parse_info(entry_path))
+
+    def _forget_entry(self, entry_path):
+        for group in list(self._candidates.values()) + [self._links]:
+            group.discard(entry_path)
+        for area in self._areas.values():
+            area.pop(entry_path, None)
+
+    def _prunes(self, path):
+        # Çöpe atılan dizinler (ör. node_modules) dışlama kurallarından bağımsız olarak
+        # sayılır; öğenin boyutu eksik çıkmasın
+        return _area_of(path) != "trash_files" and self.exclude.prunes(path)
+
+    def _populate(self, top):
+        # Sığ dizinler önce izlenir (BFS); bütçe bittiğinde kuyrukta kalan dizinler
+        # izlenmeyen alt ağaç kökü olarak kaydedilir.
+        queue = deque([top])
+        while queue and not self._stop_event.is_set():
+            path = queue.popleft()
+            # Yarış durumuna karşı izleme, dizin okunmadan önce eklenir
+            if not self._add_watch(path):
+                with self._lock:
+                    self._unwatched.add(path)
+                    self._unwatched.update(queue)
+                return
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            with self._lock:
+                for entry in entries:
+                    self._note_entry(entry.path, entry)
+            queue.extend(sub for sub in scanner._subdirs(entries) if not self._prunes(sub))
+
+    def _single_entry(self, path):
+        try:
+            return _StatEntry(path, os.lstat(path))
+        except OSError:
+            return None
+
+    def _handle(self, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            # Olaylar kaçırıldı; bir sonraki temizlik tam indeks taramasıyla yapılır
+            self._stale = True
+            return
+        base = self._wd_to_path.get(wd)
+        if base is None:
+            return
+        if mask & IN_IGNORED:
+            with self._lock:
+                self._wd_to_path.pop(wd, None)
+                if self._path_to_wd.get(base) == wd:
+                    del self._path_to_wd[base]
+                    self.budget.give_back()
+            return
+        if not name:
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                with self._lock:
+                    self._forget_tree(base)
+            return
+
+        path = os.path.join(base, name)
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            with self._lock:
+                if mask & IN_ISDIR:
+                    self._forget_tree(path)
+                else:
+                    self._forget_entry(path)
+            return
+
+        if mask & (IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE | IN_ATTRIB):
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self._prunes(path):
+                    with self._lock:
+                        self._note_entry_path(path)
+                    self._populate(path)
+                return
+            entry = self._single_entry(path)
+            if entry is not None:
+                with self._lock:
+                    self._note_entry(path, entry)
+
+    def _note_entry_path(self, path):
+        entry = self._single_entry(path)
+        if entry is not None:
+            self._note_entry(path, entry)
+
+    def _rebuild(self):
+        with self._lock:
+            for wd in list(self._wd_to_path):
+                self._libc.inotify_rm_watch(self._fd, wd)
+            self._wd_to_path.clear()
+            self._path_to_wd.clear()
+            self.budget.used = 0
+            self.budget.exhausted = False
+            for group in list(self._candidates.values()) + [self._links] + list(self._areas.values()):
+                group.clear()
+            self._unwatched.clear()
+        self._populate(self.root)
+        self._stale = False
+
+    def run(self):
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            self._stale = True
+            return
+        try:
+            self._populate(self.root)
+            self.ready.set()
+
+            poller = select.poll()
+            poller.register(self._fd, select.POLLIN)
+            while not self._stop_event.is_set():
+                if not poller.poll(1000):
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    raw_name = data[offset:offset + length].rstrip(b"\0")
+                    offset += length
+                    try:
+                        self._handle(wd, mask, os.fsdecode(raw_name))
+                    except Exception:
+                        # Beklenmedik bir olay iş parçacığını durdurmaz; liste baştan kurulur
+                        self._stale = True
+                if self._stale:
+                    self._rebuild()
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+            self.ready.clear()
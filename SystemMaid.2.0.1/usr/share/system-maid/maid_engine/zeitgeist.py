@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import subprocess
+import time
+
+from maid_engine import deleter
+
+ZEITGEIST_DIR = os.path.join(os.path.expanduser("~"), ".local/share/zeitgeist")
+DATABASE = os.path.join(ZEITGEIST_DIR, "activity.sqlite")
+FTS_INDEX = os.path.join(ZEITGEIST_DIR, "fts.index")
+
+# /proc/<pid>/comm 15 karakterle sınırlıdır
+DAEMON_COMM = "zeitgeist-daemo"
+DAEMON_STOP_TIMEOUT = 10
+
+# event tablosunun başvurduğu arama tabloları. Dosya URI'leri ve belge başlıkları olaydan
+# ayrı olarak bu tablolarda durur; olaylar silinince sahipsiz kalan satırlar da silinir.
+# Veritabanı yabancı anahtarları bildirmiyorsa bu liste kullanılır.
+LOOKUP_COLUMNS = {
+    "uri": ("origin", "subj_id", "subj_origin", "subj_id_current", "subj_origin_current"),
+    "text": ("subj_text",),
+    "actor": ("actor",),
+    "storage": ("subj_storage",),
+    "mimetype": ("subj_mimetype",),
+    "payload": ("payload",),
+}
+
+
+class ActivityStats:
+    """Etkinlik veritabanı budama sonucu."""
+
+    def __init__(self):
+        self.events = 0
+        # Veritabanı, -wal ve -shm dosyalarının toplam boyutu
+        self.size_before = 0
+        self.size_after = 0
+        self.daemon_stopped = False
+        self.compacted = False
+        # Güvenli silmede ezilemediği için yerinde bırakılan dosyalar
+        self.not_erased = []
+
+
+def database_size(path=DATABASE):
+    total = 0
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            total += os.stat(path + suffix).st_size
+        except OSError:
+            pass
+    return total
+
+
+def _daemon_pids():
+    pids = []
+    uid = os.getuid()
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            if os.stat(f"/proc/{name}").st_uid != uid:
+                continue
+            with open(f"/proc/{name}/comm") as f:
+                if f.read().strip() == DAEMON_COMM:
+                    pids.append(int(name))
+        except OSError:
+            continue
+    return pids
+
+
+def _stop_daemon():
+    # Günlük yazma sırasında kesilmesin diye daemon kendi --quit komutuyla kapatılır
+    try:
+        subprocess.run(["zeitgeist-daemon", "--quit"], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, timeout=DAEMON_STOP_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    deadline = time.monotonic() + DAEMON_STOP_TIMEOUT
+    while _daemon_pids():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def _has_table(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def _lookup_references(conn):
+    """{arama tablosu: ona başvuran event sütunları}; önce veritabanının kendi yabancı
+    anahtarlarından okunur, yoksa LOOKUP_COLUMNS kullanılır."""
+    references = {}
+    for row in conn.execute("PRAGMA foreign_key_list(event)"):
+        references.setdefault(row[2], []).append(row[3])
+    if not references:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(event)")}
+        for table, names in LOOKUP_COLUMNS.items():
+            present = [name for name in names if name in columns]
+            if present:
+                references[table] = present
+    return {table: columns for table, columns in references.items() if _has_table(conn, table)}
+
+
+def _delete_orphans(conn):
+    # Hiçbir olayın başvurmadığı URI, başlık, uygulama... satırları silinir
+    for table, columns in _lookup_references(conn).items():
+        referenced = " UNION ".join(f'SELECT "{column}" FROM event WHERE "{column}" IS NOT NULL' for column in columns)
+        conn.execute(f'DELETE FROM "{table}" WHERE id NOT IN ({referenced})')
+
+
+def prune(before=None, path=DATABASE, secure=False, drop_fts=False, stop_daemon=True):
+    """before (epoch saniye) tarihinden eski olayları siler, ardından veritabanını
+    küçültür. Olaylar daemon çalışırken SQLite kilitleriyle silinir; sahipsiz arama
+    satırları ve VACUUM için daemon durdurulur ve D-Bus üzerinden ilk istekte
+    kendiliğinden yeniden başlar. stop_daemon=False ise daemon'a dokunulmaz; çalışıyorsa
+    bu iki adım atlanır. secure=True ise silinen sayfalar SQLite tarafından sıfırlarla ezilir."""
+    stats = ActivityStats()
+    if not os.path.exists(path):
+        return stats
+    stats.size_before = database_size(path)
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if secure:
+            conn.execute("PRAGMA secure_delete = ON")
+        if not _has_table(conn, "event"):
+            raise sqlite3.DatabaseError("not a Zeitgeist activity database")
+        if before is not None:
+            # Zeitgeist zaman damgaları milisaniye cinsindendir; her konu (subject) ayrı bir satırdır
+            cutoff = int(before * 1000)
+            with conn:
+                stats.events = conn.execute(
+                    "SELECT COUNT(DISTINCT id) FROM event WHERE timestamp < ?", (cutoff,)).fetchone()[0]
+                conn.execute("DELETE FROM event WHERE timestamp < ?", (cutoff,))
+    finally:
+        conn.close()
+
+    if _daemon_pids():
+        if stop_daemon:
+            stats.daemon_stopped = _stop_daemon()
+        if not stats.daemon_stopped:
+            # Daemon arama tablolarının kimliklerini bellekte tutar (TableLookup); çalışırken
+            # bu satırlar silinirse yeni olaylar var olmayan kimliklere başvurur. VACUUM da
+            # onun yazmalarıyla yarışmasın diye ikisi birlikte atlanır
+            stats.size_after = database_size(path)
+            return stats
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if secure:
+            conn.execute("PRAGMA secure_delete = ON")
+        if before is not None:
+            with conn:
+                _delete_orphans(conn)
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stats.compacted = True
+    finally:
+        conn.close()
+    if drop_fts:
+        # Tam metin dizini yalnızca daemon kapalıyken silinir; daemon eksik dizini yeniden oluşturur
+        deleter.remove_path(FTS_INDEX)
+    stats.size_after = database_size(path)
+    return stats
+
+
+def clear(path=DATABASE, eraser=None):
+    """Geçmişin tamamını siler: daemon durdurulur ve Zeitgeist dizininin içeriği
+    (veritabanı, -wal/-shm, tam metin dizini) kaldırılır. Daemon durmazsa dosyalar
+    onun altından silinmez; bunun yerine tüm olaylar prune() ile silinir."""
+    stats = ActivityStats()
+    if not os.path.exists(path):
+        return stats
+    try:
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            stats.events = conn.execute("SELECT COUNT(DISTINCT id) FROM event").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+    if _daemon_pids():
+        stats.daemon_stopped = _stop_daemon()
+        if not stats.daemon_stopped:
+            # Daemon zaten bir kez beklendi; prune onu yeniden durdurmaya çalışmaz
+            return prune(time.time(), path, secure=eraser is not None, drop_fts=False, stop_daemon=False)
+    stats.size_before = database_size(path)
+    directory = os.path.dirname(path)
+    if eraser is not None:
+        stats.not_erased = eraser.erase_tree(directory).failed
+    if not stats.not_erased:
+        deleter.clear_directory(directory)
+        # Veritabanı kalmadı; küçültülecek bir şey de yok
+        stats.compacted = True
+    stats.size_after = database_size(path)
+    return stats
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from maid_engine import caches
+
+DAY = 86400
+NOW = 1_700_000_000
+MB = 1024 * 1024
+
+
+def _file(age_days, size, name):
+    return (NOW - age_days * DAY, size, name)
+
+
+def _names(chosen):
+    return sorted(item[2] for item in chosen)
+
+
+def test_without_policy_nothing_is_selected():
+    assert caches.select([_file(400, MB, "a")], None, now=NOW) == []
+    assert caches.select([_file(400, MB, "a")], {}, now=NOW) == []
+
+
+def test_age_limit_selects_unused_files():
+    files = [_file(40, MB, "old"), _file(2, MB, "new")]
+    assert _names(caches.select(files, {"max_age_days": 30}, now=NOW)) == ["old"]
+
+
+def test_size_limit_removes_least_recently_used_first():
+    files = [_file(1, 2 * MB, "c"), _file(5, 2 * MB, "b"), _file(9, 2 * MB, "a")]
+    assert _names(caches.select(files, {"max_mb": 3}, now=NOW)) == ["a", "b"]
+    assert _names(caches.select(files, {"max_mb": 6}, now=NOW)) == []
+
+
+def test_size_limit_counts_only_files_kept_by_age():
+    files = [_file(40, 8 * MB, "old"), _file(5, 2 * MB, "b"), _file(1, 2 * MB, "c")]
+    assert _names(caches.select(files, {"max_age_days": 30, "max_mb": 3}, now=NOW)) == ["b", "old"]
+
+
+def test_policy_for_named_default_and_managed_entries():
+    policies = {"*": {"max_age_days": 90}, "fontconfig": {"max_mb": 10}, "pip": {"max_mb": 50}, "off": {}}
+    assert caches.policy_for("fontconfig", policies) == {"max_mb": 10}
+    assert caches.policy_for("pip", policies) == {"max_mb": 50}
+    assert caches.policy_for("off", policies) is None
+    assert caches.policy_for("some-app", policies) == {"max_age_days": 90, "whole": True}
+    assert caches.policy_for("mozilla", policies) is None
+    assert caches.policy_for("some-app", {}) is None
+
+
+def test_whole_entry_is_stale_only_when_every_file_is_old():
+    policy = {"max_age_days": 30, "max_mb": 1}
+    assert caches.whole_entry_stale([_file(40, MB, "a"), _file(90, MB, "b")], policy, now=NOW)
+    assert not caches.whole_entry_stale([_file(40, MB, "a"), _file(3, MB, "b")], policy, now=NOW)
+    assert not caches.whole_entry_stale([], policy, now=NOW)
+    assert not caches.whole_entry_stale([_file(400, MB, "a")], {"max_mb": 1}, now=NOW)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from maid_engine import forecast
+
+HOUR = 3600
+DAY = 86400
+TOTAL = 100 * 10 ** 9
+NOW = 1_700_000_000
+
+
+def _samples(count, step, avail, loss):
+    return [(NOW - (count - 1 - i) * step, TOTAL, avail - i * loss) for i in range(count)]
+
+
+def test_too_few_or_too_close_samples_give_no_forecast():
+    assert forecast.fit(_samples(forecast.MIN_SAMPLES - 1, HOUR, TOTAL // 2, 10 ** 6), now=NOW) == (None, None)
+    assert forecast.fit(_samples(10, 60, TOTAL // 2, 10 ** 6), now=NOW) == (None, None)
+
+
+def test_filling_disk_gives_days_left():
+    # Günde 1 GB azalan 10 GB boş alan: yaklaşık 10 gün
+    samples = _samples(24, HOUR, 10 * 10 ** 9, 10 ** 9 // 24)
+    rate, days_left = forecast.fit(samples, now=NOW)
+    assert abs(rate + 10 ** 9) < 10 ** 6
+    assert abs(days_left - (samples[-1][2] / 10 ** 9)) < 0.01
+
+
+def test_growing_free_space_has_no_end():
+    rate, days_left = forecast.fit(_samples(24, HOUR, 10 ** 9, -10 ** 6), now=NOW)
+    assert rate > 0 and days_left is None
+
+
+def test_distant_end_is_not_reported():
+    rate, days_left = forecast.fit(_samples(24, HOUR, TOTAL // 2, 1000), now=NOW)
+    assert rate < 0 and days_left is None
+
+
+def test_samples_before_a_cleanup_are_ignored():
+    before = _samples(24, HOUR, 10 * 10 ** 9, 10 ** 9 // 24)
+    # Temizlik boş alanı birden 20 GB artırır; sonrasında yalnızca 3 örnek var
+    after = [(NOW + (i + 1) * HOUR, TOTAL, 30 * 10 ** 9 - i * 10 ** 6) for i in range(3)]
+    assert forecast.fit(before + after, now=NOW + 3 * HOUR) == (None, None)
+    resized = [(t, TOTAL * 2, avail) for t, _total, avail in after]
+    assert forecast.fit(before + resized, now=NOW + 3 * HOUR) == (None, None)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from maid_engine import pathtable
+
+
+def test_add_builds_paths_from_parents():
+    table = pathtable.PathTable()
+    root = table.add(-1, "/home/user")
+    project = table.add(root, "project")
+    module = table.add(project, "__init__.py")
+    assert len(table) == 3
+    assert table.path(module) == "/home/user/project/__init__.py"
+    assert table.name(module) == "__init__.py"
+    assert table.path(root) == "/home/user"
+
+
+def test_repeated_names_are_stored_once():
+    table = pathtable.PathTable()
+    root = table.add(-1, "/src")
+    first = table.add(table.add(root, "a"), "index.js")
+    second = table.add(table.add(root, "b"), "index.js")
+    assert table.names[first] == table.names[second]
+    assert len(table._strings) == 4
+    assert table.path(second) == "/src/b/index.js"
+
+
+def test_enter_follows_a_preorder_walk(tmp_path):
+    os.makedirs(tmp_path / "a" / "b")
+    os.makedirs(tmp_path / "c")
+    table = pathtable.PathTable()
+    walk = [str(tmp_path), str(tmp_path / "a"), str(tmp_path / "a" / "b"), str(tmp_path / "c")]
+    indices = [table.enter(path) for path in walk]
+    assert [table.path(i) for i in indices] == walk
+    # c, b alt ağacı bittikten sonra kökün altına eklenir
+    assert table.parents[indices[3]] == indices[0]
+
+
+def test_intern_works_after_finish():
+    table = pathtable.PathTable()
+    root = table.add(-1, "/x")
+    table.add(root, "name")
+    table.finish()
+    assert table.intern("name") == 1
+    assert table.path(table.add(root, "other")) == "/x/other"
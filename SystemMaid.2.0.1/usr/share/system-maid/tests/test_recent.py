@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from maid_engine import mounts, recent
+
+XBEL = """<?xml version="1.0" encoding="UTF-8"?>
+<xbel version="1.0"
+      xmlns:bookmark="http://www.freedesktop.org/standards/desktop-bookmarks"
+      xmlns:mime="http://www.freedesktop.org/standards/shared-mime-info">
+{bookmarks}
+</xbel>
+"""
+
+BOOKMARK = """  <bookmark href="{href}" added="{time}" modified="{time}" visited="{time}">
+    <info>
+      <metadata owner="http://freedesktop.org">
+        <mime:mime-type type="text/plain"/>
+        <bookmark:applications>
+          <bookmark:application name="gedit" exec="&apos;gedit %u&apos;" modified="{time}" count="1"/>
+        </bookmark:applications>
+      </metadata>
+    </info>
+  </bookmark>"""
+
+
+def _write(path, bookmarks):
+    path.write_text(XBEL.format(bookmarks="\n".join(
+        BOOKMARK.format(href=href, time=time) for href, time in bookmarks)), encoding="utf-8")
+
+
+def _hrefs(path):
+    return [elem.get("href") for elem in ET.parse(path).getroot().iter("bookmark")]
+
+
+@pytest.fixture
+def local_mounts(monkeypatch):
+    # Test dizinleri her zaman yerel bir dosya sisteminde sayılır
+    table = mounts.MountTable([mounts.Mount(1, (8, 1), "/", "ext4", "/dev/sda1", "local")])
+    monkeypatch.setattr(mounts, "MountTable", lambda *args, **kwargs: table)
+
+
+def test_drops_missing_targets_and_keeps_the_rest(tmp_path, local_mounts):
+    kept = tmp_path / "kept.txt"
+    kept.write_text("x")
+    xbel = tmp_path / "recently-used.xbel"
+    _write(xbel, [
+        (f"file://{kept}", "2099-01-01T00:00:00Z"),
+        (f"file://{tmp_path}/deleted.txt", "2099-01-01T00:00:00Z"),
+        ("https://example.org/page", "2099-01-01T00:00:00Z"),
+        ("file:///media/usb/unplugged.txt", "2099-01-01T00:00:00Z"),
+    ])
+    stats = recent.prune_xbel(str(xbel))
+    assert (stats.kept, stats.missing, stats.expired) == (3, 1, 0)
+    assert _hrefs(xbel) == [f"file://{kept}", "https://example.org/page", "file:///media/usb/unplugged.txt"]
+    assert stats.size_after == os.stat(xbel).st_size < stats.size_before
+
+
+def test_drops_old_entries(tmp_path, local_mounts):
+    xbel = tmp_path / "recently-used.xbel"
+    _write(xbel, [("https://old.example/", "2000-01-01T00:00:00Z"), ("https://new.example/", "2099-01-01T00:00:00Z")])
+    stats = recent.prune_xbel(str(xbel), max_age_days=30, drop_missing=False)
+    assert (stats.kept, stats.expired) == (1, 1)
+    assert _hrefs(xbel) == ["https://new.example/"]
+
+
+def test_rewritten_file_keeps_namespaces_and_metadata(tmp_path, local_mounts):
+    xbel = tmp_path / "recently-used.xbel"
+    _write(xbel, [("https://a.example/", "2099-01-01T00:00:00Z"), ("https://b.example/", "2000-01-01T00:00:00Z")])
+    recent.prune_xbel(str(xbel), max_age_days=30)
+    text = xbel.read_text(encoding="utf-8")
+    assert 'xmlns:bookmark="http://www.freedesktop.org/standards/desktop-bookmarks"' in text
+    assert "<bookmark:application " in text and "<mime:mime-type " in text
+    ET.fromstring(text)
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path, local_mounts):
+    xbel = tmp_path / "recently-used.xbel"
+    _write(xbel, [("https://a.example/", "2099-01-01T00:00:00Z")])
+    before = os.stat(xbel)
+    stats = recent.prune_xbel(str(xbel))
+    assert stats.removed == 0
+    assert os.stat(xbel).st_ino == before.st_ino
+    assert [name for name in os.listdir(tmp_path) if name != "recently-used.xbel"] == []
+
+
+def test_missing_targets_rule(tmp_path, local_mounts):
+    os.makedirs(tmp_path / "unmounted")
+    missing = mounts.MissingTargets()
+    assert missing(str(tmp_path / "deleted.txt"))
+    # Boş bir dizinin altındaki kayıp alt dizinler bağlanmamış bir disk sayılır
+    assert not missing(str(tmp_path / "unmounted" / "docs" / "a.txt"))
+    assert not missing("/run/media/user/disk/a.txt")
+    assert not missing(str(tmp_path))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from maid_engine import scanindex, scanner
+
+
+@pytest.fixture
+def trusted_mtimes(monkeypatch):
+    # Testte dizinler taramayla aynı anda oluşturulur; mtime değerlerine yine de güvenilsin
+    monkeypatch.setattr(scanindex, "RACY_WINDOW_NS", -10 ** 12)
+
+
+def _tree(root):
+    os.makedirs(root / "a" / "b")
+    (root / "a" / "Thumbs.db").write_bytes(b"x")
+    (root / "a" / "b" / "keep.txt").write_bytes(b"x")
+    os.symlink(root / "missing", root / "a" / "broken")
+
+
+def _scan(index, root, names=("thumbs_db", "broken_symlink")):
+    return sorted(index.scan(str(root), scanner.get_rules(names), workers=1))
+
+
+def test_second_scan_reads_unchanged_dirs_from_index(tmp_path, trusted_mtimes):
+    root = tmp_path / "home"
+    _tree(root)
+    with scanindex.ScanIndex(str(tmp_path / "index.sqlite")) as index:
+        first = _scan(index, root)
+        assert index.stats == {"cached": 0, "rescanned": 3}
+        second = _scan(index, root)
+        assert index.stats == {"cached": 3, "rescanned": 0}
+    assert first == second == [
+        scanner.Candidate("broken_symlink", str(root / "a" / "broken")),
+        scanner.Candidate("thumbs_db", str(root / "a" / "Thumbs.db")),
+    ]
+
+
+def test_cached_links_are_rechecked(tmp_path, trusted_mtimes):
+    # Bağlantının hedefi oluşturulunca dizinin mtime değeri değişmez; bağlantı yine de denetlenir
+    root = tmp_path / "home"
+    _tree(root)
+    with scanindex.ScanIndex(str(tmp_path / "index.sqlite")) as index:
+        _scan(index, root)
+        (root / "missing").write_bytes(b"x")
+        assert _scan(index, root) == [scanner.Candidate("thumbs_db", str(root / "a" / "Thumbs.db"))]
+
+
+def test_changed_dir_is_rescanned_and_removed_subtree_forgotten(tmp_path, trusted_mtimes):
+    root = tmp_path / "home"
+    _tree(root)
+    with scanindex.ScanIndex(str(tmp_path / "index.sqlite")) as index:
+        _scan(index, root)
+        os.unlink(root / "a" / "b" / "keep.txt")
+        os.rmdir(root / "a" / "b")
+        assert _scan(index, root, ("thumbs_db",)) == [
+            scanner.Candidate("thumbs_db", str(root / "a" / "Thumbs.db"))]
+        assert index.stats == {"cached": 1, "rescanned": 1}
+        assert os.fsencode(str(root / "a" / "b")) not in index._load(str(root))
+
+
+def test_racy_dirs_are_always_rescanned(tmp_path):
+    root = tmp_path / "home"
+    _tree(root)
+    with scanindex.ScanIndex(str(tmp_path / "index.sqlite")) as index:
+        _scan(index, root)
+        _scan(index, root)
+        assert index.stats == {"cached": 0, "rescanned": 3}
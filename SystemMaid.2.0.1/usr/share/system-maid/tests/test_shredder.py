@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import os
+import resource
+
+from maid_engine import shredder
+
+
+def _eraser(**kwargs):
+    return shredder.SecureEraser(passes=kwargs.pop("passes", 1), zero=True, workers=2, policy="auto", **kwargs)
+
+
+def test_erases_regular_files_and_leaves_other_types(tmp_path):
+    target = tmp_path / "secret"
+    target.write_bytes(b"x" * 10000)
+    os.mkfifo(tmp_path / "fifo")
+    os.symlink(target, tmp_path / "link")
+    stats = _eraser().erase_files([str(tmp_path / "fifo"), str(tmp_path / "link"), str(target)])
+    assert (stats.files, stats.bytes, stats.failed) == (1, 10000, [])
+    assert sorted(os.listdir(tmp_path)) == ["fifo", "link"]
+
+
+def test_random_passes_do_not_repeat_a_chunk(tmp_path, monkeypatch):
+    target = tmp_path / "big"
+    target.write_bytes(b"x" * (3 * shredder.BUFFER_SIZE))
+    chunks = []
+    pwrite = os.pwrite
+
+    def recording_pwrite(fd, data, offset):
+        chunks.append(bytes(data[:64]))
+        return pwrite(fd, data, offset)
+
+    monkeypatch.setattr(os, "pwrite", recording_pwrite)
+    eraser = shredder.SecureEraser(passes=1, zero=False, workers=1, policy="overwrite")
+    eraser.erase_files([str(target)])
+    assert len(chunks) == 3 and len(set(chunks)) == 3
+
+
+def test_failed_overwrite_keeps_the_file(tmp_path):
+    good = tmp_path / "good"
+    bad = tmp_path / "bad"
+    good.write_bytes(b"g" * 100)
+    bad.write_bytes(b"b" * 100)
+    eraser = _eraser()
+    write_pattern = eraser._write_pattern
+
+    def failing_write(fd, length, kind):
+        if os.readlink(f"/proc/self/fd/{fd}") == str(bad):
+            raise OSError(5, "Input/output error")
+        return write_pattern(fd, length, kind)
+
+    eraser._write_pattern = failing_write
+    stats = eraser.erase_files([str(good), str(bad)])
+    assert stats.files == 1
+    assert stats.failed == [str(bad)]
+    assert os.listdir(tmp_path) == ["bad"]
+    assert bad.read_bytes() == b"b" * 100
+
+
+def test_batch_limit_follows_the_open_file_limit(monkeypatch):
+    monkeypatch.setattr(resource, "getrlimit", lambda _kind: (1024, 4096))
+    assert shredder._batch_limit(8) == 64
+    assert shredder._batch_limit(1) == shredder.BATCH_FILES
+    monkeypatch.setattr(resource, "getrlimit", lambda _kind: (8, 4096))
+    assert shredder._batch_limit(32) == 1
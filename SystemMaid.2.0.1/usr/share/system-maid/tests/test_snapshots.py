@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from maid_engine import snapshots
+
+ROOT = "/home/user"
+
+
+def _build(own, created=None):
+    """own: ön sıralı {göreli yol: dizinin kendi baytları}; toplamlar alttan yukarı hesaplanır."""
+    builder = snapshots.Builder(ROOT)
+    if created is not None:
+        builder.created = created
+    indices = {}
+    for relative, size in own.items():
+        parent = indices.get(relative.rpartition("/")[0], -1) if relative else -1
+        path = f"{ROOT}/{relative}" if relative else ROOT
+        indices[relative] = builder.add(path, parent, size, 1, 0)
+    for relative in reversed(list(own)):
+        total = sum(size for other, size in own.items()
+                    if other == relative or not relative or other.startswith(relative + "/"))
+        builder.set_total(indices[relative], total)
+    return builder.snapshot()
+
+
+OLD = {"": 10, "docs": 100, "docs/old": 50, "videos": 1000}
+NEW = {"": 10, "docs": 100, "docs/old": 50, "docs/new": 300, "videos": 1200, "videos/clips": 5}
+
+
+def test_paths_totals_and_own_bytes():
+    snapshot = _build(NEW)
+    assert len(snapshot) == 6 and snapshot.total_bytes == 1665
+    assert [snapshot.path(i) for i in range(len(snapshot))] == [
+        ROOT, f"{ROOT}/docs", f"{ROOT}/docs/old", f"{ROOT}/docs/new", f"{ROOT}/videos", f"{ROOT}/videos/clips"]
+    assert list(snapshot.own_bytes()) == list(NEW.values())
+
+
+def test_save_and_load_round_trip(tmp_path):
+    snapshot = _build(NEW)
+    path = snapshot.save(str(tmp_path))
+    loaded = snapshots.Snapshot.load(path)
+    assert loaded.root == ROOT and loaded.created == snapshot.created
+    for name, _code in snapshots.COLUMNS:
+        assert list(loaded.columns[name]) == list(snapshot.columns[name])
+    assert [loaded.path(i) for i in range(len(loaded))] == [snapshot.path(i) for i in range(len(snapshot))]
+
+
+def test_only_the_newest_snapshots_are_kept(tmp_path):
+    now = time.time()
+    for offset in range(4):
+        _build(OLD, created=now + offset).save(str(tmp_path))
+    snapshots.prune(ROOT, str(tmp_path), keep=2)
+    assert len(snapshots.list_snapshots(ROOT, str(tmp_path))) == 2
+    assert snapshots.latest(ROOT, str(tmp_path)).created == now + 3
+    assert snapshots.latest(ROOT, str(tmp_path), before=now + 3).created == now + 2
+
+
+def test_diff_by_total_and_own_bytes():
+    old, new = _build(OLD), _build(NEW)
+    assert snapshots.diff(old, new, top=3) == [
+        snapshots.Growth(ROOT, 505, 1665, 1160),
+        snapshots.Growth(f"{ROOT}/docs/new", 300, 300, 0),
+        snapshots.Growth(f"{ROOT}/docs", 300, 450, 150),
+    ]
+    assert snapshots.diff(old, new, by="own") == [
+        snapshots.Growth(f"{ROOT}/docs/new", 300, 300, 0),
+        snapshots.Growth(f"{ROOT}/videos", 200, 1200, 1000),
+        snapshots.Growth(f"{ROOT}/videos/clips", 5, 5, 0),
+    ]
+    assert snapshots.diff(new, new) == []
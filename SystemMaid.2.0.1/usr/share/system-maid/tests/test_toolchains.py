@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import json
+
+from maid_engine import toolchains
+
+
+def test_pip_lockfiles_match_wheel_names():
+    poetry = '[[package]]\nname = "Typing-Extensions"\nversion = "4.12.2"\n\n[[package]]\nname = "requests"\n'
+    assert toolchains._parse_pip("poetry.lock", poetry) == [("pip", "typing_extensions-4.12.2")]
+    wheel = "/cache/pip/wheels/ab/typing_extensions-4.12.2-py3-none-any.whl"
+    assert toolchains._pip_keys("/cache/pip", wheel) == (("pip", "typing_extensions-4.12.2"),)
+    requirements = "# pinned\nDjango[argon2]==5.0.1 ; python_version >= '3.10'\nzope.interface===6.1\nflask>=3\n"
+    assert toolchains._parse_pip("requirements.txt", requirements) == [
+        ("pip", "django-5.0.1"), ("pip", "zope_interface-6.1")]
+    pipfile = json.dumps({"default": {"six": {"version": "==1.16.0"}}, "develop": {"pytest": {"git": "x"}}})
+    assert toolchains._parse_pip("Pipfile.lock", pipfile) == [("pip", "six-1.16.0")]
+    assert toolchains._parse_pip("Pipfile.lock", "{broken") == []
+
+
+def test_cargo_lock():
+    text = '# generated\n[[package]]\nname = "serde"\nversion = "1.0.200"\nsource = "registry"\n'
+    assert toolchains._parse_cargo("Cargo.lock", text) == [("cargo", "serde-1.0.200")]
+
+
+def test_go_sum_escapes_upper_case_and_drops_go_mod_suffix():
+    text = ("github.com/BurntSushi/toml v1.3.2 h1:abc=\n"
+            "github.com/BurntSushi/toml v1.3.2/go.mod h1:def=\n")
+    assert toolchains._parse_go("go.sum", text) == [("go", "github.com/!burnt!sushi/toml@v1.3.2")] * 2
+
+
+def test_npm_integrity_strings():
+    digest = hashlib.sha512(b"left-pad").digest()
+    integrity = "sha512-" + base64.b64encode(digest).decode()
+    text = json.dumps({"packages": {"node_modules/left-pad": {"integrity": integrity}}})
+    assert toolchains._parse_npm("package-lock.json", text) == [("npm", "sha512-" + digest.hex())]
+    assert toolchains._parse_npm("yarn.lock", "integrity sha512-!!!\n") == []
+
+
+def test_gradle_and_maven():
+    lockfile = "# comment\ncom.google.guava:guava:33.0.0-jre=compileClasspath\nempty=annotationProcessor\n"
+    assert toolchains._parse_gradle("gradle.lockfile", lockfile) == [("maven", "com.google.guava:guava:33.0.0-jre")]
+    pom = """<project><dependencies>
+      <dependency><groupId>junit</groupId><artifactId>junit</artifactId><version>4.13.2</version></dependency>
+      <dependency><groupId>org.x</groupId><artifactId>y</artifactId><version>${y.version}</version></dependency>
+      <dependency><groupId>org.x</groupId><artifactId>managed</artifactId></dependency>
+    </dependencies></project>"""
+    assert toolchains._parse_pom("pom.xml", pom) == [("maven", "junit:junit:4.13.2")]
+
+
+def test_parser_for_lockfile_names():
+    assert toolchains._parser_for("Cargo.lock") is toolchains._parse_cargo
+    assert toolchains._parser_for("requirements-dev.txt") is toolchains._parse_pip
+    assert toolchains._parser_for("constraints.txt") is toolchains._parse_pip
+    assert toolchains._parser_for("compileClasspath.lockfile") is toolchains._parse_gradle
+    assert toolchains._parser_for("notes.txt") is None
+    assert toolchains._parser_for("package.json") is None
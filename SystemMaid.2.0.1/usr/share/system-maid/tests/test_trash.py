@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+from maid_engine import trash
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+def _item(name, age_days, size):
+    deleted = None if age_days is None else NOW - age_days * DAY
+    return trash.TrashItem(None, name, name, None, deleted, size)
+
+
+def _names(items):
+    return sorted(item.name for item in items)
+
+
+def test_no_limits_selects_everything():
+    items = [_item("a", 1, 10), _item("b", None, 10)]
+    assert _names(trash.select(items, 0, 0, now=NOW)) == ["a", "b"]
+
+
+def test_age_limit_keeps_recent_items():
+    items = [_item("old", 40, 10), _item("new", 5, 10), _item("unknown", None, 10)]
+    # Silinme zamanı bilinmeyen öğeler en eski sayılır
+    assert _names(trash.select(items, 30, 0, now=NOW)) == ["old", "unknown"]
+
+
+def test_quota_removes_oldest_until_under_limit():
+    items = [_item("a", 10, 400), _item("b", 5, 400), _item("c", 1, 400)]
+    assert _names(trash.select(items, 0, 500, now=NOW)) == ["a", "b"]
+    assert _names(trash.select(items, 0, 1200, now=NOW)) == []
+
+
+def test_age_and_quota_combine():
+    items = [_item("a", 40, 100), _item("b", 5, 400), _item("c", 1, 400)]
+    assert _names(trash.select(items, 30, 500, now=NOW)) == ["a", "b"]
+
+
+def test_list_items_pairs_files_with_info(tmp_path):
+    top = tmp_path / "Trash"
+    os.makedirs(top / "files" / "folder")
+    os.makedirs(top / "info")
+    (top / "files" / "folder" / "inner").write_bytes(b"x" * 5000)
+    (top / "files" / "orphan").write_bytes(b"x")
+    (top / "info" / "folder.trashinfo").write_text("[Trash Info]\nPath=/x\nDeletionDate=2024-01-02T03:04:05\n")
+    (top / "info" / "gone.trashinfo").write_text("[Trash Info]\nPath=/y\n")
+    items = {item.name: item for item in trash.list_items(trash._trash_dir(str(top)), workers=1)}
+    assert sorted(items) == ["folder", "gone", "orphan"]
+    assert items["folder"].deleted == time.mktime(time.strptime("2024-01-02T03:04:05", trash.DATE_FORMAT))
+    assert items["folder"].size >= 5000
+    assert items["gone"].deleted is None
+    assert items["orphan"].info_path is None
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from maid_engine import treemap
+
+
+def _area(rect):
+    return rect[2] * rect[3]
+
+
+def test_squarify_areas_follow_sizes_and_fill_the_box():
+    sizes = [60, 30, 20, 10, 5, 1]
+    rects = treemap.squarify(sizes, 10, 20, 300, 200)
+    assert len(rects) == len(sizes)
+    for size, rect in zip(sizes, rects):
+        assert _area(rect) == pytest.approx(size * 300 * 200 / sum(sizes))
+        x, y, width, height = rect
+        assert 10 - 1e-6 <= x and x + width <= 310 + 1e-6
+        assert 20 - 1e-6 <= y and y + height <= 220 + 1e-6
+    assert sum(_area(rect) for rect in rects) == pytest.approx(300 * 200)
+
+
+def test_squarify_keeps_equal_tiles_square():
+    rects = treemap.squarify([1, 1, 1, 1], 0, 0, 100, 100)
+    for _x, _y, width, height in rects:
+        assert width == pytest.approx(50) and height == pytest.approx(50)
+
+
+def test_squarify_empty_input_or_box():
+    assert treemap.squarify([0, 0], 0, 0, 100, 100) == [(0, 0, 0, 0)] * 2
+    assert treemap.squarify([5], 3, 4, 0, 100) == [(3, 4, 0, 0)]
+
+
+def test_hard_links_are_counted_once(tmp_path):
+    root = tmp_path / "home"
+    os.makedirs(root / "a")
+    os.makedirs(root / "b")
+    (root / "a" / "data").write_bytes(b"x" * 65536)
+    os.link(root / "a" / "data", root / "b" / "data")
+    os.link(root / "a" / "data", root / "a" / "again")
+    size = os.stat(root / "a" / "data").st_blocks * 512
+    with treemap.SizeIndex(str(tmp_path / "treemap.sqlite")) as index:
+        index.refresh(str(root), workers=1)
+        first = index.tile(str(root))
+        # İkinci taramada dizinler önbellekten okunur; bağlantılar yine bir kez sayılır
+        index.refresh(str(root), workers=1)
+        second = index.tile(str(root))
+        children = {tile.name: tile.bytes for tile in index.children(str(root))}
+    assert first.bytes == second.bytes
+    # Alt dizinlerin kendi blokları üst dizine yazılır; dosya verisi yalnızca bir kez
+    dirs = sum(os.stat(root / name).st_blocks * 512 for name in ("a", "b"))
+    assert (first.bytes, first.files) == (dirs + size, 1)
+    assert sum(children.values()) <= first.bytes